@@ -0,0 +1,235 @@
+"""
+Admission - Capacity-aware admission control for renders
+
+At most max_in_flight renders run at once. Further requests wait in a
+bounded queue, final renders ahead of previews, and are turned away when
+the queue is full (429) or when they waited longer than queue_timeout
+(503). Both carry a Retry-After estimated from recent render times, so
+clients back off instead of piling up blocked handlers, and admitted
+requests keep a predictable latency under overload.
+
+Runs on the event loop: slot() must be awaited from a single loop.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from backend import metrics
+
+
+# Prefix of the environment variables read by AdmissionLimits.from_env
+ENV_PREFIX = "IMAGEGEN_ADMISSION_"
+
+# Priority classes, highest first
+PRIORITY_FINAL = "final"
+PRIORITY_PREVIEW = "preview"
+PRIORITIES = (PRIORITY_FINAL, PRIORITY_PREVIEW)
+
+# Weight of the newest render in the average render time
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted (status 429 or 503)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionLimits:
+    """Render capacity of this process"""
+    max_in_flight: int = os.cpu_count() or 1
+    max_queue: int = 16
+    max_preview_queue: int = 8
+    queue_timeout: int = 10
+
+    @classmethod
+    def from_env(cls, environ: Dict[str, str] = None) -> "AdmissionLimits":
+        """
+        Read limits from IMAGEGEN_ADMISSION_MAX_IN_FLIGHT, _MAX_QUEUE,
+        _MAX_PREVIEW_QUEUE and _QUEUE_TIMEOUT (seconds).
+
+        Args:
+            environ: Environment mapping (default: os.environ)
+
+        Returns:
+            AdmissionLimits (unset variables keep their defaults)
+        """
+        environ = os.environ if environ is None else environ
+        values = {}
+        for name in cls.__dataclass_fields__:
+            raw = environ.get(ENV_PREFIX + name.upper())
+            if raw is None:
+                continue
+            try:
+                values[name] = int(raw)
+            except ValueError:
+                raise ValueError(f"{ENV_PREFIX}{name.upper()} must be an integer")
+            if values[name] < (1 if name == "max_in_flight" else 0):
+                raise ValueError(f"{ENV_PREFIX}{name.upper()} is out of range")
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class AdmissionController:
+    """Bounded render slots with a two-class priority queue"""
+
+    def __init__(self, limits: AdmissionLimits = None):
+        self.limits = limits or AdmissionLimits()
+        self.in_flight = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {p: deque() for p in PRIORITIES}
+        self._service_time = None
+        # Waiters to notify: future -> (priority, on_position, last position)
+        self._watchers: Dict[asyncio.Future, Tuple[str, Callable[[int], None], Optional[int]]] = {}
+        self._admitted = {p: 0 for p in PRIORITIES}
+        self._rejected = {p: 0 for p in PRIORITIES}
+
+    def queue_depth(self, priority: str = None) -> int:
+        """Requests waiting for a slot (of one class, or in total)"""
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def position(self, priority: str, future: asyncio.Future) -> int:
+        """Place of a waiting request in line (1 = next to get a slot)"""
+        ahead = sum(len(self._queues[p]) for p in PRIORITIES[:PRIORITIES.index(priority)])
+        return ahead + self._queues[priority].index(future) + 1
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would likely get a slot"""
+        service_time = self._service_time or 1.0
+        waves = (self.queue_depth() + 1) / self.limits.max_in_flight
+        return max(1, math.ceil(service_time * waves))
+
+    @asynccontextmanager
+    async def slot(self, priority: str = PRIORITY_FINAL,
+                   on_position: Callable[[int], None] = None):
+        """
+        Hold a render slot for the body of an async with-block.
+
+        Args:
+            priority: Priority class
+            on_position: Called with the request's place in line whenever
+                it changes while queued, and with 0 once admitted
+
+        Raises:
+            ValueError: Unknown priority
+            AdmissionRejected: Queue full (429) or queue wait timed out (503)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+
+        if self.in_flight < self.limits.max_in_flight and not self.queue_depth():
+            self.in_flight += 1
+            metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+        else:
+            await self._wait(priority, on_position)
+        self._admitted[priority] += 1
+        if on_position is not None:
+            on_position(0)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self._service_time is None:
+                self._service_time = elapsed
+            else:
+                self._service_time += SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+            self._release()
+
+    async def _wait(self, priority: str, on_position: Callable[[int], None] = None):
+        """Queue for a slot; the releasing request hands its slot over"""
+        queue = self._queues[priority]
+        limit = self.limits.max_queue
+        if priority == PRIORITY_PREVIEW:
+            limit = min(limit, self.limits.max_preview_queue)
+        if self.queue_depth() >= self.limits.max_queue or len(queue) >= limit:
+            self._reject(priority, 429)
+            raise AdmissionRejected(429, "Render queue is full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        if on_position is not None:
+            self._watchers[future] = (priority, on_position, None)
+        self._update_depth()
+        try:
+            await asyncio.wait_for(future, self.limits.queue_timeout or None)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # Slot handed over as the timeout fired
+            self._discard(queue, future)
+            self._reject(priority, 503)
+            raise AdmissionRejected(503, "Timed out waiting for a render slot", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            self._discard(queue, future)
+            raise
+        finally:
+            self._watchers.pop(future, None)
+
+    def _release(self):
+        """Give the slot to the next waiter (final first) or free it"""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue:
+                future = queue.popleft()
+                if not future.done():
+                    future.set_result(None)
+                    self._update_depth()
+                    return
+        self.in_flight -= 1
+        metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    def _discard(self, queue: Deque[asyncio.Future], future: asyncio.Future):
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        self._update_depth()
+
+    def _reject(self, priority: str, status_code: int):
+        self._rejected[priority] += 1
+        metrics.ADMISSION_REJECTED.inc(priority=priority, status=status_code)
+
+    def _update_depth(self):
+        for priority in PRIORITIES:
+            metrics.ADMISSION_QUEUE_DEPTH.set(self.queue_depth(priority), priority=priority)
+        metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+        self._notify_positions()
+
+    def _notify_positions(self):
+        """Tell waiting requests with an on_position callback their new place"""
+        for future, (priority, callback, last) in list(self._watchers.items()):
+            if future.done() or future not in self._queues[priority]:
+                continue
+            position = self.position(priority, future)
+            if position != last:
+                self._watchers[future] = (priority, callback, position)
+                callback(position)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits, slots in use, queue depth per class and counters"""
+        return {
+            **self.limits.to_dict(),
+            "in_flight": self.in_flight,
+            "queued": {p: self.queue_depth(p) for p in PRIORITIES},
+            "admitted": dict(self._admitted),
+            "rejected": dict(self._rejected),
+            "avg_render_seconds": round(self._service_time, 6) if self._service_time else None,
+            "retry_after": self.retry_after()
+        }
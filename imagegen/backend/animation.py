@@ -0,0 +1,396 @@
+"""
+Animation - Server-side rendering of animated scenes
+
+SceneGenerator._get_animation describes animations for the Three.js
+viewer as per-frame increments at 60 fps. animate_scene evaluates them at
+any time so the raytracer can render frames; render_animation renders N
+frames in parallel on the raytracer workers and writes them as a PPM
+sequence or one animated PNG (APNG).
+
+Only animated objects are recomputed per frame: static objects are shared
+by every frame scene. Frames that look the same to the raytracer are
+rendered once: it draws bounding spheres, so a rotation alone does not
+change the image.
+"""
+
+import math
+import os
+import struct
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.image_file import open_ppm
+from backend.render_options import RenderOptions, RenderOptionsError
+
+
+# Frame rate the viewer applies animation increments at (requestAnimationFrame)
+VIEWER_FPS = 60
+
+# Output formats of render_animation
+FORMATS = ("apng", "frames")
+
+# Largest frame count accepted by AnimationOptions.from_request
+MAX_FRAMES = 240
+
+# Object transforms the raytracer renders (it ignores rotations)
+RENDERED_TRANSFORMS = ("position", "scale")
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass
+class AnimationOptions:
+    """Frame count, frame rate and output format of an animated render"""
+    frames: int = 24
+    fps: int = 12
+    format: str = "apng"
+
+    @classmethod
+    def from_request(cls, data: Dict[str, Any]) -> "AnimationOptions":
+        """
+        Build options from a request body ("frames", "fps", "format").
+
+        Raises:
+            RenderOptionsError: If a value is malformed or out of range
+        """
+        values = {}
+        for key, high in (("frames", MAX_FRAMES), ("fps", VIEWER_FPS)):
+            value = data.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise RenderOptionsError(f"{key} must be an integer")
+            if not 1 <= value <= high:
+                raise RenderOptionsError(f"{key} must be between 1 and {high}")
+            values[key] = value
+
+        output_format = data.get("format")
+        if output_format is not None:
+            if output_format not in FORMATS:
+                raise RenderOptionsError(f"format must be one of {', '.join(FORMATS)}")
+            values["format"] = output_format
+
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ============================================================================
+# Evaluating animations
+# ============================================================================
+
+def split_objects(objects: List[Dict[str, Any]]) -> Tuple[list, list]:
+    """
+    Split scene objects into static and animated ones.
+
+    Returns:
+        Tuple (static, animated)
+    """
+    static, animated = [], []
+    for obj in objects:
+        (animated if obj.get("animation") else static).append(obj)
+    return static, animated
+
+
+def animate_object(obj: Dict[str, Any], t: float) -> Dict[str, Any]:
+    """
+    Get obj as it is t seconds into its animation.
+
+    Increments are scaled from the viewer's per-frame values, so a render
+    matches what the Three.js client shows at the same time.
+
+    Args:
+        obj: Version 1 scene object with an "animation" entry
+        t: Time in seconds
+
+    Returns:
+        Shallow copy of obj with updated position, rotation or scale
+    """
+    anim = obj["animation"]
+    ticks = t * VIEWER_FPS
+    result = dict(obj)
+    kind = anim.get("type")
+
+    if kind == "rotation":
+        rotation = list(obj.get("rotation", [0, 0, 0]))
+        rotation[AXES.get(anim.get("axis"), 1)] += anim.get("speed", 0) * anim.get("direction", 1) * ticks
+        result["rotation"] = rotation
+
+    elif kind == "scale":
+        factor = 1 + anim.get("amplitude", 0) * math.sin(2 * math.pi * anim.get("frequency", 1) * t)
+        scale = list(obj.get("scale", [1, 1, 1]))
+        axes = range(3) if anim.get("axis", "all") == "all" else [AXES.get(anim["axis"], 1)]
+        for i in axes:
+            scale[i] *= factor
+        result["scale"] = scale
+
+    elif kind == "position":
+        position = list(obj.get("position", [0, 0, 0]))
+        axis = AXES.get(anim.get("axis"), 1)
+        if "amplitude" in anim:
+            position[axis] += anim["amplitude"] * math.sin(2 * math.pi * anim.get("frequency", 1) * t)
+        else:
+            # Constant speed slowed by damping each viewer frame
+            damping = anim.get("damping", 1.0)
+            if damping < 1.0:
+                distance = anim.get("speed", 0) * (1 - damping ** ticks) / (1 - damping)
+            else:
+                distance = anim.get("speed", 0) * ticks
+            position[axis] += anim.get("direction", 1) * distance
+        result["position"] = position
+
+    elif kind == "orbit":
+        # Circle around the vertical axis through the origin
+        x, y, z = obj.get("position", [0, 0, 0])
+        angle = anim.get("speed", 0) * ticks
+        if math.hypot(x, z) == 0:
+            x, z = anim.get("radius", 1), 0
+        result["position"] = [x * math.cos(angle) - z * math.sin(angle), y,
+                              x * math.sin(angle) + z * math.cos(angle)]
+
+    return result
+
+
+def animate_scene(scene_data: Dict[str, Any], t: float,
+                  static: List[dict] = None, animated: List[dict] = None) -> Dict[str, Any]:
+    """
+    Get a version 1 scene as it is t seconds into its animations.
+
+    Args:
+        scene_data: Scene from SceneGenerator
+        t: Time in seconds
+        static, animated: Result of split_objects for the scene's objects
+            (computed if None; pass them when evaluating many frames)
+
+    Returns:
+        Scene sharing everything but the animated objects with scene_data
+    """
+    if static is None or animated is None:
+        static, animated = split_objects(scene_data.get("scene", {}).get("objects", []))
+
+    return _frame_scene(scene_data, static, [animate_object(obj, t) for obj in animated])
+
+
+def frame_key(animated: List[Dict[str, Any]]) -> tuple:
+    """Key equal for frames the raytracer renders identically"""
+    return tuple(
+        tuple(round(value, 6) for value in obj.get(name, ()))
+        for obj in animated
+        for name in RENDERED_TRANSFORMS
+    )
+
+
+# ============================================================================
+# Rendering
+# ============================================================================
+
+def render_animation(raytracer, description: str, scene_data: Dict[str, Any],
+                     options: RenderOptions, animation: AnimationOptions,
+                     workers: Optional[int] = None) -> dict:
+    """
+    Render the frames of an animated scene.
+
+    Distinct frames render workers at a time; with more than one worker,
+    each frame gets one raytracer thread unless options.threads is set.
+    Every frame builds its own acceleration structure (BVH), even over
+    the static objects shared by all frames: the raytracer runs once per
+    frame. Output goes to the raytracer's output_images/: one
+    anim_<timestamp>.png for "apng", or anim_<timestamp>_<n>.ppm per
+    distinct frame for "frames".
+
+    Args:
+        raytracer: RaytracerIntegration
+        description: Text description (for the result)
+        scene_data: Scene from SceneGenerator (generated with animate=True)
+        options: Resolution and quality of every frame
+        animation: Frame count, frame rate and format
+        workers: Frames rendered at once (default: raytracer worker pool
+            size, or the CPU count; 1 renders frames one after the other
+            with the raytracer's own threading)
+
+    Returns:
+        Result dict: image_url (apng) or frames (one URL per frame),
+        unique_frames, render_time (ms), timings and per-frame stats
+    """
+    start_time = time.perf_counter()
+    if workers is None:
+        workers = raytracer.workers.size if getattr(raytracer, "workers", None) else os.cpu_count()
+    if options.threads is None and workers > 1:
+        options = replace(options, threads=1)
+
+    # Evaluate every frame, keeping one scene per distinct image
+    static, animated = split_objects(scene_data.get("scene", {}).get("objects", []))
+    frame_indices = []
+    distinct: Dict[tuple, int] = {}
+    scenes = []
+    for i in range(animation.frames):
+        frame = [animate_object(obj, i / animation.fps) for obj in animated]
+        key = frame_key(frame)
+        if key not in distinct:
+            distinct[key] = len(scenes)
+            scenes.append(_frame_scene(scene_data, static, frame))
+        frame_indices.append(distinct[key])
+    timings = {"frames": time.perf_counter() - start_time}
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    scratch = None
+    if animation.format == "apng":
+        scratch = tempfile.TemporaryDirectory(prefix="anim_", dir=raytracer.output_dir)
+        frame_dir = scratch.name
+    else:
+        frame_dir = raytracer.output_dir
+    paths = [os.path.join(frame_dir, f"anim_{stamp}_{i:04d}.ppm") for i in range(len(scenes))]
+
+    def render(index: int) -> dict:
+        return raytracer.generate(description, options.width, options.height,
+                                  scene=scenes[index], output_path=paths[index],
+                                  options=options)
+
+    try:
+        render_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(scenes)))) as executor:
+            results = list(executor.map(render, range(len(scenes))))
+        timings["render"] = time.perf_counter() - render_start
+
+        failed = next((result for result in results if not result.get("success")), None)
+        if failed:
+            return {"success": False, "error": failed.get("error", "Raytracer error")}
+
+        result = {
+            "success": True,
+            "description": description,
+            "width": options.width,
+            "height": options.height,
+            "frames_count": animation.frames,
+            "unique_frames": len(scenes),
+            "fps": animation.fps,
+            "image_format": animation.format,
+            "timestamp": datetime.now().isoformat(),
+            "stats": [result.get("stats", {}) for result in results]
+        }
+
+        if animation.format == "apng":
+            encode_start = time.perf_counter()
+            filename = f"anim_{stamp}.png"
+            write_apng([paths[i] for i in frame_indices],
+                       os.path.join(raytracer.output_dir, filename), animation.fps)
+            timings["encode"] = time.perf_counter() - encode_start
+            result["filename"] = filename
+            result["image_url"] = f"/api/images/{filename}"
+        else:
+            result["frames"] = [f"/api/images/{os.path.basename(paths[i])}"
+                                for i in frame_indices]
+            result["image_url"] = result["frames"][0]
+
+        result["render_time"] = int((time.perf_counter() - start_time) * 1000)
+        result["timings"] = timings
+        return result
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+
+
+def _frame_scene(scene_data: Dict[str, Any], static: List[dict],
+                 animated: List[dict]) -> Dict[str, Any]:
+    """Scene with the given objects, sharing everything else with scene_data"""
+    scene = dict(scene_data.get("scene", {}))
+    scene["objects"] = static + animated
+    return {**scene_data, "scene": scene}
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def write_apng(frame_paths: List[str], path: str, fps: int) -> int:
+    """
+    Write PPM frames as an animated PNG that loops forever.
+
+    Consecutive identical frames are stored once with a longer delay.
+
+    Args:
+        frame_paths: One PPM per frame (same size), in order
+        path: Output .png path
+        fps: Frames per second
+
+    Returns:
+        Bytes written
+    """
+    # Runs of identical frames: [path, frame count]
+    runs: List[list] = []
+    for frame_path in frame_paths:
+        if runs and runs[-1][0] == frame_path:
+            runs[-1][1] += 1
+        else:
+            runs.append([frame_path, 1])
+
+    width = height = None
+    chunks = []
+    sequence = 0
+    for index, (frame_path, count) in enumerate(runs):
+        with open_ppm(frame_path) as frame:
+            if width is None:
+                width, height = frame.width, frame.height
+            elif (frame.width, frame.height) != (width, height):
+                raise ValueError("APNG frames must all have the same size")
+            data = _compress_scanlines(frame.pixels, width, height, 6)
+
+        chunks.append(_png_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", sequence, width, height, 0, 0, count, fps, 0, 0)))
+        sequence += 1
+        if index == 0:
+            chunks.append(_png_chunk(b"IDAT", data))
+        else:
+            chunks.append(_png_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+
+    header = _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    control = _png_chunk(b"acTL", struct.pack(">II", len(runs), 0))
+    png = PNG_SIGNATURE + header + control + b"".join(chunks) + _png_chunk(b"IEND", b"")
+
+    with open(path, "wb") as f:
+        f.write(png)
+    return len(png)
+
+
+def encode_png(width: int, height: int, pixels, level: int = 6) -> bytes:
+    """
+    Encode RGB pixels (rows top to bottom) as a still PNG.
+
+    Args:
+        pixels: Any buffer (bytes, or a memoryview of a mapped PPM)
+        level: zlib compression level (1 is fastest)
+    """
+    header = _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    data = _png_chunk(b"IDAT", _compress_scanlines(pixels, width, height, level))
+    return PNG_SIGNATURE + header + data + _png_chunk(b"IEND", b"")
+
+
+def _compress_scanlines(pixels, width: int, height: int, level: int) -> bytes:
+    """
+    Compressed PNG image data: filter type 0 (None) before every scanline.
+
+    Rows are fed to the compressor as slices of pixels, so the
+    uncompressed image is never copied.
+    """
+    stride = width * 3
+    pixels = memoryview(pixels)
+    compressor = zlib.compressobj(level)
+    chunks = []
+    for y in range(height):
+        chunks.append(compressor.compress(b"\x00"))
+        chunks.append(compressor.compress(pixels[y * stride:(y + 1) * stride]))
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
@@ -3,21 +3,124 @@ Backend API Server - FastAPI
 Serves generated scenes and handles exports
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, Body, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import base64
 import json
+import threading
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, List, Optional, Tuple
 import os
+import re
+import sys
+import time
+
+if not __package__:
+    # Run as a script (python backend/app.py): import backend.* from imagegen/, like run.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.nlp_engine import NLPEngine
+from backend.scene_generator import SceneGenerator
+from backend.raytracer_integration import get_raytracer, get_raytracer_status
+from backend.render_options import RenderLimits, RenderOptions, RenderOptionsError
+from backend.animation import AnimationOptions, encode_png, render_animation
+from backend.image_store import ImageStore, ImageStoreLimits, SceneImageReferences
+from backend.image_sizes import (IMAGE_SIZES, box_downscale, derivative_name, fit_size,
+                                 make_derivative, scale_region)
+from backend.static_assets import StaticAssets
+from backend.single_flight import SingleFlight, scene_key
+from backend.admission import (AdmissionController, AdmissionLimits, AdmissionRejected,
+                               PRIORITIES, PRIORITY_FINAL)
+from backend.render_broker import BROKER_ENV, JOB_TIMEOUT, BrokerTimeout, RenderBroker
+from backend.tile_render import render_tiled, should_tile, tile_min_pixels
+from backend.scene_encoding import SCENE_FORMAT_V2, decode_scene, encode_scene
+from backend.scene_session import SceneSession, dirty_tiles, same_frame
+from backend import metrics
+
+
+# Storage
+scenes_dir = Path("./data/scenes")
+
+# Render limits for this deployment (IMAGEGEN_MAX_* environment variables)
+render_limits = RenderLimits.from_env()
+
+# Render slots and queue (IMAGEGEN_ADMISSION_* environment variables)
+admission = AdmissionController(AdmissionLimits.from_env())
+
+# Renders of at least this many pixels are split into tiles (IMAGEGEN_TILE_MIN_PIXELS)
+tile_threshold = tile_min_pixels()
+
+# Identical renders in flight (see /api/generate)
+render_flights = SingleFlight()
+
+# Image derivatives being made (see /api/images/{filename}?size=)
+derivative_flights = SingleFlight()
+
+# Budget of output_images/ (created at startup, see image_store.py)
+image_store: Optional[ImageStore] = None
+
+# Job queue of external render workers (IMAGEGEN_RENDER_BROKER; None renders in-process)
+render_broker: Optional[RenderBroker] = None
+
+# Media types of the files in output_images/
+IMAGE_MEDIA_TYPES = {
+    ".ppm": "image/x-portable-pixmap",
+    ".png": "image/png"
+}
+
+
+def startup():
+    """
+    One-time initialization: create storage and locate the raytracer.
+
+    Runs when the server starts instead of at import, so importing the
+    app (tests, tooling) stays cheap and side-effect free.
+    """
+    global image_store, render_broker
+    scenes_dir.mkdir(parents=True, exist_ok=True)
+    if os.environ.get(BROKER_ENV):
+        render_broker = RenderBroker(os.environ[BROKER_ENV])
+    image_store = ImageStore(get_raytracer().output_dir, ImageStoreLimits.from_env(),
+                             referenced=SceneImageReferences(scenes_dir))
+    image_store.start()
+
+
+def shutdown():
+    """Stop background work started by startup()"""
+    if image_store is not None:
+        image_store.stop()
+    if render_broker is not None:
+        render_broker.close()
+    # Stop the persistent raytracer workers
+    get_raytracer().close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup()
+    yield
+    shutdown()
+
+
+def _store_images(filenames: List[str]):
+    """Count new files in output_images/ against the image store budget"""
+    if image_store is not None:
+        for filename in filenames:
+            image_store.add(filename)
 
 
 app = FastAPI(
     title="ImageGen API",
     description="Generate 3D scenes from text descriptions",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS setup
@@ -29,423 +132,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Storage
-scenes_dir = Path("./data/scenes")
-scenes_dir.mkdir(parents=True, exist_ok=True)
 
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    """Observe request duration and append it to the Server-Timing header"""
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    
+    # Label by route template so /api/scenes/{scene_id} stays one series
+    route = request.scope.get("route")
+    metrics.REQUEST_SECONDS.observe(
+        elapsed,
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code
+    )
+    
+    total = f"total;dur={round(elapsed * 1000, 3)}"
+    existing = response.headers.get("Server-Timing")
+    response.headers["Server-Timing"] = f"{existing}, {total}" if existing else total
+    return response
 
-# ============================================================================
-# Models
-# ============================================================================
+# Bulk endpoints accept at most this many items per request
+MAX_BULK_SCENES = 1000
+
+# Scene IDs are generated by create_scene (uuid prefix)
+SCENE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
 
-class SceneData:
-    """In-memory scene storage"""
-    scenes: Dict[str, dict] = {}
+# Parsed scene files kept in memory by get_scene
+MAX_CACHED_SCENES = 256
 
 
 # ============================================================================
-# Routes - CHAT (with embedded HTML)
+# Models
 # ============================================================================
 
-@app.get("/chat")
-async def chat_page():
-    """Chat interface with raytracer integration"""
-    html = """<!DOCTYPE html>
-<html lang="fr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🎨 ImageGen ChatBot</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 10px;
-        }
-        .container {
-            width: 100%;
-            max-width: 1000px;
-            height: 90vh;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-            display: flex;
-            flex-direction: column;
-            overflow: hidden;
-        }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            text-align: center;
-        }
-        .header h1 { font-size: 1.8em; margin-bottom: 5px; }
-        .header p { font-size: 0.9em; opacity: 0.9; }
-        .chat-container {
-            flex: 1;
-            overflow-y: auto;
-            padding: 20px;
-            display: flex;
-            flex-direction: column;
-            gap: 15px;
-            background: #f8f9fa;
-        }
-        .message {
-            display: flex;
-            gap: 10px;
-            animation: slideIn 0.3s ease-out;
-        }
-        @keyframes slideIn {
-            from { opacity: 0; transform: translateY(10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        .message.user { justify-content: flex-end; }
-        .message.bot { justify-content: flex-start; }
-        .message-avatar {
-            width: 35px;
-            height: 35px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 1.5em;
-            flex-shrink: 0;
-        }
-        .user .message-avatar { background: #667eea; color: white; }
-        .bot .message-avatar { background: #764ba2; color: white; }
-        .message-content {
-            max-width: 70%;
-            padding: 12px 15px;
-            border-radius: 12px;
-            word-wrap: break-word;
-        }
-        .user .message-content {
-            background: #667eea;
-            color: white;
-            border-bottom-right-radius: 2px;
-        }
-        .bot .message-content {
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-bottom-left-radius: 2px;
-        }
-        .message-image {
-            max-width: 100%;
-            border-radius: 10px;
-            margin-top: 10px;
-            cursor: pointer;
-            transition: transform 0.2s;
-        }
-        .message-image:hover { transform: scale(1.02); }
-        .message-info {
-            font-size: 0.8em;
-            opacity: 0.7;
-            margin-top: 5px;
-        }
-        .message-info a {
-            color: #667eea;
-            text-decoration: none;
-            margin-left: 10px;
-        }
-        .message-info a:hover {
-            text-decoration: underline;
-        }
-        .loading { display: flex; gap: 5px; align-items: center; }
-        .loading-dot {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            background: #667eea;
-            animation: bounce 1.4s infinite;
-        }
-        .loading-dot:nth-child(2) { animation-delay: 0.2s; }
-        .loading-dot:nth-child(3) { animation-delay: 0.4s; }
-        @keyframes bounce {
-            0%, 80%, 100% { opacity: 0.5; transform: translateY(0); }
-            40% { opacity: 1; transform: translateY(-10px); }
-        }
-        .input-area {
-            padding: 20px;
-            border-top: 1px solid #e0e0e0;
-            background: white;
-            display: flex;
-            gap: 10px;
-        }
-        .input-group { display: flex; gap: 10px; flex: 1; }
-        textarea {
-            flex: 1;
-            padding: 12px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 1em;
-            font-family: inherit;
-            resize: none;
-            max-height: 100px;
-        }
-        textarea:focus {
-            outline: none;
-            border-color: #667eea;
-            background: #f8f9ff;
-        }
-        button {
-            padding: 12px 25px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            border-radius: 10px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s;
-            white-space: nowrap;
-        }
-        button:hover { transform: translateY(-2px); box-shadow: 0 10px 20px rgba(102, 126, 234, 0.3); }
-        button:disabled { opacity: 0.5; cursor: not-allowed; }
-        .examples {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 10px;
-            margin-top: 10px;
-        }
-        .example-chip {
-            padding: 8px 12px;
-            background: #f0f0f0;
-            border: 1px solid #ddd;
-            border-radius: 20px;
-            cursor: pointer;
-            font-size: 0.85em;
-        }
-        .example-chip:hover {
-            background: #e3f2fd;
-            border-color: #667eea;
-            color: #667eea;
-        }
-        .modal {
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0, 0, 0, 0.7);
-            align-items: center;
-            justify-content: center;
-        }
-        .modal.show { display: flex; }
-        .modal-content {
-            background: white;
-            border-radius: 15px;
-            padding: 20px;
-            max-width: 90%;
-            max-height: 90%;
-            overflow: auto;
-            position: relative;
-            text-align: center;
-        }
-        .modal-content img {
-            max-width: 100%;
-            max-height: 80vh;
-            border-radius: 10px;
-        }
-        .modal-buttons {
-            margin-top: 15px;
-            display: flex;
-            gap: 10px;
-            justify-content: center;
-        }
-        .modal-buttons a, .modal-buttons button {
-            padding: 10px 20px;
-            border-radius: 8px;
-            text-decoration: none;
-            display: inline-block;
-        }
-        .close-modal {
-            position: absolute;
-            top: 15px;
-            right: 15px;
-            font-size: 28px;
-            font-weight: bold;
-            cursor: pointer;
-            color: #666;
-        }
-        .close-modal:hover { color: #000; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎨 ImageGen ChatBot</h1>
-            <p>Décrivez une image → Générez-la en 3D avec Raytracer</p>
-        </div>
-
-        <div class="chat-container" id="chatContainer">
-            <div class="message bot">
-                <div class="message-avatar">🤖</div>
-                <div class="message-content">
-                    Bonjour! 👋 Je suis votre assistant pour générer des images 3D.<br><br>
-                    Décrivez l'image que vous voulez créer et je la génère avec le raytracer!<br><br>
-                    <strong>Exemples:</strong>
-                    <div class="examples">
-                        <div class="example-chip" onclick="sendExample('Un cube bleu')">Un cube bleu</div>
-                        <div class="example-chip" onclick="sendExample('Une sphère rouge qui tourne')">Sphère rotante</div>
-                        <div class="example-chip" onclick="sendExample('Un cube rouge et une sphère bleue')">Cube + Sphère</div>
-                        <div class="example-chip" onclick="sendExample('Une pyramide dorée')">Pyramide</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="input-area">
-            <div class="input-group">
-                <textarea 
-                    id="input" 
-                    placeholder="Décrivez l'image à générer..."
-                    onkeypress="if(event.key==='Enter' && !event.shiftKey) sendMessage()"
-                ></textarea>
-                <button onclick="sendMessage()">📤 Générer</button>
-            </div>
-        </div>
-    </div>
-
-    <div class="modal" id="imageModal" onclick="if(event.target === this) closeModal()">
-        <div class="modal-content">
-            <span class="close-modal" onclick="closeModal()">&times;</span>
-            <img id="modalImage" src="" alt="Generated image">
-            <div class="modal-buttons">
-                <a id="downloadBtn" href="" download style="background: #667eea; color: white; padding: 10px 20px; border-radius: 8px; text-decoration: none;">📥 Télécharger</a>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        const chatContainer = document.getElementById('chatContainer');
-        const input = document.getElementById('input');
-        const imageModal = document.getElementById('imageModal');
-        const modalImage = document.getElementById('modalImage');
-        const downloadBtn = document.getElementById('downloadBtn');
-
-        async function sendMessage() {
-            const text = input.value.trim();
-            if (!text) return;
-
-            addMessage('user', text);
-            input.value = '';
-            input.focus();
-
-            const typingId = addTyping();
-
-            try {
-                const response = await fetch('/api/generate', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ description: text })
-                });
-
-                const result = await response.json();
-                removeTyping(typingId);
-
-                if (result.success) {
-                    let content = `✨ Scene generated!<br>`;
-                    content += `<strong>Objects:</strong> ${result.objects_count}<br>`;
-                    
-                    if (result.image_url) {
-                        content += `<img 
-                            src="${result.image_url}" 
-                            class="message-image" 
-                            onclick="openModal('${result.image_url}', '${result.filename}')"
-                            title="Click to enlarge"
-                        >`;
-                        content += `<div class="message-info">
-                            📊 ${result.render_time}ms
-                            <a href="${result.image_url}" download="${result.filename}">⬇️ Download</a>
-                        </div>`;
-                    }
-
-                    addMessage('bot', content, true);
-                } else {
-                    addMessage('bot', `❌ Error: ${result.error}`);
-                }
-            } catch (error) {
-                removeTyping(typingId);
-                addMessage('bot', `❌ Error: ${error.message}`);
-            }
-        }
-
-        function sendExample(text) {
-            input.value = text;
-            input.focus();
-        }
+class SceneCache:
+    """
+    Parsed scene files, the least recently used evicted past max_entries.
+    
+    Entries remember the file's modification time and size; a file changed
+    or deleted outside the API is read again (or reported missing) on the
+    next lookup. Lookups count as hits or misses in the "scenes" cache
+    metrics.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], dict]]" = OrderedDict()
+        self._lock = threading.Lock()  # Bulk deletes discard from the threadpool
+    
+    def load(self, scene_id: str, scene_file: Path) -> dict:
+        """
+        Scene stored in scene_file, read from disk unless cached and unchanged.
+        
+        Raises:
+            FileNotFoundError: The scene file does not exist
+        """
+        stat = scene_file.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(scene_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(scene_id)
+                metrics.CACHE_HITS.inc(cache="scenes")
+                return entry[1]
+        
+        metrics.CACHE_MISSES.inc(cache="scenes")
+        with open(scene_file) as f:
+            scene = json.load(f)
+        
+        with self._lock:
+            self._entries[scene_id] = (version, scene)
+            self._entries.move_to_end(scene_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return scene
+    
+    def discard(self, scene_id: str):
+        with self._lock:
+            self._entries.pop(scene_id, None)
 
-        function addMessage(type, content, isHtml = false) {
-            const div = document.createElement('div');
-            div.className = `message ${type}`;
-            
-            const avatar = document.createElement('div');
-            avatar.className = 'message-avatar';
-            avatar.textContent = type === 'user' ? '👤' : '🤖';
-            
-            const contentDiv = document.createElement('div');
-            contentDiv.className = 'message-content';
-            if (isHtml) contentDiv.innerHTML = content;
-            else contentDiv.textContent = content;
-            
-            div.appendChild(avatar);
-            div.appendChild(contentDiv);
-            chatContainer.appendChild(div);
-            chatContainer.scrollTop = chatContainer.scrollHeight;
-        }
 
-        function addTyping() {
-            const div = document.createElement('div');
-            div.className = 'message bot';
-            div.id = 'typing-' + Date.now();
-            
-            const avatar = document.createElement('div');
-            avatar.className = 'message-avatar';
-            avatar.textContent = '🤖';
-            
-            const contentDiv = document.createElement('div');
-            contentDiv.className = 'message-content loading';
-            contentDiv.innerHTML = '<div class="loading-dot"></div><div class="loading-dot"></div><div class="loading-dot"></div>';
-            
-            div.appendChild(avatar);
-            div.appendChild(contentDiv);
-            chatContainer.appendChild(div);
-            chatContainer.scrollTop = chatContainer.scrollHeight;
-            
-            return div.id;
-        }
+scene_cache = SceneCache(MAX_CACHED_SCENES)
 
-        function removeTyping(id) {
-            const el = document.getElementById(id);
-            if (el) el.remove();
-        }
 
-        function openModal(src, filename) {
-            modalImage.src = src;
-            downloadBtn.href = src;
-            downloadBtn.download = filename;
-            imageModal.classList.add('show');
-        }
+# ============================================================================
+# Routes - CHAT
+# ============================================================================
 
-        function closeModal() {
-            imageModal.classList.remove('show');
-        }
+# Frontend files (chat page, 3D viewer), served precompressed from memory
+frontend_dir = Path(__file__).resolve().parent.parent / "frontend"
+static_assets = StaticAssets(frontend_dir)
+app.mount("/static", static_assets, name="static")
 
-        document.addEventListener('keydown', (e) => {
-            if (e.key === 'Escape') closeModal();
-        });
 
-        input.focus();
-    </script>
-</body>
-</html>"""
-    return HTMLResponse(html)
+@app.get("/chat")
+async def chat_page(request: Request):
+    """Chat interface with raytracer integration (frontend/chat.html)"""
+    return static_assets.response("chat.html", request)
 
 
 # ============================================================================
@@ -453,16 +239,40 @@ async def chat_page():
 # ============================================================================
 
 @app.get("/api/images/{filename}")
-async def get_image(filename: str):
-    """Serve generated images"""
-    from backend.raytracer_integration import raytracer
+async def get_image(filename: str, size: Optional[str] = None):
+    """
+    Serve generated images.
+    
+    size (thumb, preview or full) serves a PNG of the image scaled to fit
+    that size instead, made on first request and cached (image_sizes.py).
+    """
+    output_dir = get_raytracer().output_dir
+    filepath = os.path.join(output_dir, filename)
     
-    filepath = os.path.join(raytracer.output_dir, filename)
+    if size is not None:
+        if size not in IMAGE_SIZES:
+            raise HTTPException(status_code=400, detail=f"size must be one of {', '.join(IMAGE_SIZES)}")
+        name = derivative_name(filename, size)
+        if not os.path.exists(os.path.join(output_dir, name)):
+            if not os.path.exists(filepath):
+                raise HTTPException(status_code=404, detail="Image not found")
+            try:
+                _, shared = await derivative_flights.do(
+                    name, lambda: run_in_threadpool(make_derivative, output_dir, filename, size)
+                )
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"{filename} cannot be resized")
+            if not shared:
+                _store_images([name])
+        filename, filepath = name, os.path.join(output_dir, name)
     
     if not os.path.exists(filepath):
         raise HTTPException(status_code=404, detail="Image not found")
     
-    return FileResponse(filepath, media_type="image/x-portable-pixmap")
+    if image_store is not None:
+        image_store.touch(filename)
+    media_type = IMAGE_MEDIA_TYPES.get(Path(filename).suffix.lower(), "application/octet-stream")
+    return FileResponse(filepath, media_type=media_type)
 
 
 # ============================================================================
@@ -479,92 +289,477 @@ async def health():
     }
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # ============================================================================
 # Routes - Generate (with Raytracer)
 # ============================================================================
 
 @app.post("/api/generate")
-async def generate_image(request: dict):
-    """Generate image from description"""
+async def generate_image(request: dict, response: Response):
+    """
+    Generate image from description.
+    
+    Optional width, height, samples, depth and threads are checked against
+    the deployment limits (400 if out of range). Stage durations are
+    returned in "timings" and the Server-Timing header.
+    
+    Concurrent requests for the same scene and options share one render:
+    followers wait for the first request's result ("coalesced": true).
+    
+    Renders pass admission control: "priority" is "final" (default) or
+    "preview"; a full queue answers 429 and a queue wait timeout 503,
+    both with Retry-After.
+    """
+    options, priority = _parse_render_request(request)
+    
     try:
-        import sys
-        import os
-        
-        # Add backend to path
-        backend_path = os.path.dirname(__file__)
-        if backend_path not in sys.path:
-            sys.path.insert(0, backend_path)
-        
-        from nlp_engine import NLPEngine
-        from scene_generator import SceneGenerator
-        from raytracer_integration import raytracer
-        
         description = request.get('description', '')
         if not description:
             raise ValueError("Description required")
         
+        timings = metrics.Timings()
+        
         # Parse with NLP
-        nlp = NLPEngine()
-        entities = nlp.parse_description(description)
+        with timings.span("parse"):
+            nlp = NLPEngine()
+            entities = nlp.parse_description(description)
         
         if not entities:
             return {"success": False, "error": "Could not parse description"}
         
         # Generate 3D scene
-        scene_gen = SceneGenerator()
-        scene = scene_gen.generate_scene(entities, animate=False)
+        with timings.span("scene"):
+            scene_gen = SceneGenerator()
+            scene = scene_gen.generate_scene(entities, animate=False)
         
-        # Render with raytracer
-        result = raytracer.generate(description, 800, 600)
+        # Render with raytracer (off the event loop), once per identical scene
+        key = scene_key(scene, options.to_dict())
+        wait_start = time.perf_counter()
+        result, coalesced = await render_flights.do(
+            key, lambda: _admitted_render(priority, timings, description, scene, options)
+        )
+        if coalesced:
+            timings.add("coalesced", time.perf_counter() - wait_start)
+            metrics.COALESCED_REQUESTS.inc()
+        else:
+            for stage, seconds in result.get('timings', {}).items():
+                timings.add(stage, seconds)
+            metrics.record_render_stats(result.get('stats'))
+        response.headers["Server-Timing"] = timings.server_timing()
         
         if result['success']:
-            return {
-                "success": True,
-                "description": description,
-                "objects_count": len(entities),
-                "image_url": result['image_url'],
-                "filename": result.get('filename', 'image.ppm'),
-                "render_time": result['render_time'],
-                "format": result['image_format'],
-                "timestamp": result['timestamp']
-            }
+            if not coalesced:
+                _store_images([result['filename']])
+            return _generate_response(description, entities, result, options, timings, coalesced)
         else:
             return {"success": False, "error": result.get('error', 'Raytracer error')}
     
+    except AdmissionRejected:
+        raise
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def _generate_response(description: str, entities: list, result: dict,
+                       options: RenderOptions, timings: metrics.Timings,
+                       coalesced: bool = False) -> dict:
+    """Body of a successful /api/generate response (also the chat socket's result event)"""
+    return {
+        "success": True,
+        "description": description,
+        "objects_count": sum(entity.count for entity in entities),
+        "image_url": result['image_url'],
+        "filename": result.get('filename', 'image.ppm'),
+        "render_time": result['render_time'],
+        "format": result['image_format'],
+        "timestamp": result['timestamp'],
+        "options": options.to_dict(),
+        "timings": timings.to_dict(),
+        "stats": result.get('stats', {}),
+        # Instances past the raytracer's object limit, left out of the image
+        "objects_dropped": result.get('stats', {}).get('objects_dropped', 0),
+        "coalesced": coalesced
+    }
+
+
+def _parse_render_request(request: dict) -> tuple:
+    """Validate render options and priority class (400 if invalid)"""
+    try:
+        options = RenderOptions.from_request(request, render_limits)
+    except RenderOptionsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    priority = request.get('priority', PRIORITY_FINAL)
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {', '.join(PRIORITIES)}")
+    return options, priority
+
+
+async def _admitted_render(priority: str, timings: metrics.Timings, description: str,
+                           scene: dict, options: RenderOptions,
+                           on_position=None, on_tile=None, tiles=None, base=None) -> dict:
+    """
+    Render once admission control grants a slot (wait recorded as "admission").
+    
+    on_position gets the place in the admission queue (see
+    AdmissionController.slot), on_tile every finished tile, tiles and
+    base a partial re-render (see _render_in_threadpool).
+    """
+    wait_start = time.perf_counter()
+    async with admission.slot(priority, on_position):
+        timings.add("admission", time.perf_counter() - wait_start)
+        return await _render_in_threadpool(timings, description, scene, options, priority,
+                                           on_tile, tiles, base)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    """429/503 with Retry-After for requests admission control turned away"""
+    return JSONResponse(
+        {"detail": exc.detail, "retry_after": exc.retry_after},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+async def _render_in_threadpool(timings: metrics.Timings, description: str,
+                                scene: dict, options: RenderOptions,
+                                priority: str = PRIORITY_FINAL, on_tile=None,
+                                tiles=None, base=None) -> dict:
+    """
+    Render on a worker thread, recording queue wait and queue depth.
+    
+    With a render broker the thread submits the job and waits for an
+    external render worker instead of rendering itself. Large renders
+    are split into tiles rendered in parallel (see tile_render.py), as are
+    renders with an on_tile callback, which is called from a render
+    thread with each finished tile. With a base frame (path of a PPM)
+    only the given tiles are rendered and pasted over a copy of it.
+    """
+    submitted = time.perf_counter()
+    metrics.RENDER_QUEUE_DEPTH.inc()
+    
+    def render():
+        metrics.RENDER_QUEUE_DEPTH.dec()
+        timings.add("queue", time.perf_counter() - submitted)
+        metrics.RENDERS_IN_PROGRESS.inc()
+        try:
+            if on_tile is not None or base is not None or should_tile(options, tile_threshold):
+                return _render_tiles(description, scene, options, priority, on_tile,
+                                     tiles, base)
+            if render_broker is not None:
+                return _render_with_broker(description, scene, options, priority)
+            return get_raytracer().generate(description, options.width, options.height,
+                                            scene=scene, options=options)
+        finally:
+            metrics.RENDERS_IN_PROGRESS.dec()
+    
+    return await run_in_threadpool(render)
+
+
+@app.post("/api/animate")
+async def animate_image(request: dict, response: Response):
+    """
+    Render the animations of a description server-side.
+    
+    Takes the /api/generate body plus optional "frames" (default 24),
+    "fps" (default 12) and "format": "apng" (one animated PNG, default)
+    or "frames" (one PPM URL per frame). Frames identical to an earlier one
+    are reused. Admission control applies as for /api/generate: the
+    animation holds one slot, so its frames render one at a time.
+    """
+    options, priority = _parse_render_request(request)
+    try:
+        animation = AnimationOptions.from_request(request)
+    except RenderOptionsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        description = request.get('description', '')
+        if not description:
+            raise ValueError("Description required")
+        
+        timings = metrics.Timings()
+        
+        with timings.span("parse"):
+            entities = NLPEngine().parse_description(description)
+        
+        if not entities:
+            return {"success": False, "error": "Could not parse description"}
+        
+        with timings.span("scene"):
+            scene = SceneGenerator().generate_scene(entities, animate=True)
+        
+        wait_start = time.perf_counter()
+        async with admission.slot(priority):
+            timings.add("admission", time.perf_counter() - wait_start)
+            result = await run_in_threadpool(
+                render_animation, get_raytracer(), description, scene, options, animation,
+                workers=1
+            )
+        for stage, seconds in result.get('timings', {}).items():
+            timings.add(stage, seconds)
+        for stats in result.get('stats', []):
+            metrics.record_render_stats(stats)
+        response.headers["Server-Timing"] = timings.server_timing()
+        
+        if not result['success']:
+            return {"success": False, "error": result.get('error', 'Raytracer error')}
+        
+        _store_images([url.rsplit('/', 1)[-1] for url in set(result.get('frames', []))]
+                      or [result['filename']])
+        return {
+            **{key: value for key, value in result.items() if key != 'stats'},
+            "objects_count": sum(entity.count for entity in entities),
+            "animated_objects": sum(1 for entity in entities if entity.animation),
+            "options": options.to_dict(),
+            "animation": animation.to_dict(),
+            "timings": timings.to_dict()
+        }
+    
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def _render_with_broker(description: str, scene: dict, options: RenderOptions,
+                        priority: str, **job) -> dict:
+    """Submit a render job (extra payload fields in job) to the broker and wait for its result"""
+    job_id = render_broker.submit(
+        {"description": description, "scene": scene, "options": options.to_dict(), **job},
+        priority=PRIORITIES.index(priority)
+    )
+    try:
+        return render_broker.wait(job_id, JOB_TIMEOUT)
+    except BrokerTimeout as e:
+        return {"success": False, "error": str(e)}
+
+
+def _render_tiles(description: str, scene: dict, options: RenderOptions,
+                  priority: str, on_tile=None, tiles=None, base=None) -> dict:
+    """
+    Render a frame as tiles: on the broker's render workers when a
+    broker is configured (they must share output_images/), otherwise on
+    the local raytracer worker pool. tiles and base restrict the render
+    to changed tiles over a previous frame (see render_tiled).
+    """
+    raytracer = get_raytracer()
+    if render_broker is not None:
+        return render_tiled(
+            raytracer, description, scene, options,
+            render_tile=lambda tile_options, tile, path: _render_with_broker(
+                description, scene, tile_options, priority, tile=tile, output_path=path),
+            workers=len(render_broker.workers()) or 1,
+            on_tile=on_tile, tiles=tiles, base=base
+        )
+    if not raytracer.available:
+        return raytracer.generate(description, options.width, options.height,
+                                  scene=scene, options=options)
+    return render_tiled(raytracer, description, scene, options, on_tile=on_tile,
+                        tiles=tiles, base=base)
+
+
 @app.get("/api/raytracer/status")
 async def raytracer_status():
     """Check raytracer status"""
-    import sys
-    import os
-    backend_path = os.path.dirname(__file__)
-    if backend_path not in sys.path:
-        sys.path.insert(0, backend_path)
+    return {
+        **get_raytracer_status(),
+        "limits": render_limits.to_dict(),
+        "tile_min_pixels": tile_threshold,
+        "storage": image_store.stats() if image_store is not None else None,
+        "admission": admission.stats(),
+        "broker": render_broker.stats() if render_broker is not None else None
+    }
+
+
+# ============================================================================
+# Routes - Chat socket
+# ============================================================================
+
+# Requests one chat connection may have in progress at once
+MAX_SOCKET_REQUESTS = 4
+
+
+@app.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket):
+    """
+    Chat over one persistent connection, with generation events streamed.
+    
+    Each client message is an /api/generate body (optionally with an
+    "id"), or plain text taken as the description. Replies are JSON
+    events carrying "type" and the message's "id", in order:
+    
+    - entities: parsed objects, right after parsing ("edit" too when
+      the message edited the connection's scene)
+    - scene: scene JSON with the frame width and height, and the
+      preview_width and preview_height tiles are streamed at; for edits
+      re-rendered in part, "base" (URL of the previous frame) and
+      "dirty_tiles"
+    - queue: place in the admission queue (0 once rendering)
+    - tile / progress: each finished tile as a PNG data URL, scaled down
+      to the "preview" image size (full-size tiles would send the whole
+      frame over the socket), and the tiles done so far
+    - result: the /api/generate response
+    - error: "error", plus "status" and "retry_after" when admission
+      control turned the request away
+    
+    Up to MAX_SOCKET_REQUESTS messages are accepted at once. The
+    connection keeps the last rendered scene (SceneSession): messages
+    such as "make the cube red" or "add a sphere" edit it, and only the
+    tiles the edit can change are rendered again. Messages are therefore
+    rendered in the order they arrive, each on the scene the previous one
+    left.
+    """
+    await websocket.accept()
+    session = SceneSession()
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    tasks = set()
+    
+    async def send_events():
+        while True:
+            await websocket.send_json(await events.get())
+    
+    sender = asyncio.create_task(send_events())
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                request = json.loads(message)
+            except json.JSONDecodeError:
+                request = {"description": message}
+            if not isinstance(request, dict):
+                request = {"description": str(request)}
+            request_id = request.get("id") or uuid.uuid4().hex[:8]
+            
+            def emit(event_type: str, request_id=request_id, **data):
+                # Callable from render threads as well as from the loop
+                loop.call_soon_threadsafe(events.put_nowait,
+                                          {"type": event_type, "id": request_id, **data})
+            
+            if len(tasks) >= MAX_SOCKET_REQUESTS:
+                emit("error", error="Too many requests in progress", status=429)
+                continue
+            task = asyncio.create_task(_chat_request(request, emit, session))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        sender.cancel()
+
+
+async def _chat_request(request: dict, emit, session: SceneSession):
+    """
+    Parse, build and render one chat message, emitting events as it goes.
+    
+    Edits of the session's scene reuse its last frame for the tiles
+    they cannot change; the session is updated after each render.
+    Messages of one connection run one after the other (session.lock),
+    so each sees the scene the previous one left.
+    """
+    try:
+        options, priority = _parse_render_request(request)
+        description = request.get('description', '')
+        if not description:
+            raise ValueError("Description required")
+        
+        async with session.lock:
+            await _chat_render(emit, session, options, priority, description)
+    
+    except HTTPException as e:
+        emit("error", error=e.detail, status=e.status_code)
+    except AdmissionRejected as e:
+        emit("error", error=e.detail, status=e.status_code, retry_after=e.retry_after)
+    except Exception as e:
+        emit("error", error=str(e))
+
+
+async def _chat_render(emit, session: SceneSession, options: RenderOptions,
+                       priority: str, description: str):
+    """Edit or replace the session's scene and render it (holding session.lock)"""
+    timings = metrics.Timings()
+    previous = SceneSession(session.entities, session.scene, session.filename, session.options)
+    with timings.span("parse"):
+        engine = NLPEngine()
+        edit = engine.parse_edit(description) if previous.entities else None
+        if edit is not None:
+            entities = engine.apply_edit(previous.entities, edit)
+        else:
+            entities = engine.parse_description(description)
+    emit("entities", entities=[entity.to_dict() for entity in entities],
+         **({"edit": edit.to_dict()} if edit is not None else {}))
+    if not entities:
+        emit("error", error="Nothing left in the scene" if edit else "Could not parse description")
+        return
     
-    from raytracer_integration import get_raytracer_status
-    return get_raytracer_status()
+    with timings.span("scene"):
+        scene = SceneGenerator().generate_scene(entities, animate=False)
+    
+    tiles = base = None
+    if edit is not None and previous.filename and same_frame(previous.options, options):
+        base_path = os.path.join(get_raytracer().output_dir, previous.filename)
+        if os.path.exists(base_path):
+            tiles = dirty_tiles(previous.scene, scene, options)
+            if tiles is not None:
+                base = base_path
+                if image_store is not None:
+                    image_store.touch(previous.filename)
+    frame_size = (options.width, options.height)
+    preview = fit_size(options.width, options.height, IMAGE_SIZES["preview"])
+    if base is not None:
+        emit("scene", scene=scene, width=options.width, height=options.height,
+             preview_width=preview[0], preview_height=preview[1],
+             base=f"/api/images/{previous.filename}", dirty_tiles=len(tiles))
+    else:
+        emit("scene", scene=scene, width=options.width, height=options.height,
+             preview_width=preview[0], preview_height=preview[1])
+    
+    def on_tile(tile, pixels, done, total):
+        x, y, width, height = scale_region(tile, frame_size, preview)
+        if width and height:
+            if (width, height) != tuple(tile[2:]):
+                pixels = box_downscale(pixels, tile[2], tile[3], width, height)
+            png = base64.b64encode(encode_png(width, height, pixels, level=1)).decode()
+            emit("tile", x=x, y=y, width=width, height=height,
+                 image=f"data:image/png;base64,{png}")
+        emit("progress", done=done, total=total, percent=round(100 * done / total))
+    
+    result = await _admitted_render(priority, timings, description, scene, options,
+                                    on_position=lambda position: emit("queue", position=position),
+                                    on_tile=on_tile, tiles=tiles, base=base)
+    for stage, seconds in result.get('timings', {}).items():
+        timings.add(stage, seconds)
+    metrics.record_render_stats(result.get('stats'))
+    
+    if not result['success']:
+        emit("error", error=result.get('error', 'Raytracer error'))
+        return
+    _store_images([result['filename']])
+    # Fallback previews (no raytracer stats) cannot serve as the base of an edit
+    frame = result['filename'] if 'stats' in result else None
+    session.update(entities, scene, frame, options)
+    emit("result", **_generate_response(description, entities, result, options, timings))
 
 
 # ============================================================================
 # Routes - Scenes (legacy)
 # ============================================================================
 
-@app.post("/api/scenes", status_code=201)
-async def create_scene(scene: dict):
-    """Create new scene"""
+def _new_scene_record(scene: dict) -> dict:
+    """Assign ID and creation time to a scene and build its API summary"""
     scene_id = str(uuid.uuid4())[:8]
     scene["id"] = scene_id
     scene["created_at"] = datetime.now().isoformat()
     
-    SceneData.scenes[scene_id] = scene
-    
-    scene_file = scenes_dir / f"{scene_id}.json"
-    with open(scene_file, 'w') as f:
-        json.dump(scene, f, indent=2)
-    
     return {
         "id": scene_id,
         "name": scene.get("name", "Untitled"),
@@ -574,6 +769,133 @@ async def create_scene(scene: dict):
     }
 
 
+def _write_scene_files(scenes: List[dict]):
+    """
+    Write scenes as one batch.
+    
+    Each file is written and fsynced under a temporary name and renamed
+    into place, then the directory is fsynced once for the whole batch
+    instead of per file. Temporary files left by a failure are removed.
+    """
+    tmp_files = []
+    try:
+        for scene in scenes:
+            tmp_file = scenes_dir / f"{scene['id']}.json.tmp"
+            tmp_files.append(tmp_file)
+            with open(tmp_file, 'w') as f:
+                json.dump(scene, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+        
+        for tmp_file in tmp_files:
+            os.replace(tmp_file, tmp_file.with_suffix(""))
+    except BaseException:
+        for tmp_file in tmp_files:
+            tmp_file.unlink(missing_ok=True)
+        raise
+    
+    _fsync_dir(scenes_dir)
+
+
+def _delete_scene_files(scene_ids: List[str]) -> List[dict]:
+    """Delete scene files as one batch, returning a result per ID"""
+    results = []
+    for scene_id in scene_ids:
+        if not isinstance(scene_id, str) or not SCENE_ID_PATTERN.match(scene_id):
+            results.append({"id": scene_id, "status": 400, "error": "Invalid scene ID"})
+            continue
+        
+        try:
+            (scenes_dir / f"{scene_id}.json").unlink()
+        except FileNotFoundError:
+            results.append({"id": scene_id, "status": 404, "error": "Scene not found"})
+            continue
+        
+        scene_cache.discard(scene_id)
+        results.append({"id": scene_id, "status": 200, "deleted": scene_id})
+    
+    _fsync_dir(scenes_dir)
+    return results
+
+
+def _fsync_dir(path: Path):
+    """Flush directory entries (creates/renames/unlinks) to disk"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Not supported on Windows
+    
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _check_bulk_size(items: list):
+    """Reject empty or oversized bulk requests"""
+    if not items:
+        raise HTTPException(status_code=400, detail="Empty bulk request")
+    if len(items) > MAX_BULK_SCENES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items (max {MAX_BULK_SCENES})"
+        )
+
+
+@app.post("/api/scenes", status_code=201)
+async def create_scene(scene: dict):
+    """Create new scene"""
+    record = _new_scene_record(scene)
+    
+    scene_file = scenes_dir / f"{record['id']}.json"
+    with open(scene_file, 'w') as f:
+        json.dump(scene, f, indent=2)
+    
+    return record
+
+
+@app.post("/api/scenes/bulk")
+async def create_scenes_bulk(scenes: List[Any] = Body(...)):
+    """
+    Create many scenes in one request.
+    
+    Body is a JSON array of scenes. Files are written in one batch off the
+    event loop; the response holds one result per item, in order.
+    """
+    _check_bulk_size(scenes)
+    
+    results = []
+    valid = []
+    for scene in scenes:
+        if not isinstance(scene, dict):
+            results.append({"status": 400, "error": "Scene must be an object"})
+            continue
+        results.append({"status": 201, **_new_scene_record(scene)})
+        valid.append(scene)
+    
+    try:
+        await run_in_threadpool(_write_scene_files, valid)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Storage error: {e}")
+    
+    return {"results": results, "created": len(valid), "failed": len(scenes) - len(valid)}
+
+
+@app.delete("/api/scenes/bulk")
+async def delete_scenes_bulk(scene_ids: List[Any] = Body(...)):
+    """
+    Delete many scenes in one request.
+    
+    Body is a JSON array of scene IDs. Missing or invalid IDs get a 404/400
+    result instead of failing the whole batch.
+    """
+    _check_bulk_size(scene_ids)
+    
+    results = await run_in_threadpool(_delete_scene_files, scene_ids)
+    deleted = sum(1 for result in results if result["status"] == 200)
+    
+    return {"results": results, "deleted": deleted, "failed": len(results) - deleted}
+
+
 @app.get("/api/scenes")
 async def list_scenes():
     """List all scenes"""
@@ -591,15 +913,17 @@ async def list_scenes():
 
 
 @app.get("/api/scenes/{scene_id}")
-async def get_scene(scene_id: str):
-    """Get scene by ID"""
-    scene_file = scenes_dir / f"{scene_id}.json"
-    
-    if not scene_file.exists():
+async def get_scene(scene_id: str, format: int = 1):
+    """Get scene by ID (format=2 returns the deduplicated instanced encoding)"""
+    try:
+        scene = scene_cache.load(scene_id, scenes_dir / f"{scene_id}.json")
+    except FileNotFoundError:
+        scene_cache.discard(scene_id)
         raise HTTPException(status_code=404, detail="Scene not found")
     
-    with open(scene_file) as f:
-        return json.load(f)
+    if format == SCENE_FORMAT_V2:
+        return encode_scene(scene)
+    return decode_scene(scene)
 
 
 @app.delete("/api/scenes/{scene_id}")
@@ -611,9 +935,7 @@ async def delete_scene(scene_id: str):
         raise HTTPException(status_code=404, detail="Scene not found")
     
     scene_file.unlink()
-    
-    if scene_id in SceneData.scenes:
-        del SceneData.scenes[scene_id]
+    scene_cache.discard(scene_id)
     
     return {"deleted": scene_id}
 
@@ -640,7 +962,8 @@ async def root():
         "name": "ImageGen API",
         "version": "1.0.0",
         "docs": "/docs",
-        "chat": "/chat"
+        "chat": "/chat",
+        "viewer": "/static/index.html"
     }
 
 
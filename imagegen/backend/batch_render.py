@@ -0,0 +1,198 @@
+"""
+Batch Render - Offline text-to-image generation for many descriptions
+
+Reads jobs from JSONL, then parses, generates and renders them in a pool
+of worker processes. Each worker keeps its own NLP engine, scene generator
+and raytracer handle, and renders straight to the output directory (no
+HTTP server involved). Results are listed in manifest.jsonl.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from backend.render_options import RenderOptions
+
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# Per-process state, created once by _init_worker
+_worker = {}
+
+
+def read_jobs(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Read jobs from a JSONL stream.
+
+    Each non-empty line is either a JSON object with a "description" key
+    (optional: "id", "width", "height", "animate") or a JSON string.
+
+    Args:
+        stream: Open text stream (file or stdin)
+
+    Yields:
+        Job dictionaries with an "index" key added
+    """
+    index = 0
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_number}: invalid JSON ({e})")
+
+        if isinstance(job, str):
+            job = {"description": job}
+        if not isinstance(job, dict) or not job.get("description"):
+            raise ValueError(f"Line {line_number}: expected an object with a description")
+
+        job["index"] = index
+        index += 1
+        yield job
+
+
+def run_batch(jobs: Iterable[Dict[str, Any]], output_dir: str, jobs_count: int = None,
+              width: int = 800, height: int = 600, render: bool = True,
+              raytracer_path: str = None, samples: int = None, depth: int = None,
+              threads: int = 1, denoise: int = None) -> Dict[str, Any]:
+    """
+    Generate and render all jobs in parallel worker processes.
+
+    Args:
+        jobs: Job dictionaries (see read_jobs)
+        output_dir: Directory for images, scenes and the manifest
+        jobs_count: Number of worker processes (default: CPU count)
+        width: Default image width (jobs may override)
+        height: Default image height (jobs may override)
+        render: Render images (False only writes scenes)
+        raytracer_path: Raytracer binary (searched for if None)
+        samples: Samples per pixel (raytracer default if None)
+        depth: Maximum ray depth (raytracer default if None)
+        threads: Raytracer threads per job (1: the pool already uses every core)
+        denoise: Raytracer denoise passes (raytracer default if None)
+
+    Returns:
+        Summary with counts, elapsed time and manifest path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs_count = jobs_count or os.cpu_count() or 1
+
+    defaults = {"width": width, "height": height, "render": render,
+                "raytracer_path": raytracer_path, "samples": samples,
+                "depth": depth, "threads": threads, "denoise": denoise}
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    start = time.time()
+    total = succeeded = 0
+
+    with ProcessPoolExecutor(max_workers=jobs_count,
+                             initializer=_init_worker,
+                             initargs=(output_dir, defaults)) as executor, \
+            open(manifest_path, 'w') as manifest:
+        # map() keeps input order, so the manifest matches the input file
+        for entry in executor.map(_run_job, jobs, chunksize=4):
+            manifest.write(json.dumps(entry) + "\n")
+            total += 1
+            succeeded += entry["success"]
+            status = "✅" if entry["success"] else "❌"
+            print(f"{status} [{entry['index']}] {entry['description']}", flush=True)
+
+    return {
+        "total": total,
+        "succeeded": succeeded,
+        "failed": total - succeeded,
+        "elapsed": round(time.time() - start, 3),
+        "workers": jobs_count,
+        "manifest": manifest_path
+    }
+
+
+def _init_worker(output_dir: str, defaults: Dict[str, Any]):
+    """Create the per-process engine state"""
+    # Keep raytracer chatter out of the batch progress output
+    sys.stdout = open(os.devnull, 'w')
+
+    from backend.nlp_engine import NLPEngine
+    from backend.scene_generator import SceneGenerator
+    from backend.raytracer_integration import RaytracerIntegration
+
+    _worker["nlp"] = NLPEngine()
+    _worker["scene_gen"] = SceneGenerator()
+    _worker["raytracer"] = RaytracerIntegration(defaults["raytracer_path"])
+    _worker["output_dir"] = output_dir
+    _worker["defaults"] = defaults
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse, generate and render one job; never raises"""
+    defaults = _worker["defaults"]
+    job_id = _safe_name(str(job.get("id", f"{job['index']:06d}")))
+    output_dir = _worker["output_dir"]
+
+    entry = {
+        "index": job["index"],
+        "id": job_id,
+        "description": job["description"],
+        "success": False
+    }
+
+    try:
+        entities = _worker["nlp"].parse_description(job["description"])
+        if not entities:
+            entry["error"] = "Could not parse description"
+            return entry
+
+        scene = _worker["scene_gen"].generate_scene(
+            entities, animate=bool(job.get("animate", False))
+        )
+        scene_file = f"{job_id}.json"
+        with open(os.path.join(output_dir, scene_file), 'w') as f:
+            json.dump(scene, f)
+
+        entry["objects_count"] = sum(entity.count for entity in entities)
+        entry["scene"] = scene_file
+
+        if defaults["render"]:
+            width = int(job.get("width", defaults["width"]))
+            height = int(job.get("height", defaults["height"]))
+            image_file = f"{job_id}.ppm"
+            options = RenderOptions(
+                width, height, defaults["samples"], defaults["depth"], defaults["threads"],
+                defaults["denoise"]
+            )
+
+            result = _worker["raytracer"].generate(
+                job["description"], width, height, scene=scene,
+                output_path=os.path.join(output_dir, image_file), options=options
+            )
+            if not result["success"]:
+                entry["error"] = result.get("error", "Render failed")
+                return entry
+
+            entry.update({
+                "image": image_file,
+                "width": width,
+                "height": height,
+                "render_time": result["render_time"],
+                "stats": result.get("stats", {})
+            })
+            if result.get("note"):
+                entry["note"] = result["note"]
+
+        entry["success"] = True
+    except Exception as e:
+        entry["error"] = str(e)
+
+    return entry
+
+
+def _safe_name(name: str) -> str:
+    """Make a job ID safe to use as a file name"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name).lstrip(".") or "job"
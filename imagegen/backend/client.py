@@ -1,65 +1,123 @@
 """
 API Client - Communicates with backend server
+Synchronous client uses a pooled requests.Session (keep-alive + retries);
+AsyncAPIClient needs the optional httpx package.
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import sys
 
+try:
+    import httpx
+except ImportError:  # Optional dependency (AsyncAPIClient only)
+    httpx = None
+
+
+# Status codes worth retrying (server restarting / overloaded)
+RETRY_STATUSES = (502, 503, 504)
+
+# Methods that can be retried after the request reached the server
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
 
 class APIClient:
     """Client for backend API"""
-    
-    def __init__(self, base_url: str = "http://localhost:5000"):
+
+    def __init__(self, base_url: str = "http://localhost:5000",
+                 timeout: float = 30, retries: int = 3,
+                 backoff_factor: float = 0.3, pool_size: int = 10):
         """
         Initialize API client.
-        
+
+        No request is made here; call check_connection() to probe the server.
+
         Args:
             base_url: Base URL of backend server
+            timeout: Default request timeout (seconds)
+            retries: Retries for connection errors and 502/503/504 responses
+            backoff_factor: Exponential backoff base between retries (seconds)
+            pool_size: Max keep-alive connections kept open to the server
         """
         self.base_url = base_url
-        self.timeout = 30
-        self._check_connection()
-    
-    def _check_connection(self):
+        self.timeout = timeout
+        self.session = self._create_session(retries, backoff_factor, pool_size)
+
+    def _create_session(self, retries: int, backoff_factor: float,
+                        pool_size: int) -> requests.Session:
+        """Create a keep-alive session with retrying connection pool"""
+        # POST is only retried on connection errors (request never sent)
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def check_connection(self) -> bool:
         """Check if backend is running"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/health",
                 timeout=2
             )
             if response.status_code == 200:
                 print("✅ Connected to backend")
-            else:
-                self._warn_offline()
-        except requests.exceptions.ConnectionError:
+                return True
             self._warn_offline()
-    
+        except requests.exceptions.RequestException:
+            self._warn_offline()
+        return False
+
     def _warn_offline(self):
         """Warn if backend is offline"""
         print("⚠️  Backend server not running")
         print("   Start with: python backend/app.py")
         print("   Continuing in offline mode...")
-    
+
     def create_scene(self, scene_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create scene on backend.
-        
+
         Args:
             scene_data: Scene dictionary
-            
+
         Returns:
             Scene with ID and metadata
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/scenes",
                 json=scene_data,
                 timeout=self.timeout
             )
-            
+
             if response.status_code == 201:
                 return response.json()
             else:
@@ -68,86 +126,321 @@ class APIClient:
         except requests.exceptions.ConnectionError:
             print("⚠️  Server offline, using local scene")
             return scene_data
-        except Exception as e:
+        except requests.exceptions.Timeout:
+            print(f"⚠️  Server timed out after {self.timeout}s, using local scene")
+            return scene_data
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"⚠️  API error: {e}")
             return scene_data
-    
-    def get_scene(self, scene_id: str) -> Dict[str, Any]:
+
+    def create_scenes(self, scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many scenes in one request (POST /api/scenes/bulk).
+
+        Args:
+            scenes: Scene dictionaries
+
+        Returns:
+            One result per scene, in order ({"status": 201, "id": ...} on
+            success); empty list if the request failed
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/scenes/bulk",
+                json=scenes,
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                return response.json()["results"]
+            print(f"⚠️  Server returned: {response.status_code}")
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            print(f"⚠️  API error: {e}")
+        return []
+
+    def get_scene(self, scene_id: str) -> Optional[Dict[str, Any]]:
         """Get scene by ID"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/scenes/{scene_id}",
                 timeout=self.timeout
             )
+            if response.status_code != 200:
+                return None
             return response.json()
-        except:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"⚠️  API error: {e}")
             return None
-    
+
     def export_png(self, scene_id: str, output_path: str):
         """Export scene as PNG"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/scenes/{scene_id}/export",
                 json={"format": "png"},
                 timeout=60
             )
-            
+
             if response.status_code == 200:
                 with open(output_path, 'wb') as f:
                     f.write(response.content)
                 print(f"✅ Exported to {output_path}")
             else:
                 print(f"❌ Export failed: {response.status_code}")
-        except Exception as e:
+        except (requests.exceptions.RequestException, OSError) as e:
             print(f"❌ Export error: {e}")
-    
+
     def export_html(self, scene_id: str, output_path: str):
         """Export scene as standalone HTML"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/scenes/{scene_id}/export",
                 json={"format": "html"},
                 timeout=30
             )
-            
+
             if response.status_code == 200:
                 with open(output_path, 'w') as f:
                     f.write(response.text)
                 print(f"✅ Exported to {output_path}")
             else:
                 print(f"❌ Export failed: {response.status_code}")
-        except Exception as e:
+        except (requests.exceptions.RequestException, OSError) as e:
             print(f"❌ Export error: {e}")
-    
+
     def list_scenes(self) -> list:
         """List all scenes"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/scenes",
                 timeout=self.timeout
             )
             return response.json()
-        except:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"⚠️  API error: {e}")
             return []
-    
+
     def delete_scene(self, scene_id: str):
         """Delete scene"""
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}/api/scenes/{scene_id}",
                 timeout=self.timeout
             )
             if response.status_code == 200:
                 print(f"✅ Scene deleted: {scene_id}")
             return response.status_code == 200
-        except:
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  API error: {e}")
             return False
 
+    def delete_scenes(self, scene_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Delete many scenes in one request (DELETE /api/scenes/bulk).
+
+        Args:
+            scene_ids: Scene IDs
+
+        Returns:
+            One result per ID, in order ({"status": 200} when deleted,
+            404 when missing); empty list if the request failed
+        """
+        try:
+            response = self.session.delete(
+                f"{self.base_url}/api/scenes/bulk",
+                json=scene_ids,
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                return response.json()["results"]
+            print(f"⚠️  Server returned: {response.status_code}")
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            print(f"⚠️  API error: {e}")
+        return []
+
+
+class AsyncAPIClient:
+    """
+    Asynchronous client for backend API (requires httpx).
+
+    One AsyncAPIClient shares a keep-alive connection pool between
+    concurrent calls:
+
+        async with AsyncAPIClient() as client:
+            results = await client.create_scenes_concurrently(scenes)
+    """
+
+    def __init__(self, base_url: str = "http://localhost:5000",
+                 timeout: float = 30, retries: int = 3,
+                 backoff_factor: float = 0.3, pool_size: int = 10):
+        """
+        Initialize async API client.
+
+        Args:
+            base_url: Base URL of backend server
+            timeout: Default request timeout (seconds)
+            retries: Retries for connection errors and 502/503/504 responses
+            backoff_factor: Exponential backoff base between retries (seconds)
+            pool_size: Max concurrent connections to the server
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncAPIClient requires httpx: pip install httpx"
+            )
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size
+            )
+        )
+
+    async def close(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """
+        Send a request, retrying with exponential backoff.
+
+        Connection errors are retried for every method; timeouts and
+        502/503/504 responses only for idempotent methods.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                if (response.status_code not in RETRY_STATUSES
+                        or method not in IDEMPOTENT_METHODS
+                        or attempt >= self.retries):
+                    return response
+            except httpx.ConnectError:
+                if attempt >= self.retries:
+                    raise
+            except httpx.TimeoutException:
+                if method not in IDEMPOTENT_METHODS or attempt >= self.retries:
+                    raise
+
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def check_connection(self) -> bool:
+        """Check if backend is running"""
+        try:
+            response = await self._request("GET", "/api/health", timeout=2)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def create_scene(self, scene_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create scene on backend.
+
+        Args:
+            scene_data: Scene dictionary
+
+        Returns:
+            Scene with ID and metadata (scene_data itself if the server is offline)
+        """
+        try:
+            response = await self._request("POST", "/api/scenes", json=scene_data)
+            if response.status_code == 201:
+                return response.json()
+            print(f"⚠️  Server returned: {response.status_code}")
+            return scene_data
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"⚠️  API error: {e!r}")
+            return scene_data
+
+    async def create_scenes_concurrently(self, scenes: List[Dict[str, Any]],
+                                         concurrency: int = None) -> List[Dict[str, Any]]:
+        """
+        Create many scenes concurrently over the shared connection pool.
+
+        Args:
+            scenes: Scene dictionaries
+            concurrency: Max requests in flight (default: pool size)
+
+        Returns:
+            Results in the same order as scenes
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.pool_size)
+
+        async def create(scene_data):
+            async with semaphore:
+                return await self.create_scene(scene_data)
+
+        return await asyncio.gather(*(create(scene) for scene in scenes))
+
+    async def create_scenes(self, scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many scenes in one request (see APIClient.create_scenes)"""
+        try:
+            response = await self._request("POST", "/api/scenes/bulk", json=scenes)
+            if response.status_code == 200:
+                return response.json()["results"]
+            print(f"⚠️  Server returned: {response.status_code}")
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            print(f"⚠️  API error: {e!r}")
+        return []
+
+    async def get_scene(self, scene_id: str) -> Optional[Dict[str, Any]]:
+        """Get scene by ID"""
+        try:
+            response = await self._request("GET", f"/api/scenes/{scene_id}")
+            if response.status_code != 200:
+                return None
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"⚠️  API error: {e!r}")
+            return None
+
+    async def list_scenes(self) -> list:
+        """List all scenes"""
+        try:
+            response = await self._request("GET", "/api/scenes")
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"⚠️  API error: {e!r}")
+            return []
+
+    async def delete_scene(self, scene_id: str) -> bool:
+        """Delete scene"""
+        try:
+            response = await self._request("DELETE", f"/api/scenes/{scene_id}")
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            print(f"⚠️  API error: {e!r}")
+            return False
+
+    async def delete_scenes(self, scene_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete many scenes in one request (see APIClient.delete_scenes)"""
+        try:
+            response = await self._request("DELETE", "/api/scenes/bulk", json=scene_ids)
+            if response.status_code == 200:
+                return response.json()["results"]
+            print(f"⚠️  Server returned: {response.status_code}")
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            print(f"⚠️  API error: {e!r}")
+        return []
+
 
 # Usage example
 if __name__ == "__main__":
     client = APIClient()
-    
+    client.check_connection()
+
     # Create a test scene
     test_scene = {
         "name": "Test Scene",
@@ -165,6 +458,7 @@ if __name__ == "__main__":
             "camera": {"position": [0, 0, 5]}
         }
     }
-    
+
     result = client.create_scene(test_scene)
     print(f"Created scene: {result.get('id')}")
+    client.close()
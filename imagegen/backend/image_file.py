@@ -0,0 +1,102 @@
+"""
+Image File - Memory-mapped PPM images
+
+Rendered images are binary PPMs (P6, 8-bit). The raytracer maps its
+output file and renders into it (image_file_create in
+raytracer_c/src/core/image.h); the backend maps images the same way and
+hands their pixels out as memoryview slices of the mapping. Encoding a
+frame (PNG, tile previews), filling one (fallback gradient) or stitching
+tiles never builds a full-frame bytes object, and the pages are shared
+with the page cache instead of copied into every process.
+"""
+
+import mmap
+import os
+import re
+
+# "P6 <width> <height> <maxval>" followed by one whitespace byte
+PPM_HEADER = re.compile(rb"P6\s+(\d+)\s+(\d+)\s+(\d+)\s")
+
+# Longest header read (magic, two 4-digit sizes, maxval and separators)
+PPM_HEADER_MAX_BYTES = 64
+
+
+def ppm_header(width: int, height: int) -> bytes:
+    """Header written by the raytracer (image_write_ppm / image_file_create)"""
+    return f"P6\n{width} {height}\n255\n".encode()
+
+
+class PPMImage:
+    """
+    Binary PPM file mapped in memory.
+
+    pixels is a memoryview of the RGB bytes (rows top to bottom); slices
+    of it must be released before close().
+    """
+
+    def __init__(self, path: str, width: int, height: int, offset: int, mapped: mmap.mmap):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.offset = offset
+        self._map = mapped
+        self.pixels = memoryview(mapped)[offset:offset + width * height * 3]
+
+    def row(self, y: int) -> memoryview:
+        """RGB bytes of one row"""
+        stride = self.width * 3
+        return self.pixels[y * stride:(y + 1) * stride]
+
+    def close(self):
+        self.pixels.release()
+        self._map.close()
+
+    def __enter__(self) -> "PPMImage":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_ppm(path: str, writable: bool = False) -> PPMImage:
+    """
+    Map an existing 8-bit binary PPM.
+
+    Raises:
+        ValueError: The file is not an 8-bit binary PPM, or is truncated
+    """
+    with open(path, "r+b" if writable else "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is not an 8-bit binary PPM")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    match = PPM_HEADER.match(mapped[:PPM_HEADER_MAX_BYTES])
+    if not match or int(match.group(3)) != 255:
+        mapped.close()
+        raise ValueError(f"{path} is not an 8-bit binary PPM")
+    width, height = int(match.group(1)), int(match.group(2))
+    if len(mapped) < match.end() + width * height * 3:
+        mapped.close()
+        raise ValueError(f"{path} is truncated")
+    return PPMImage(path, width, height, match.end(), mapped)
+
+
+def create_ppm(path: str, width: int, height: int) -> PPMImage:
+    """Create a black width x height PPM (allocated at full size) and map it for writing"""
+    header = ppm_header(width, height)
+    with open(path, "w+b") as f:
+        f.truncate(len(header) + width * height * 3)
+        mapped = mmap.mmap(f.fileno(), 0)
+    mapped[:len(header)] = header
+    return PPMImage(path, width, height, len(header), mapped)
+
+
+def read_ppm_header(f, width: int, height: int, path: str):
+    """Consume a "P6 <w> <h> 255" header of a file opened in binary mode"""
+    fields = []
+    while len(fields) < 4:
+        line = f.readline(PPM_HEADER_MAX_BYTES)
+        if not line:
+            break
+        fields += line.split()
+    if fields != [b"P6", str(width).encode(), str(height).encode(), b"255"]:
+        raise ValueError(f"{path} is not a {width}x{height} binary PPM")
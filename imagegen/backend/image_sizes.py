@@ -0,0 +1,134 @@
+"""
+Image Sizes - Downscaled PNG derivatives of rendered images
+
+Rendered images are full-size PPMs, which browsers do not display and
+which are much larger than the chat needs. GET
+/api/images/{filename}?size=thumb|preview|full serves a PNG derivative
+instead, made once per image: the PPM is mapped (image_file.py),
+box-filtered down to the size's longest edge (each output pixel is the
+mean of the source pixels it covers) and encoded. The derivative is
+cached next to the image in output_images/ as <name>.<size>.png, so the
+image store budgets and evicts it like any other image; an evicted
+derivative is made again on the next request.
+"""
+
+import os
+import sys
+from itertools import accumulate
+from typing import Dict, Optional, Tuple
+
+from backend.animation import encode_png
+from backend.image_file import open_ppm
+
+
+# Longest edge per derivative size (None = original size)
+IMAGE_SIZES: Dict[str, Optional[int]] = {
+    "thumb": 256,
+    "preview": 640,
+    "full": None
+}
+
+
+# Column sums are added as 32-bit lanes of one integer (memoryview format "I")
+LANE_BYTES = 4
+LANE_OFFSET = 0 if sys.byteorder == "little" else LANE_BYTES - 1
+
+
+def derivative_name(filename: str, size: str) -> str:
+    """File name of a derivative in output_images/ (render_x.ppm -> render_x.thumb.png)"""
+    return f"{os.path.splitext(filename)[0]}.{size}.png"
+
+
+def fit_size(width: int, height: int, max_edge: Optional[int]) -> Tuple[int, int]:
+    """Size of an image scaled to fit max_edge (never scaled up)"""
+    if max_edge is None or max(width, height) <= max_edge:
+        return width, height
+    scale = max_edge / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def scale_region(region: Tuple[int, int, int, int], size: Tuple[int, int],
+                 scaled: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """
+    Region (x, y, width, height) of a size image mapped onto the image
+    scaled to scaled; the regions of adjacent tiles stay adjacent (a
+    region may come out empty).
+    """
+    x, y, width, height = region
+    x0, y0 = x * scaled[0] // size[0], y * scaled[1] // size[1]
+    return (x0, y0,
+            (x + width) * scaled[0] // size[0] - x0,
+            (y + height) * scaled[1] // size[1] - y0)
+
+
+def box_downscale(pixels, width: int, height: int,
+                  out_width: int, out_height: int) -> bytes:
+    """
+    Shrink RGB pixels (rows top to bottom) with a box filter.
+
+    Output pixel (i, j) averages the source block spanning columns
+    [i * width / out_width, (i + 1) * width / out_width) and the same for
+    rows. The rows of a block are added as whole integers, one 32-bit
+    lane per byte (no per-pixel Python work), then split into block sums
+    per column; source rows are slices of pixels, so a mapped PPM is not
+    copied.
+    """
+    pixels = memoryview(pixels)
+    stride = width * 3
+    xs = [i * width // out_width for i in range(out_width + 1)]
+    ys = [j * height // out_height for j in range(out_height + 1)]
+    spans = list(zip(xs, xs[1:]))
+    widths = [x1 - x0 for x0, x1 in spans for _ in range(3)]
+    lanes = bytearray(stride * LANE_BYTES)
+    out = bytearray(out_width * out_height * 3)
+    out_stride = out_width * 3
+    for j in range(out_height):
+        y0, y1 = ys[j], ys[j + 1]
+        total = 0
+        for y in range(y0, y1):
+            lanes[LANE_OFFSET::LANE_BYTES] = pixels[y * stride:(y + 1) * stride]
+            total += int.from_bytes(lanes, sys.byteorder)
+        columns = memoryview(total.to_bytes(len(lanes), sys.byteorder)).cast("I")
+
+        sums = [0] * out_stride
+        for c in range(3):
+            prefix = [0, *accumulate(columns[c::3])]
+            sums[c::3] = [prefix[x1] - prefix[x0] for x0, x1 in spans]
+        rows = y1 - y0
+        out[j * out_stride:(j + 1) * out_stride] = bytes(
+            (block + count // 2) // count
+            for block, count in zip(sums, [w * rows for w in widths]))
+    return bytes(out)
+
+
+def make_derivative(directory: str, filename: str, size: str) -> str:
+    """
+    Write the size derivative of an image in directory.
+
+    The PNG is written under a temporary name and renamed, so concurrent
+    readers never see a partial file.
+
+    Returns:
+        Derivative file name (see derivative_name)
+
+    Raises:
+        ValueError: Unknown size, or the image is not a binary PPM
+    """
+    if size not in IMAGE_SIZES:
+        raise ValueError(f"size must be one of {', '.join(IMAGE_SIZES)}")
+    name = derivative_name(filename, size)
+    path = os.path.join(directory, name)
+
+    with open_ppm(os.path.join(directory, filename)) as image:
+        width, height = fit_size(image.width, image.height, IMAGE_SIZES[size])
+        if (width, height) == (image.width, image.height):
+            png = encode_png(width, height, image.pixels)
+        else:
+            png = encode_png(width, height, box_downscale(image.pixels, image.width, image.height,
+                                                          width, height))
+
+    partial = f"{path}.{os.getpid()}.part"
+    with open(partial, "wb") as f:
+        f.write(png)
+    os.replace(partial, path)
+    return name
@@ -0,0 +1,286 @@
+"""
+Image Store - Size and age budget for output_images/ with background GC
+
+Every render writes a new file into output_images/. ImageStore keeps the
+directory within a byte budget and a maximum age: a background thread
+deletes images past the age limit, then the least recently used ones
+until the directory fits the budget. Images referenced by saved scenes
+are never evicted, nor are images younger than the grace period (their
+URL was just handed to a client). Eviction runs off the request path;
+serving an image only records the access.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+# Prefix of the environment variables read by ImageStoreLimits.from_env
+ENV_PREFIX = "IMAGEGEN_IMAGE_STORE_"
+
+# URL prefix of stored images (see /api/images/{filename})
+IMAGE_URL_PREFIX = "/api/images/"
+
+
+@dataclass
+class ImageStoreLimits:
+    """Budget of the image store (bytes and seconds)"""
+    max_bytes: int = 1024 ** 3
+    max_age: int = 24 * 3600
+    gc_interval: int = 60
+    grace_period: int = 300
+
+    @classmethod
+    def from_env(cls, environ: Dict[str, str] = None) -> "ImageStoreLimits":
+        """
+        Read limits from IMAGEGEN_IMAGE_STORE_MAX_BYTES, _MAX_AGE,
+        _GC_INTERVAL and _GRACE_PERIOD.
+
+        Args:
+            environ: Environment mapping (default: os.environ)
+
+        Returns:
+            ImageStoreLimits (unset variables keep their defaults)
+        """
+        environ = os.environ if environ is None else environ
+        values = {}
+        for name in cls.__dataclass_fields__:
+            raw = environ.get(ENV_PREFIX + name.upper())
+            if raw is None:
+                continue
+            try:
+                values[name] = int(raw)
+            except ValueError:
+                raise ValueError(f"{ENV_PREFIX}{name.upper()} must be an integer")
+            if values[name] < 0:
+                raise ValueError(f"{ENV_PREFIX}{name.upper()} must not be negative")
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ImageStore:
+    """
+    Budgeted image directory.
+
+    Call add() after writing an image and touch() when serving one; both
+    are cheap. collect() does the eviction and normally runs on the
+    background thread started by start().
+    """
+
+    def __init__(self, directory: str, limits: ImageStoreLimits = None,
+                 referenced: Callable[[], Set[str]] = None):
+        """
+        Args:
+            directory: Directory holding the images
+            limits: Budget (default: ImageStoreLimits())
+            referenced: Returns the file names that must be kept
+                (e.g. SceneImageReferences)
+        """
+        self.directory = directory
+        self.limits = limits or ImageStoreLimits()
+        self.referenced = referenced or set
+        self._lock = threading.Lock()
+        self._access: Dict[str, float] = {}
+        self._bytes = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "evicted_files": 0,
+            "evicted_bytes": 0,
+            "collections": 0,
+            "last_collection": None,
+            "last_collection_seconds": None,
+            "referenced_files": 0
+        }
+        self._files = 0
+
+    def add(self, filename: str):
+        """Record a new image; wakes the collector when over budget"""
+        try:
+            size = os.path.getsize(os.path.join(self.directory, filename))
+        except OSError:
+            return
+        with self._lock:
+            if filename not in self._access:
+                self._files += 1
+                self._bytes += size
+            self._access[filename] = time.time()
+            over_budget = self._bytes > self.limits.max_bytes
+        if over_budget:
+            self._wake.set()
+
+    def touch(self, filename: str):
+        """Record that an image was served (for LRU order)"""
+        with self._lock:
+            self._access[filename] = time.time()
+
+    def collect(self) -> Dict[str, int]:
+        """
+        Evict expired images, then least recently used ones over the budget.
+
+        Returns:
+            Files and bytes evicted by this pass
+        """
+        start = time.perf_counter()
+        now = time.time()
+        keep = self.referenced()
+        entries = []  # (last access, name, size, modified)
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                with self._lock:
+                    access = self._access.setdefault(entry.name, max(stat.st_atime, stat.st_mtime))
+                entries.append((access, entry.name, stat.st_size, stat.st_mtime))
+
+        total = sum(size for _, _, size, _ in entries)
+        evicted = []
+        candidates = []
+        for access, name, size, modified in entries:
+            if name in keep or now - modified < self.limits.grace_period:
+                continue
+            if now - modified > self.limits.max_age:
+                evicted.append((name, size))
+                total -= size
+            else:
+                candidates.append((access, name, size))
+
+        for access, name, size in sorted(candidates):
+            if total <= self.limits.max_bytes:
+                break
+            evicted.append((name, size))
+            total -= size
+
+        removed_bytes = 0
+        removed = []
+        for name, size in evicted:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                total += size
+                continue
+            removed.append(name)
+            removed_bytes += size
+
+        with self._lock:
+            for name in removed:
+                self._access.pop(name, None)
+            live = {name for _, name, _, _ in entries} - set(removed)
+            for name, access in list(self._access.items()):
+                # Keep images added while this pass was scanning
+                if name not in live and access < now:
+                    del self._access[name]
+            self._files = len(live)
+            self._bytes = total
+            self._stats["evicted_files"] += len(removed)
+            self._stats["evicted_bytes"] += removed_bytes
+            self._stats["collections"] += 1
+            self._stats["last_collection"] = now
+            self._stats["last_collection_seconds"] = round(time.perf_counter() - start, 6)
+            self._stats["referenced_files"] = len(keep & live)
+
+        return {"files": len(removed), "bytes": removed_bytes}
+
+    def stats(self) -> Dict[str, Any]:
+        """Current usage, budget and eviction counters"""
+        with self._lock:
+            return {
+                "files": self._files,
+                "bytes": self._bytes,
+                **self.limits.to_dict(),
+                **self._stats
+            }
+
+    def start(self):
+        """Start the background collector (runs a first pass right away)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="image-store-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background collector"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"⚠️ Image store GC failed: {e}")
+            self._wake.wait(self.limits.gc_interval or None)
+            self._wake.clear()
+
+
+class SceneImageReferences:
+    """
+    Image file names referenced by saved scenes.
+
+    Scans every scene file for "/api/images/<name>" strings. Results are
+    cached per file and refreshed only when the file changes, so calling
+    this on every collection stays cheap.
+    """
+
+    def __init__(self, scenes_dir: Path):
+        self.scenes_dir = Path(scenes_dir)
+        self._cache: Dict[Path, Tuple[Tuple[int, int], Set[str]]] = {}
+
+    def __call__(self) -> Set[str]:
+        names: Set[str] = set()
+        seen = set()
+        for path in self.scenes_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            seen.add(path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = self._cache.get(path)
+            if cached is None or cached[0] != version:
+                try:
+                    with open(path) as f:
+                        refs = set(_image_names(json.load(f)))
+                except (OSError, ValueError):
+                    refs = set()
+                cached = self._cache[path] = (version, refs)
+            names |= cached[1]
+
+        for path in set(self._cache) - seen:
+            del self._cache[path]
+        return names
+
+
+def _image_names(value: Any) -> Iterable[str]:
+    """Yield file names of image URLs found anywhere in a JSON value"""
+    if isinstance(value, str):
+        index = value.find(IMAGE_URL_PREFIX)
+        if index >= 0:
+            name = value[index + len(IMAGE_URL_PREFIX):].split("?", 1)[0]
+            if name and "/" not in name:
+                yield name
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _image_names(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _image_names(item)
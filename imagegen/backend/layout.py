@@ -0,0 +1,166 @@
+"""
+Layout - Placement algorithms for groups of identical objects
+Positions are returned as flat [x0, y0, z0, x1, y1, z1, ...] lists so that
+thousands of instances stay cheap to build, store and serialize.
+"""
+
+import math
+import random
+from typing import List, Tuple
+
+
+# Supported layout names
+LAYOUT_LINE = "line"
+LAYOUT_GRID = "grid"
+LAYOUT_SCATTER = "scatter"
+
+LAYOUTS = (LAYOUT_LINE, LAYOUT_GRID, LAYOUT_SCATTER)
+
+# Default distance between instance centers (largest default geometry is ~1.5)
+DEFAULT_SPACING = 2.0
+
+
+def line_layout(count: int, spacing: float = DEFAULT_SPACING) -> List[float]:
+    """
+    Place instances along the X axis, centered on the origin.
+
+    Args:
+        count: Number of instances
+        spacing: Distance between neighbours
+
+    Returns:
+        Flat list of positions (stride 3)
+    """
+    offset = (count - 1) * spacing / 2
+    positions = []
+    for i in range(count):
+        positions.extend((i * spacing - offset, 0.0, 0.0))
+    return positions
+
+
+def grid_layout(count: int, spacing: float = DEFAULT_SPACING) -> List[float]:
+    """
+    Place instances on a near-square grid in the XZ plane, centered on the origin.
+
+    Args:
+        count: Number of instances
+        spacing: Distance between neighbouring cells
+
+    Returns:
+        Flat list of positions (stride 3)
+    """
+    cols, rows = _grid_shape(count)
+    x_offset = (cols - 1) * spacing / 2
+    z_offset = (rows - 1) * spacing / 2
+
+    positions = []
+    for i in range(count):
+        row, col = divmod(i, cols)
+        positions.extend((col * spacing - x_offset, 0.0, row * spacing - z_offset))
+    return positions
+
+
+def scatter_layout(count: int, spacing: float = DEFAULT_SPACING,
+                   seed: int = 0) -> List[float]:
+    """
+    Scatter instances pseudo-randomly in the XZ plane without overlaps.
+
+    Uses a jittered grid: every instance owns one grid cell and is moved
+    randomly inside it, so the cost is linear in the number of instances
+    and neighbours never get closer than half a cell.
+
+    Args:
+        count: Number of instances
+        spacing: Cell size
+        seed: Random seed (same seed gives the same layout)
+
+    Returns:
+        Flat list of positions (stride 3)
+    """
+    rng = random.Random(seed)
+    cols, rows = _grid_shape(count)
+    jitter = spacing / 4
+
+    # Pick which cells are used so partially filled grids don't leave a gap row
+    cells = rng.sample(range(cols * rows), count)
+
+    x_offset = (cols - 1) * spacing / 2
+    z_offset = (rows - 1) * spacing / 2
+
+    positions = []
+    for cell in cells:
+        row, col = divmod(cell, cols)
+        x = col * spacing - x_offset + rng.uniform(-jitter, jitter)
+        z = row * spacing - z_offset + rng.uniform(-jitter, jitter)
+        positions.extend((x, 0.0, z))
+    return positions
+
+
+def layout_positions(layout: str, count: int,
+                     spacing: float = DEFAULT_SPACING,
+                     origin: Tuple[float, float, float] = (0, 0, 0)) -> List[float]:
+    """
+    Compute instance positions for a named layout, translated to origin.
+
+    Args:
+        layout: One of LAYOUTS (unknown names fall back to grid)
+        count: Number of instances
+        spacing: Distance between instances
+        origin: Center of the group
+
+    Returns:
+        Flat list of positions (stride 3)
+    """
+    if layout == LAYOUT_LINE:
+        positions = line_layout(count, spacing)
+    elif layout == LAYOUT_SCATTER:
+        positions = scatter_layout(count, spacing)
+    else:
+        positions = grid_layout(count, spacing)
+
+    ox, oy, oz = origin
+    if ox or oy or oz:
+        for i in range(0, len(positions), 3):
+            positions[i] += ox
+            positions[i + 1] += oy
+            positions[i + 2] += oz
+
+    return positions
+
+
+def layout_extent(layout: str, count: int,
+                  spacing: float = DEFAULT_SPACING) -> Tuple[float, float]:
+    """
+    Get the (width along X, depth along Z) footprint of a layout.
+
+    Args:
+        layout: Layout name
+        count: Number of instances
+        spacing: Distance between instances
+
+    Returns:
+        Tuple (width, depth)
+    """
+    if count <= 1:
+        return (0.0, 0.0)
+    if layout == LAYOUT_LINE:
+        return ((count - 1) * spacing, 0.0)
+
+    cols, rows = _grid_shape(count)
+    return ((cols - 1) * spacing, (rows - 1) * spacing)
+
+
+def _grid_shape(count: int) -> Tuple[int, int]:
+    """Get (columns, rows) of the smallest near-square grid holding count cells"""
+    cols = max(1, math.ceil(math.sqrt(count)))
+    rows = max(1, math.ceil(count / cols))
+    return cols, rows
+
+
+# Example usage
+if __name__ == "__main__":
+    for name in LAYOUTS:
+        positions = layout_positions(name, 10000)
+        width, depth = layout_extent(name, 10000)
+        print(f"📐 {name}: {len(positions) // 3} instances, "
+              f"footprint {width:.0f} x {depth:.0f}")
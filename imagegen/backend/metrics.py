@@ -0,0 +1,282 @@
+"""
+Metrics - Request stage timings, counters and Prometheus text export
+
+Small dependency-free registry (counters, gauges, histograms with labels)
+rendered in the Prometheus text format by /metrics. Timings collects the
+stages of one request, feeds the stage histogram and builds the
+Server-Timing header for the response.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+
+# Histogram buckets in seconds (1 ms .. 60 s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+class _Metric:
+    """Base class: a named metric with a fixed set of label names"""
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _format_labels(self, key: tuple, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        if not self.labels:
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [bucket counts..., sum, count]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+
+        lines = []
+        for key, state in items:
+            for bound, count in zip(self.buckets, state):
+                labels = self._format_labels(key, (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = self._format_labels(key, (("le", "+Inf"),))
+            lines.append(f"{self.name}_bucket{labels} {state[-1]}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {state[-1]}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format"""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "imagegen_stage_duration_seconds",
+    "Time spent in each stage of a request",
+    ["stage"]
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "imagegen_http_request_duration_seconds",
+    "HTTP request duration",
+    ["method", "route", "status"]
+))
+CACHE_HITS = REGISTRY.register(Counter(
+    "imagegen_cache_hits_total",
+    "Lookups answered from a cache",
+    ["cache"]
+))
+CACHE_MISSES = REGISTRY.register(Counter(
+    "imagegen_cache_misses_total",
+    "Lookups that missed a cache",
+    ["cache"]
+))
+RENDER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "imagegen_render_queue_depth",
+    "Renders waiting for a worker thread"
+))
+RENDERS_IN_PROGRESS = REGISTRY.register(Gauge(
+    "imagegen_renders_in_progress",
+    "Renders currently running"
+))
+ADMISSION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "imagegen_admission_in_flight",
+    "Render slots in use"
+))
+ADMISSION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "imagegen_admission_queue_depth",
+    "Requests waiting for a render slot",
+    ["priority"]
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "imagegen_admission_rejected_total",
+    "Requests turned away by admission control",
+    ["priority", "status"]
+))
+COALESCED_REQUESTS = REGISTRY.register(Counter(
+    "imagegen_coalesced_requests_total",
+    "Requests answered by an identical render already in flight"
+))
+RAYS_CAST = REGISTRY.register(Counter(
+    "imagegen_rays_cast_total",
+    "Rays traced by the raytracer"
+))
+INTERSECTION_TESTS = REGISTRY.register(Counter(
+    "imagegen_intersection_tests_total",
+    "Ray-object intersection tests"
+))
+BVH_NODE_VISITS = REGISTRY.register(Counter(
+    "imagegen_bvh_node_visits_total",
+    "BVH nodes visited"
+))
+RENDER_SECONDS = REGISTRY.register(Counter(
+    "imagegen_render_seconds_total",
+    "Wall-clock time spent in the raytracer render loop"
+))
+RENDER_RAYS_PER_SECOND = REGISTRY.register(Gauge(
+    "imagegen_render_rays_per_second",
+    "Ray throughput of the last render"
+))
+RENDER_PEAK_RSS = REGISTRY.register(Gauge(
+    "imagegen_render_peak_rss_bytes",
+    "Peak resident memory of the last raytracer process"
+))
+
+
+def record_render_stats(stats: Dict[str, object]):
+    """
+    Add raytracer stats (see raytracer_integration.parse_stats) to the metrics.
+
+    rate(imagegen_rays_cast_total) / rate(imagegen_render_seconds_total)
+    gives the ray throughput of this node.
+    """
+    if not stats:
+        return
+    RAYS_CAST.inc(stats.get("rays_cast", 0))
+    INTERSECTION_TESTS.inc(stats.get("intersection_tests", 0))
+    BVH_NODE_VISITS.inc(stats.get("bvh_node_visits", 0))
+    RENDER_SECONDS.inc(stats.get("time", {}).get("render", 0))
+    RENDER_RAYS_PER_SECOND.set(stats.get("rays_per_second", 0))
+    RENDER_PEAK_RSS.set(stats.get("memory", {}).get("peak_rss_bytes", 0))
+
+
+class Timings:
+    """
+    Stage durations of one request.
+
+    Every span is also observed in STAGE_SECONDS. Safe to add to from the
+    worker thread running the render.
+    """
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the body of a with-block as stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        """Record a stage measured elsewhere"""
+        self.stages.append((stage, seconds))
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds"""
+        result: Dict[str, float] = {}
+        for stage, seconds in self.stages:
+            result[stage] = round(result.get(stage, 0) + seconds * 1000, 3)
+        return result
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        return ", ".join(f"{stage};dur={ms}" for stage, ms in self.to_dict().items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -4,9 +4,12 @@ Uses simple keyword matching and rule-based approach (no heavy ML required)
 """
 
 import re
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Any, List, Dict, Optional, Tuple
 from enum import Enum
+from backend.layout import (
+    LAYOUT_LINE, LAYOUT_GRID, LAYOUT_SCATTER, layout_extent
+)
 
 
 class ShapeType(Enum):
@@ -50,6 +53,8 @@ class Entity:
     rotation: Tuple[float, float, float] = (0, 0, 0)
     animation: str = None
     material: str = "matte"  # matte, metallic, glass
+    count: int = 1  # number of identical instances
+    layout: str = None  # line, grid, scatter (only used when count > 1)
     
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -61,7 +66,38 @@ class Entity:
             "scale": self.scale,
             "rotation": list(self.rotation),
             "animation": self.animation,
-            "material": self.material
+            "material": self.material,
+            "count": self.count,
+            "layout": self.layout
+        }
+
+
+# Edit command actions
+EDIT_ADD = "add"
+EDIT_REMOVE = "remove"
+EDIT_MODIFY = "modify"
+
+
+@dataclass
+class EditCommand:
+    """A change to an existing scene ("add a sphere", "make the cube red")"""
+    action: str                                     # EDIT_ADD, EDIT_REMOVE or EDIT_MODIFY
+    shape: Optional[ShapeType] = None               # Target shape (None: any)
+    color: Optional[Tuple[float, float, float]] = None  # Target color (None: any)
+    recent: bool = False                            # Target is "it" (the last object)
+    changes: Dict[str, Any] = field(default_factory=dict)  # color, material, scale (factor), animation
+    entities: List[Entity] = field(default_factory=list)   # Objects to add
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "action": self.action,
+            "shape": self.shape.value if self.shape else None,
+            "color": list(self.color) if self.color else None,
+            "recent": self.recent,
+            "changes": {key: list(value) if isinstance(value, tuple) else value
+                        for key, value in self.changes.items()},
+            "entities": [entity.to_dict() for entity in self.entities]
         }
 
 
@@ -84,6 +120,11 @@ class NLPEngine:
         "cone": ShapeType.CONE,
         "plane": ShapeType.PLANE,
         "flat": ShapeType.PLANE,
+        "sphère": ShapeType.SPHERE,
+        "boule": ShapeType.SPHERE,
+        "cylindre": ShapeType.CYLINDER,
+        "pyramide": ShapeType.PYRAMID,
+        "cône": ShapeType.CONE,
     }
     
     # Color keywords mapping
@@ -109,6 +150,34 @@ class NLPEngine:
         "light": ColorName.WHITE,
     }
     
+    # French color adjectives (masculine singular plus irregular feminines);
+    # matched as whole words with -e/-s/-es endings, so "vert" is not "vertical"
+    FRENCH_COLOR_KEYWORDS = {
+        "rouge": ColorName.RED,
+        "bleu": ColorName.BLUE,
+        "vert": ColorName.GREEN,
+        "jaune": ColorName.YELLOW,
+        "blanc": ColorName.WHITE,
+        "blanche": ColorName.WHITE,
+        "noir": ColorName.BLACK,
+        "gris": ColorName.GRAY,
+        "violet": ColorName.PURPLE,
+        "violette": ColorName.PURPLE,
+        "rose": ColorName.PINK,
+        "marron": ColorName.BROWN,
+        "doré": ColorName.GOLD,
+        "argenté": ColorName.SILVER,
+    }
+    
+    # Color matchers in priority order (English keywords match word starts)
+    COLOR_PATTERNS = [
+        (re.compile(r'\b' + re.escape(keyword)), color)
+        for keyword, color in COLOR_KEYWORDS.items()
+    ] + [
+        (re.compile(r'\b' + re.escape(keyword) + r'(?:e|s|es)?\b'), color)
+        for keyword, color in FRENCH_COLOR_KEYWORDS.items()
+    ]
+    
     # Animation keywords
     ANIMATION_KEYWORDS = {
         "rotate": "rotation",
@@ -127,9 +196,105 @@ class NLPEngine:
         "falling": "fall",
     }
     
+    # Number words (English and French) and their values
+    NUMBER_WORDS = {
+        "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+        "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+        "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+        "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+        "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80,
+        "ninety": 90, "dozen": 12,
+        "un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4, "cinq": 5,
+        "sept": 7, "huit": 8, "neuf": 9, "dix": 10, "onze": 11,
+        "douze": 12, "treize": 13, "quatorze": 14, "quinze": 15,
+        "seize": 16, "vingt": 20, "vingts": 20, "trente": 30,
+        "quarante": 40, "cinquante": 50, "soixante": 60, "douzaine": 12,
+    }
+    # Scale words multiply the number read so far ("two hundred")
+    NUMBER_SCALES = {
+        "hundred": 100, "cent": 100, "cents": 100,
+        "thousand": 1000, "mille": 1000,
+    }
+    # Words allowed inside a number ("two hundred and five", "vingt et un")
+    NUMBER_FILLERS = {"and", "et"}
+    # Compounds whose parts do not add up ("quatre-vingts" = 80, not 24)
+    NUMBER_COMPOUNDS = {
+        ("quatre", "vingt"): 80,
+        ("quatre", "vingts"): 80,
+    }
+    
+    # Layout keywords (checked in order)
+    LAYOUT_KEYWORDS = [
+        ("scatter", LAYOUT_SCATTER),
+        ("random", LAYOUT_SCATTER),
+        ("everywhere", LAYOUT_SCATTER),
+        ("éparpill", LAYOUT_SCATTER),
+        ("grid", LAYOUT_GRID),
+        ("grille", LAYOUT_GRID),
+        ("row", LAYOUT_LINE),
+        ("line", LAYOUT_LINE),
+        ("aligned", LAYOUT_LINE),
+        ("align", LAYOUT_LINE),
+    ]
+    
+    # Leading verbs of edit commands
+    EDIT_VERBS = {
+        "add": EDIT_ADD,
+        "put": EDIT_ADD,
+        "insert": EDIT_ADD,
+        "ajoute": EDIT_ADD,
+        "ajouter": EDIT_ADD,
+        "remove": EDIT_REMOVE,
+        "delete": EDIT_REMOVE,
+        "erase": EDIT_REMOVE,
+        "supprime": EDIT_REMOVE,
+        "enlève": EDIT_REMOVE,
+        "retire": EDIT_REMOVE,
+        "make": EDIT_MODIFY,
+        "turn": EDIT_MODIFY,
+        "paint": EDIT_MODIFY,
+        "color": EDIT_MODIFY,
+        "colour": EDIT_MODIFY,
+        "change": EDIT_MODIFY,
+        "set": EDIT_MODIFY,
+        "rends": EDIT_MODIFY,
+    }
+    
+    # Size words of edits and the scale factor they apply
+    SIZE_KEYWORDS = {
+        "bigger": 1.5,
+        "larger": 1.5,
+        "grow": 1.5,
+        "huge": 2.0,
+        "plus grand": 1.5,
+        "smaller": 1 / 1.5,
+        "shrink": 1 / 1.5,
+        "tiny": 0.5,
+        "plus petit": 1 / 1.5,
+    }
+    
+    # Material words of edits (no default, unlike _extract_material)
+    MATERIAL_KEYWORDS = {
+        "metallic": "metallic",
+        "metal": "metallic",
+        "shiny": "metallic",
+        "glass": "glass",
+        "transparent": "glass",
+        "matte": "matte",
+    }
+    
+    # Upper bound for a single group: the objects the raytracer loads
+    # (MAX_OBJECTS in raytracer_c/src/config.h)
+    MAX_QUANTITY = 1000
+    
+    # Gap between consecutive objects/groups along X
+    OBJECT_SPACING = 3
+    
     def __init__(self):
         """Initialize NLP engine"""
         self.position_counter = 0
+        self.layout_cursor = -self.OBJECT_SPACING
     
     def parse_description(self, description: str) -> List[Entity]:
         """
@@ -143,6 +308,7 @@ class NLPEngine:
         """
         entities = []
         self.position_counter = 0
+        self.layout_cursor = -self.OBJECT_SPACING
         
         # Clean text
         text = description.lower().strip()
@@ -153,27 +319,186 @@ class NLPEngine:
         for phrase in object_phrases:
             entity = self._parse_entity(phrase)
             if entity:
-                # Auto-position objects
-                entity.position = self._get_next_position()
+                # Auto-position objects (groups take up their footprint)
+                width, _ = layout_extent(entity.layout, entity.count)
+                entity.position = self._get_next_position(width)
                 entities.append(entity)
         
         return entities
     
+    def parse_edit(self, description: str) -> Optional[EditCommand]:
+        """
+        Parse an edit of the current scene.
+        
+        Understands "add ..." (any description), "remove/delete the red
+        cube" and "make/turn/paint the cube red|bigger|metallic|spinning";
+        "it" (or no shape) targets the last object. A color before the
+        shape selects, a color after it is the new color.
+        
+        Args:
+            description: Text such as "make the cube red"
+            
+        Returns:
+            EditCommand, or None if the text is not an edit (a new scene)
+        """
+        text = description.lower().strip()
+        parts = text.split(None, 1)
+        if not parts or parts[0] not in self.EDIT_VERBS:
+            return None
+        action = self.EDIT_VERBS[parts[0]]
+        rest = parts[1] if len(parts) > 1 else ""
+        
+        if action == EDIT_ADD:
+            entities = self.parse_description(rest)
+            return EditCommand(action, entities=entities) if entities else None
+        
+        shape_at, shape = self._find_keyword(rest, self.SHAPE_KEYWORDS)
+        colors = self._find_colors(rest)
+        selected = [color for at, color in colors if shape is not None and at < shape_at]
+        new = [color for at, color in colors if shape is None or at > shape_at]
+        command = EditCommand(
+            action,
+            shape=shape,
+            color=selected[-1].value if selected else None,
+            recent=shape is None
+        )
+        if action == EDIT_REMOVE:
+            return command
+        
+        tail = rest[shape_at:] if shape is not None else rest
+        if new:
+            command.changes["color"] = new[-1].value
+        _, material = self._find_keyword(tail, self.MATERIAL_KEYWORDS)
+        if material:
+            command.changes["material"] = material
+        _, factor = self._find_keyword(tail, self.SIZE_KEYWORDS)
+        if factor:
+            command.changes["scale"] = factor
+        animation = self._extract_animation(tail)
+        if animation:
+            command.changes["animation"] = animation
+        
+        # "make a red cube" describes a new scene
+        return command if command.changes else None
+    
+    def apply_edit(self, entities: List[Entity], command: EditCommand) -> List[Entity]:
+        """
+        Apply an edit to a scene's entities.
+        
+        Entities are not modified: changed ones are replaced by copies.
+        Added objects are placed after the existing ones.
+        
+        Returns:
+            The edited entity list
+            
+        Raises:
+            ValueError: No object matches the command's target
+        """
+        if command.action == EDIT_ADD:
+            self.layout_cursor = max(
+                (entity.position[0] + layout_extent(entity.layout, entity.count)[0] / 2
+                 for entity in entities),
+                default=-self.OBJECT_SPACING
+            ) + self.OBJECT_SPACING
+            added = []
+            for entity in command.entities:
+                width, _ = layout_extent(entity.layout, entity.count)
+                added.append(replace(entity, position=self._get_next_position(width)))
+            return list(entities) + added
+        
+        targets = self._edit_targets(entities, command)
+        if not targets:
+            shape = command.shape.value if command.shape else "object"
+            raise ValueError(f"No {shape} in the scene")
+        
+        if command.action == EDIT_REMOVE:
+            return [entity for i, entity in enumerate(entities) if i not in targets]
+        
+        result = list(entities)
+        for i in targets:
+            entity = result[i]
+            changes = {}
+            if "color" in command.changes:
+                color = ColorName(command.changes["color"])
+                changes["color"] = color.value
+                changes["name"] = self._generate_name(entity.type, color)
+            if "material" in command.changes:
+                changes["material"] = command.changes["material"]
+            if "scale" in command.changes:
+                changes["scale"] = round(entity.scale * command.changes["scale"], 3)
+            if "animation" in command.changes:
+                changes["animation"] = command.changes["animation"]
+            result[i] = replace(entity, **changes)
+        return result
+    
+    def _edit_targets(self, entities: List[Entity], command: EditCommand) -> List[int]:
+        """Indices of the entities an edit applies to"""
+        if command.recent:
+            return [len(entities) - 1] if entities else []
+        return [
+            i for i, entity in enumerate(entities)
+            if (command.shape is None or entity.type == command.shape)
+            and (command.color is None or tuple(entity.color) == tuple(command.color))
+        ]
+    
+    def _find_keywords(self, text: str, keywords: Dict[str, Any]) -> List[Tuple[int, Any]]:
+        """All keyword matches at word starts, as (offset, value) in text order"""
+        found = []
+        for keyword, value in keywords.items():
+            for match in re.finditer(r'\b' + re.escape(keyword), text):
+                found.append((match.start(), value))
+        return sorted(found, key=lambda item: item[0])
+    
+    def _find_colors(self, text: str) -> List[Tuple[int, ColorName]]:
+        """All color matches (English or French), as (offset, color) in text order"""
+        found = []
+        for pattern, color in self.COLOR_PATTERNS:
+            for match in pattern.finditer(text):
+                found.append((match.start(), color))
+        return sorted(found, key=lambda item: item[0])
+    
+    def _find_keyword(self, text: str, keywords: Dict[str, Any]) -> Tuple[int, Any]:
+        """First keyword match as (offset, value), or (-1, None)"""
+        found = self._find_keywords(text, keywords)
+        return found[0] if found else (-1, None)
+    
     def _split_by_connectors(self, text: str) -> List[str]:
-        """Split description by logical connectors"""
+        """
+        Split description by logical connectors.
+        
+        "and"/"et" inside a number ("two hundred and five spheres",
+        "vingt et un cônes") does not split.
+        """
         connectors = [
             r'\band\b',
+            r'\bet\b',
             r'\bwith\b',
             r'\bnext\s+to\b',
             r'\bbeside\b',
             r',',
         ]
         
-        pattern = '|'.join(connectors)
-        phrases = re.split(pattern, text)
+        pattern = '(' + '|'.join(connectors) + ')'
+        parts = re.split(pattern, text)
+        phrases = [parts[0]]
+        for connector, phrase in zip(parts[1::2], parts[2::2]):
+            if connector in self.NUMBER_FILLERS and self._joins_number(phrases[-1], phrase):
+                phrases[-1] += connector + phrase
+            else:
+                phrases.append(phrase)
         
         return [p.strip() for p in phrases if p.strip()]
     
+    def _joins_number(self, before: str, after: str) -> bool:
+        """Whether a filler between two phrases sits inside one number"""
+        before_words = re.findall(r"[^\W\d_]+", before)
+        after_words = re.findall(r"[^\W\d_]+", after)
+        if not before_words or not after_words or after_words[0] not in self.NUMBER_WORDS:
+            return False
+        # "hundred and five", "vingt et un", "soixante et onze"
+        last = before_words[-1]
+        return last in self.NUMBER_SCALES or self.NUMBER_WORDS.get(last, 0) in range(20, 100, 10)
+    
     def _parse_entity(self, phrase: str) -> Entity:
         """Parse a single entity from a phrase"""
         phrase = phrase.strip()
@@ -194,6 +519,10 @@ class NLPEngine:
         # Extract material
         material = self._extract_material(phrase)
         
+        # Extract quantity and group layout
+        count = self._extract_quantity(phrase)
+        layout = self._extract_layout(phrase) if count > 1 else None
+        
         # Generate name
         name = self._generate_name(shape_type, color)
         
@@ -202,7 +531,9 @@ class NLPEngine:
             type=shape_type,
             color=color.value,
             animation=animation,
-            material=material
+            material=material,
+            count=count,
+            layout=layout
         )
     
     def _extract_shape(self, text: str) -> ShapeType:
@@ -219,8 +550,9 @@ class NLPEngine:
         """Extract color from text"""
         text_lower = text.lower()
         
-        for keyword, color in self.COLOR_KEYWORDS.items():
-            if keyword in text_lower:
+        for pattern, color in self.COLOR_PATTERNS:
+            # Match word starts only ("red" must not match "hundred")
+            if pattern.search(text_lower):
                 return color
         
         return None
@@ -248,6 +580,60 @@ class NLPEngine:
         
         return "matte"
     
+    def _extract_quantity(self, text: str) -> int:
+        """
+        Extract object count from digits or number words.
+        
+        Reads the first number in the phrase ("12 cubes", "three spheres",
+        "two hundred cubes", "vingt et un cônes"). Defaults to 1.
+        """
+        tokens = re.findall(r"\d+|[^\W\d_]+", text.lower())
+        
+        total = 0
+        current = 0
+        found = False
+        previous = None
+        
+        for token in tokens:
+            if token.isdigit():
+                if found:
+                    break
+                current = int(token)
+                found = True
+            elif (previous, token) in self.NUMBER_COMPOUNDS:
+                current += self.NUMBER_COMPOUNDS[previous, token] - self.NUMBER_WORDS[previous]
+            elif token in self.NUMBER_WORDS:
+                current += self.NUMBER_WORDS[token]
+                found = True
+            elif token in self.NUMBER_SCALES:
+                scale = self.NUMBER_SCALES[token]
+                current = max(current, 1) * scale
+                if scale >= 1000:
+                    total += current
+                    current = 0
+                found = True
+            elif found and token in self.NUMBER_FILLERS:
+                continue
+            elif found:
+                break
+            previous = token
+        
+        count = total + current
+        if count < 1:
+            return 1
+        return min(count, self.MAX_QUANTITY)
+    
+    def _extract_layout(self, text: str) -> str:
+        """Extract group layout from text (defaults to grid)"""
+        text_lower = text.lower()
+        
+        for keyword, layout in self.LAYOUT_KEYWORDS:
+            # Match word starts only ("row" must not match "brown")
+            if re.search(r'\b' + keyword, text_lower):
+                return layout
+        
+        return LAYOUT_GRID
+    
     def _get_default_color(self) -> ColorName:
         """Get default color (white)"""
         return ColorName.WHITE
@@ -256,10 +642,16 @@ class NLPEngine:
         """Generate descriptive name for entity"""
         return f"{color.name.lower()} {shape.value}"
     
-    def _get_next_position(self) -> Tuple[float, float, float]:
-        """Get next position in line (for auto-layout)"""
-        # Space objects evenly along X axis
-        x = (self.position_counter - 1) * 3
+    def _get_next_position(self, width: float = 0) -> Tuple[float, float, float]:
+        """
+        Get next position in line (for auto-layout).
+        
+        Args:
+            width: Footprint of the object or group along X
+        """
+        # Space objects evenly along X axis, leaving room for groups
+        x = self.layout_cursor + width / 2
+        self.layout_cursor += width + self.OBJECT_SPACING
         self.position_counter += 1
         return (x, 0, 0)
 
@@ -275,6 +667,8 @@ if __name__ == "__main__":
         "Three cylinders rotating",
         "A metallic golden pyramid and a glass blue sphere",
         "A spinning purple torus next to a green cube",
+        "Two hundred scattered red spheres",
+        "Douze cubes alignés",
     ]
     
     for description in test_cases:
@@ -283,7 +677,7 @@ if __name__ == "__main__":
         
         print(f"✅ Found {len(entities)} entities:")
         for entity in entities:
-            print(f"   - {entity.name}: {entity.type.value}")
+            print(f"   - {entity.name}: {entity.type.value} x{entity.count}")
             print(f"     Color: {entity.color}, Material: {entity.material}")
             if entity.animation:
                 print(f"     Animation: {entity.animation}")
@@ -6,18 +6,222 @@ import subprocess
 import os
 import base64
 import json
-import shutil
+import queue
+import select
 from pathlib import Path
 from datetime import datetime
 import tempfile
+import threading
 import time
 
+from backend.image_file import create_ppm
+
+
+# Prefix of the JSON stats line printed by the raytracer (render_stats.h)
+STATS_PREFIX = "RENDER_STATS "
+
+# Lines printed by `raytracer --worker` (see run_worker in main.c)
+WORKER_READY = "RENDER_READY"
+WORKER_END_PREFIX = "RENDER_END "
+
+# Persistent raytracer processes kept per RaytracerIntegration
+# (0 = start a new process for every render)
+WORKERS_ENV = "IMAGEGEN_RENDER_WORKERS"
+
+# Seconds allowed for one render
+RENDER_TIMEOUT = 30
+
+
+def parse_stats(stdout: str) -> dict:
+    """
+    Get the render statistics printed by the raytracer.
+    
+    Args:
+        stdout: Raytracer standard output
+    
+    Returns:
+        Stats dict (rays_cast, intersection_tests, time, thread_times,
+        memory, ...), empty if the raytracer printed none
+    """
+    for line in reversed(stdout.splitlines()):
+        if line.startswith(STATS_PREFIX):
+            try:
+                return json.loads(line[len(STATS_PREFIX):])
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+
+class RaytracerWorker:
+    """
+    One persistent `raytracer --worker` process.
+    
+    Requests are written to stdin as tab-separated arguments; the worker
+    answers with its output followed by a RENDER_END line. It keeps its
+    frame arena between requests, so repeated renders skip process start
+    and allocation. Serves one request at a time.
+    """
+    
+    def __init__(self, raytracer_path: str, cwd: str = None):
+        self.process = subprocess.Popen(
+            [raytracer_path, '--worker'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd
+        )
+        self._buffer = b''
+        self._read_until(WORKER_READY, RENDER_TIMEOUT)
+    
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+    
+    def run(self, args: list, timeout: float = RENDER_TIMEOUT) -> tuple:
+        """
+        Render one request.
+        
+        Args:
+            args: Raytracer arguments (without the program path)
+            timeout: Seconds to wait for the result
+        
+        Returns:
+            (exit status, output) - output includes the worker's stderr
+        
+        Raises:
+            subprocess.TimeoutExpired: The worker was too slow (it is killed)
+            RuntimeError: The worker exited
+        """
+        if any('\t' in arg or '\n' in arg for arg in args):
+            raise ValueError('Raytracer arguments cannot contain tabs or newlines')
+        
+        try:
+            self.process.stdin.write(('\t'.join(args) + '\n').encode())
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            self.close()
+            raise RuntimeError('Raytracer worker exited')
+        
+        lines = self._read_until(WORKER_END_PREFIX, timeout)
+        status = int(lines[-1][len(WORKER_END_PREFIX):])
+        return status, '\n'.join(lines[:-1])
+    
+    def _read_until(self, prefix: str, timeout: float) -> list:
+        """Read output lines up to and including the first line starting with prefix"""
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        lines = []
+        
+        while True:
+            while b'\n' in self._buffer:
+                raw, self._buffer = self._buffer.split(b'\n', 1)
+                line = raw.decode(errors='replace')
+                lines.append(line)
+                if line.startswith(prefix):
+                    return lines
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise subprocess.TimeoutExpired(self.process.args, timeout)
+            
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self.close()
+                raise RuntimeError('Raytracer worker exited')
+            self._buffer += chunk
+    
+    def close(self):
+        """Stop the worker (closing stdin lets it exit on its own)"""
+        if self.process.stdin and not self.process.stdin.closed:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class RaytracerWorkerPool:
+    """
+    Idle RaytracerWorkers reused across renders.
+    
+    A render takes the most recently used idle worker (its arena is the
+    warmest) or starts a new one, so concurrent renders never wait on the
+    pool. At most `size` workers are kept idle; extra ones are stopped
+    when their render finishes, and dead ones are dropped.
+    """
+    
+    def __init__(self, raytracer_path: str, cwd: str, size: int):
+        self.raytracer_path = raytracer_path
+        self.cwd = cwd
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._closed = False
+    
+    def run(self, args: list, timeout: float = RENDER_TIMEOUT) -> tuple:
+        """Render on a pooled worker (see RaytracerWorker.run)"""
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            worker = RaytracerWorker(self.raytracer_path, self.cwd)
+        
+        try:
+            result = worker.run(args, timeout)
+        except Exception:
+            worker.close()
+            raise
+        
+        if self._closed or not worker.alive or self._idle.qsize() >= self.size:
+            worker.close()
+        else:
+            self._idle.put(worker)
+        return result
+    
+    def idle_count(self) -> int:
+        return self._idle.qsize()
+    
+    def close(self):
+        """Stop all idle workers"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _worker_count_from_env() -> int:
+    raw = os.environ.get(WORKERS_ENV)
+    if raw is None:
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        raise ValueError(f"{WORKERS_ENV} must be an integer")
+
 
 class RaytracerIntegration:
     """Interface avec le raytracer C"""
     
-    def __init__(self, raytracer_path: str = None):
-        """Initialize raytracer integration."""
+    def __init__(self, raytracer_path: str = None, workers: int = None):
+        """
+        Initialize raytracer integration.
+        
+        Args:
+            raytracer_path: Raytracer binary (searched for if None)
+            workers: Persistent raytracer processes to keep (default:
+                IMAGEGEN_RENDER_WORKERS or the CPU count; 0 starts a new
+                process per render)
+        """
         if raytracer_path is None:
             possible_paths = [
                 '/mnt/c/Users/Tom/Documents/Github/BTP B2/minivibes/vibe-tracing/raytracer_c/build/bin/raytracer',
@@ -43,30 +247,68 @@ class RaytracerIntegration:
         
         if not self.available:
             print(f"⚠️ Raytracer not found")
+        
+        if workers is None:
+            workers = _worker_count_from_env()
+        self.workers = None
+        if self.available and workers > 0:
+            self.workers = RaytracerWorkerPool(
+                raytracer_path, os.path.dirname(raytracer_path), workers
+            )
+    
+    def close(self):
+        """Stop the persistent raytracer workers"""
+        if self.workers is not None:
+            self.workers.close()
+    
+    def _run(self, args: list, cwd: str) -> tuple:
+        """Run the raytracer with args; returns (exit status, stdout, stderr)"""
+        if self.workers is not None:
+            status, output = self.workers.run(args, RENDER_TIMEOUT)
+            errors = [line for line in output.splitlines() if line.startswith('Error')]
+            return status, output, '\n'.join(errors) or output
+        
+        result = subprocess.run(
+            [self.raytracer_path] + args,
+            capture_output=True,
+            text=True,
+            timeout=RENDER_TIMEOUT,
+            cwd=cwd
+        )
+        return result.returncode, result.stdout, result.stderr
     
-    def _generate_fallback(self, description: str, width: int = 800, height: int = 600) -> dict:
+    def _generate_fallback(self, description: str, width: int = 800, height: int = 600,
+                           output_path: str = None) -> dict:
         """Generate fallback gradient image"""
+        start_time = time.perf_counter()
         
-        ppm_lines = ["P6", f"{width} {height}", "255"]
-        pixels = []
+        if output_path:
+            filepath = output_path
+            filename = os.path.basename(output_path)
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"fallback_{timestamp}.ppm"
+            filepath = os.path.join(self.output_dir, filename)
         
-        for y in range(height):
-            for x in range(width):
+        # The gradient is vertical: build each row once and write it into
+        # the mapped file
+        image = create_ppm(filepath, width, height)
+        try:
+            render_start = time.perf_counter()
+            for y in range(height):
                 ratio = y / height
                 r = int(0 + (200 * ratio))
                 g = int(200 * (1 - ratio * 0.5))
                 b = int(255 - (100 * ratio))
-                pixels.extend([r, g, b])
-        
-        ppm_data = "\n".join(ppm_lines).encode() + b"\n" + bytes(pixels)
-        
-        # Save to output directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"fallback_{timestamp}.ppm"
-        filepath = os.path.join(self.output_dir, filename)
+                image.row(y)[:] = bytes((r, g, b)) * width
+            render_end = time.perf_counter()
+        finally:
+            image.close()
         
-        with open(filepath, 'wb') as f:
-            f.write(ppm_data)
+        timings = {
+            'render': render_end - render_start,
+            'io': (render_start - start_time) + (time.perf_counter() - render_end)
+        }
         
         return {
             'success': True,
@@ -78,58 +320,104 @@ class RaytracerIntegration:
             'height': height,
             'description': description,
             'timestamp': datetime.now().isoformat(),
+            'timings': timings,
             'note': '⚠️ Fallback preview'
         }
     
-    def generate(self, description: str, width: int = 800, height: int = 600) -> dict:
-        """Generate image using raytracer."""
+    def generate(self, description: str, width: int = 800, height: int = 600,
+                 scene: dict = None, output_path: str = None,
+                 options=None, tile: tuple = None) -> dict:
+        """
+        Generate image using raytracer.
+        
+        Safe to call concurrently: every call uses its own scratch files.
+        
+        Args:
+            description: Text description (for the response)
+            width: Image width
+            height: Image height
+            scene: Scene from SceneGenerator; passed to the raytracer as a
+                binary scene file (built-in test scene if None)
+            output_path: Write the image here instead of output_images/
+            options: RenderOptions for samples/depth/threads (raytracer
+                defaults if None); width and height come from the arguments
+            tile: (x, y, w, h) to render only that rectangle of the
+                width x height frame; the image is w x h (see tile_render.py)
+        
+        The result's "timings" holds wall-clock seconds per stage: encode
+        (scene file), spawn (process start/exit or worker round-trip
+        overhead), render and io
+        (scene load and image write; the raytracer renders into the
+        mapped output file in output_images/, so nothing is copied).
+        "stats" holds the raytracer's render statistics (see parse_stats).
+        """
         
         if not self.available:
             print("⚠️ Raytracer not available, using fallback")
-            return self._generate_fallback(description, width, height)
+            return self._generate_fallback(description, width, height, output_path)
+        
+        raytracer_dir = os.path.dirname(self.raytracer_path)
+        scene_path = None
+        success = False
+        timings = {}
+        
+        if output_path:
+            output_ppm = os.path.abspath(output_path)
+            filename = os.path.basename(output_path)
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"render_{timestamp}.ppm"
+            output_ppm = os.path.abspath(os.path.join(self.output_dir, filename))
         
         try:
-            raytracer_dir = os.path.dirname(self.raytracer_path)
-            output_ppm = os.path.join(raytracer_dir, 'output.ppm')
             
             print(f"🎨 Running raytracer: {self.raytracer_path}")
             print(f"📊 Output: {width}x{height}")
             
-            start_time = time.time()
+            command = [output_ppm, str(width), str(height)]
+            if options is not None:
+                command += options.to_args()
+            if tile is not None:
+                command += ['--tile', ','.join(str(int(v)) for v in tile)]
+            if scene is not None:
+                from backend.scene_binary import write_scene_binary
+                fd, scene_path = tempfile.mkstemp(suffix='.vtsc', prefix='scene_', dir=raytracer_dir)
+                os.close(fd)
+                encode_start = time.perf_counter()
+                write_scene_binary(scene, scene_path)
+                timings['encode'] = time.perf_counter() - encode_start
+                command += ['--scene', scene_path]
             
-            result = subprocess.run(
-                [self.raytracer_path, 'output.ppm', str(width), str(height)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=raytracer_dir
-            )
+            start_time = time.perf_counter()
             
-            render_time = time.time() - start_time
+            returncode, stdout, stderr = self._run(command, raytracer_dir)
             
-            if result.returncode != 0:
-                print(f"❌ Raytracer error: {result.stderr}")
+            render_time = time.perf_counter() - start_time
+            stats = parse_stats(stdout)
+            phases = stats.get('time', {})
+            timings['spawn'] = max(0.0, render_time - phases.get('total', render_time))
+            timings['render'] = phases.get('render', render_time)
+            timings['io'] = phases.get('load', 0.0) + phases.get('write', 0.0)
+            
+            if returncode != 0:
+                print(f"❌ Raytracer error: {stderr}")
                 return {
                     'success': False,
-                    'error': result.stderr or 'Raytracer failed'
+                    'error': stderr or 'Raytracer failed'
                 }
             
             # Check if file was created
-            if not os.path.exists(output_ppm):
+            if not os.path.exists(output_ppm) or os.path.getsize(output_ppm) == 0:
                 print(f"❌ PPM file not found at {output_ppm}")
                 return {
                     'success': False,
                     'error': 'PPM file not generated'
                 }
             
-            # Copy to output directory with unique name
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"render_{timestamp}.ppm"
-            dest_path = os.path.join(self.output_dir, filename)
-            
-            shutil.copy2(output_ppm, dest_path)
-            print(f"✅ Image saved to: {dest_path}")
+            if not output_path:
+                print(f"✅ Image saved to: {output_ppm}")
             
+            success = True
             return {
                 'success': True,
                 'image_url': f'/api/images/{filename}',
@@ -139,7 +427,9 @@ class RaytracerIntegration:
                 'width': width,
                 'height': height,
                 'description': description,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now().isoformat(),
+                'timings': timings,
+                'stats': stats
             }
         
         except subprocess.TimeoutExpired:
@@ -148,16 +438,47 @@ class RaytracerIntegration:
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             return {'success': False, 'error': str(e)}
+        finally:
+            # Remove scratch files, and the partial image of a failed render
+            # (an output_path is the caller's to clean up)
+            scratch = [scene_path] if success or output_path else [scene_path, output_ppm]
+            for path in scratch:
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+
+# Shared instance, created on first use (probes paths and creates output_images/)
+_raytracer = None
+_raytracer_lock = threading.Lock()
+
+
+def get_raytracer() -> RaytracerIntegration:
+    """Get the shared RaytracerIntegration, creating it on first call"""
+    global _raytracer
+    if _raytracer is None:
+        with _raytracer_lock:
+            if _raytracer is None:
+                _raytracer = RaytracerIntegration()
+    return _raytracer
 
 
-raytracer = RaytracerIntegration()
+def __getattr__(name: str):
+    # Keeps `from backend.raytracer_integration import raytracer` working
+    if name == "raytracer":
+        return get_raytracer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_raytracer_status() -> dict:
     """Get raytracer status"""
+    raytracer = get_raytracer()
     return {
         'available': raytracer.available,
         'path': raytracer.raytracer_path if raytracer.available else None,
         'message': '✅ Raytracer ready' if raytracer.available else '⚠️ Using fallback',
-        'output_dir': raytracer.output_dir
+        'output_dir': raytracer.output_dir,
+        'workers': {
+            'size': raytracer.workers.size,
+            'idle': raytracer.workers.idle_count()
+        } if raytracer.workers else None
     }
\ No newline at end of file
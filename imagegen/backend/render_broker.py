@@ -0,0 +1,275 @@
+"""
+Render Broker - SQLite job queue between the API and render workers
+
+The API submits render jobs; worker processes (backend/render_worker.py)
+claim them, render into the shared image directory and store the result.
+Workers register and heartbeat; jobs held by a worker whose heartbeat
+stopped go back to the queue, up to MAX_ATTEMPTS tries. The database is a
+single file in WAL mode, so any number of processes on the host (or on
+nodes sharing the file over a filesystem with working locks) can use it
+without a separate service.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+# Environment variable naming the broker database (unset: render in-process)
+BROKER_ENV = "IMAGEGEN_RENDER_BROKER"
+
+# Seconds without a heartbeat before a worker is considered dead
+HEARTBEAT_TIMEOUT = 15
+
+# Tries per job before it is marked failed
+MAX_ATTEMPTS = 3
+
+# Seconds between result polls while waiting for a job
+POLL_INTERVAL = 0.02
+
+# Seconds the API waits for a job (queue wait included)
+JOB_TIMEOUT = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    result TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    current_job TEXT,
+    jobs_done INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class BrokerTimeout(TimeoutError):
+    """Raised when a job does not finish in time"""
+
+
+class RenderBroker:
+    """Job queue and worker registry in one SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection of the calling thread (sqlite3 connections are per thread)"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    # ------------------------------------------------------------------
+    # API side
+    # ------------------------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any], priority: int = 0) -> str:
+        """
+        Queue a job.
+
+        Args:
+            payload: JSON-serializable job description
+            priority: Lower values are claimed first
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, priority, payload, created) VALUES (?, ?, ?, ?, ?)",
+            (job_id, QUEUED, priority, json.dumps(payload), time.time())
+        )
+        return job_id
+
+    def wait(self, job_id: str, timeout: float) -> Dict[str, Any]:
+        """
+        Block until a job finishes, then remove it.
+
+        Returns:
+            The job result (failed jobs give {"success": False, "error": ...})
+
+        Raises:
+            BrokerTimeout: The job did not finish in time (it is cancelled)
+        """
+        deadline = time.monotonic() + timeout
+        db = self._connect()
+        while True:
+            row = db.execute("SELECT status, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                raise KeyError(job_id)
+            if row["status"] in (DONE, FAILED):
+                db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                return json.loads(row["result"])
+            if time.monotonic() >= deadline:
+                self.cancel(job_id)
+                raise BrokerTimeout(f"Render job {job_id} did not finish in {timeout:.0f}s")
+            time.sleep(POLL_INTERVAL)
+
+    def cancel(self, job_id: str):
+        """Drop a job (a worker already rendering it finishes, but nobody reads the result)"""
+        self._connect().execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def register(self, worker_id: str = None) -> str:
+        """Register this process as a worker; returns its ID"""
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO workers (id, host, pid, started, heartbeat) VALUES (?, ?, ?, ?, ?)",
+            (worker_id, socket.gethostname(), os.getpid(), now, now)
+        )
+        return worker_id
+
+    def heartbeat(self, worker_id: str):
+        self._connect().execute(
+            "UPDATE workers SET heartbeat = ? WHERE id = ?", (time.time(), worker_id)
+        )
+
+    def unregister(self, worker_id: str):
+        db = self._connect()
+        db.execute("UPDATE jobs SET status = ?, worker = NULL WHERE worker = ? AND status = ?",
+                   (QUEUED, worker_id, RUNNING))
+        db.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the next queued job (lowest priority value, then oldest).
+
+        Returns:
+            {"id": ..., "payload": {...}} or None if the queue is empty
+        """
+        db = self._connect()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? ORDER BY priority, created LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started = ?, attempts = attempts + 1 "
+                "WHERE id = ?", (RUNNING, worker_id, now, row["id"])
+            )
+            db.execute("UPDATE workers SET heartbeat = ?, current_job = ? WHERE id = ?",
+                       (now, row["id"], worker_id))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return {"id": row["id"], "payload": json.loads(row["payload"])}
+
+    def complete(self, worker_id: str, job_id: str, result: Dict[str, Any]):
+        """Store a job result (failed if result["success"] is false)"""
+        status = DONE if result.get("success") else FAILED
+        db = self._connect()
+        db.execute("UPDATE jobs SET status = ?, result = ?, finished = ? WHERE id = ?",
+                   (status, json.dumps(result), time.time(), job_id))
+        db.execute("UPDATE workers SET current_job = NULL, jobs_done = jobs_done + 1, "
+                   "heartbeat = ? WHERE id = ?", (time.time(), worker_id))
+
+    def requeue_stale(self, heartbeat_timeout: float = HEARTBEAT_TIMEOUT) -> int:
+        """
+        Return jobs of dead workers to the queue and forget those workers.
+
+        Jobs that already used MAX_ATTEMPTS tries fail instead.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        db = self._connect()
+        cutoff = time.time() - heartbeat_timeout
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            dead = [row["id"] for row in db.execute(
+                "SELECT id FROM workers WHERE heartbeat < ?", (cutoff,))]
+            # Running jobs whose worker is dead or gone
+            stale = db.execute(
+                "SELECT id, attempts FROM jobs WHERE status = ? AND "
+                "(worker IS NULL OR worker NOT IN (SELECT id FROM workers WHERE heartbeat >= ?))",
+                (RUNNING, cutoff)
+            ).fetchall()
+            for row in stale:
+                if row["attempts"] >= MAX_ATTEMPTS:
+                    error = {"success": False, "error": "Render worker died"}
+                    db.execute("UPDATE jobs SET status = ?, result = ?, finished = ? WHERE id = ?",
+                               (FAILED, json.dumps(error), time.time(), row["id"]))
+                else:
+                    db.execute("UPDATE jobs SET status = ?, worker = NULL WHERE id = ?",
+                               (QUEUED, row["id"]))
+            db.executemany("DELETE FROM workers WHERE id = ?", [(w,) for w in dead])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(stale)
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def workers(self, heartbeat_timeout: float = HEARTBEAT_TIMEOUT) -> List[Dict[str, Any]]:
+        """Workers with a recent heartbeat"""
+        rows = self._connect().execute(
+            "SELECT * FROM workers WHERE heartbeat >= ? ORDER BY started",
+            (time.time() - heartbeat_timeout,)
+        )
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status and live workers"""
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        for row in self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        workers = self.workers()
+        return {
+            "path": self.path,
+            "jobs": counts,
+            "workers": len(workers),
+            "busy_workers": sum(1 for worker in workers if worker["current_job"]),
+            "worker_list": workers
+        }
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
@@ -0,0 +1,155 @@
+"""
+Render Options - Per-request raytracer settings and deployment limits
+
+RenderOptions is what a caller asks for (resolution, samples per pixel,
+recursion depth, threads, denoise passes). RenderLimits is what this deployment allows;
+it is read from IMAGEGEN_* environment variables so operators can tune
+quality against throughput per tier without rebuilding the raytracer.
+"""
+
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Optional
+
+
+# Prefix of the environment variables read by RenderLimits.from_env
+ENV_PREFIX = "IMAGEGEN_"
+
+# Request keys accepted by RenderOptions.from_request
+OPTION_KEYS = ("width", "height", "samples", "depth", "threads", "denoise")
+
+# Values the raytracer uses when an option is not passed
+# (NUM_AA_SAMPLES, MAX_DEPTH and NUM_THREADS in raytracer_c/src/config.h)
+RAYTRACER_DEFAULTS = {"samples": 4, "depth": 5, "threads": 4}
+
+
+class RenderOptionsError(ValueError):
+    """Raised when render options are malformed or exceed the limits"""
+
+
+@dataclass
+class RenderOptions:
+    """Settings for one render (None means the raytracer default)"""
+    width: int = 800
+    height: int = 600
+    samples: Optional[int] = None
+    depth: Optional[int] = None
+    threads: Optional[int] = None
+    denoise: Optional[int] = None   # Edge-aware denoise passes (0 = off)
+
+    @classmethod
+    def from_request(cls, data: Dict[str, Any],
+                     limits: "RenderLimits" = None) -> "RenderOptions":
+        """
+        Build options from a request body and check them against limits.
+
+        Args:
+            data: Request dict; only OPTION_KEYS are read
+            limits: Limits to enforce (default: RenderLimits())
+
+        Returns:
+            Validated RenderOptions; unset values whose raytracer default
+            exceeds a limit are set to the limit
+        """
+        values = {}
+        for key in OPTION_KEYS:
+            value = data.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise RenderOptionsError(f"{key} must be an integer")
+            values[key] = value
+
+        options = cls(**values)
+        limits = limits or RenderLimits()
+        limits.validate(options)
+        return limits.cap_defaults(options)
+
+    def to_args(self) -> List[str]:
+        """Get raytracer command-line options (resolution excluded)"""
+        args = []
+        for flag, value in (("--samples", self.samples),
+                            ("--depth", self.depth),
+                            ("--threads", self.threads),
+                            ("--denoise", self.denoise)):
+            if value is not None:
+                args += [flag, str(value)]
+        return args
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RenderLimits:
+    """Largest render options this deployment accepts"""
+    max_width: int = 1920
+    max_height: int = 1080
+    max_samples: int = 64
+    max_depth: int = 16
+    max_threads: int = os.cpu_count() or 1
+    max_denoise: int = 5
+
+    @classmethod
+    def from_env(cls, environ: Dict[str, str] = None) -> "RenderLimits":
+        """
+        Read limits from IMAGEGEN_MAX_WIDTH, IMAGEGEN_MAX_HEIGHT,
+        IMAGEGEN_MAX_SAMPLES, IMAGEGEN_MAX_DEPTH, IMAGEGEN_MAX_THREADS
+        and IMAGEGEN_MAX_DENOISE.
+
+        Args:
+            environ: Environment mapping (default: os.environ)
+
+        Returns:
+            RenderLimits (unset variables keep their defaults)
+        """
+        environ = os.environ if environ is None else environ
+        values = {}
+        for name in cls.__dataclass_fields__:
+            raw = environ.get(ENV_PREFIX + name.upper())
+            if raw is None:
+                continue
+            try:
+                values[name] = int(raw)
+            except ValueError:
+                raise RenderOptionsError(f"{ENV_PREFIX}{name.upper()} must be an integer")
+            if values[name] < 1:
+                raise RenderOptionsError(f"{ENV_PREFIX}{name.upper()} must be at least 1")
+        return cls(**values)
+
+    def validate(self, options: RenderOptions):
+        """
+        Check options against the limits.
+
+        Raises:
+            RenderOptionsError: If a value is out of range
+        """
+        for key, low, high in (("width", 1, self.max_width),
+                               ("height", 1, self.max_height),
+                               ("samples", 1, self.max_samples),
+                               ("depth", 1, self.max_depth),
+                               ("threads", 1, self.max_threads),
+                               ("denoise", 0, self.max_denoise)):
+            value = getattr(options, key)
+            if value is not None and not low <= value <= high:
+                raise RenderOptionsError(f"{key} must be between {low} and {high}")
+
+    def cap_defaults(self, options: RenderOptions) -> RenderOptions:
+        """
+        Options with the unset values the raytracer would default above a
+        limit set to that limit (e.g. threads=1 under max_threads=1).
+        """
+        values = {}
+        for key, default in RAYTRACER_DEFAULTS.items():
+            limit = getattr(self, f"max_{key}")
+            if getattr(options, key) is None and default > limit:
+                values[key] = limit
+        return replace(options, **values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def denoise_radius(passes: int) -> int:
+    """Pixels the raytracer's denoiser reads around each pixel (see raytracer_c/src/core/denoise.h)"""
+    return 2 * ((1 << passes) - 1) if passes > 0 else 0
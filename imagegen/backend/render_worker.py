@@ -0,0 +1,162 @@
+"""
+Render Worker - Process that renders jobs from the render broker
+
+Run one or more per host, next to or away from the API server:
+
+    python -m backend.render_worker --broker data/render_broker.db -n 4
+
+Each process registers with the broker, heartbeats from a background
+thread, claims jobs one at a time and renders them with its own
+RaytracerIntegration straight into the shared image directory, so the
+API only has to hand out the URL. Throughput scales with the number of
+worker processes, independently of the API tier.
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+from backend.render_broker import BROKER_ENV, HEARTBEAT_TIMEOUT, RenderBroker
+from backend.render_options import RenderOptions
+
+
+# Seconds between heartbeats
+HEARTBEAT_INTERVAL = HEARTBEAT_TIMEOUT / 3
+
+# Idle poll interval bounds (seconds); doubles while the queue stays empty
+IDLE_POLL_MIN = 0.01
+IDLE_POLL_MAX = 0.25
+
+
+def render_job(raytracer, payload: dict) -> dict:
+    """
+    Render one broker job payload ({"description", "scene", "options"}).
+
+    Tile jobs (backend/tile_render.py) also carry "tile" and the
+    "output_path" the coordinator stitches from.
+    """
+    options = RenderOptions(**payload.get("options", {}))
+    return raytracer.generate(payload.get("description", ""), options.width, options.height,
+                              scene=payload.get("scene"), output_path=payload.get("output_path"),
+                              options=options, tile=payload.get("tile"))
+
+
+def run_worker(broker_path: str, output_dir: str = None, quiet: bool = True):
+    """
+    Serve jobs until SIGTERM/SIGINT.
+
+    Args:
+        broker_path: Broker database file
+        output_dir: Shared image directory (default: the raytracer's output_images/)
+        quiet: Silence the raytracer integration's progress output
+    """
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+    from backend.raytracer_integration import RaytracerIntegration
+
+    # One raytracer process per render worker is enough
+    raytracer = RaytracerIntegration(workers=1)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        raytracer.output_dir = os.path.abspath(output_dir)
+
+    broker = RenderBroker(broker_path)
+    worker_id = broker.register()
+    stop = threading.Event()
+
+    def heartbeat():
+        beat = RenderBroker(broker_path)
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            beat.heartbeat(worker_id)
+        beat.close()
+
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    threading.Thread(target=heartbeat, name="heartbeat", daemon=True).start()
+    print(f"worker {worker_id} ready", file=sys.stderr)
+
+    idle = IDLE_POLL_MIN
+    last_requeue = 0.0
+    try:
+        while not stop.is_set():
+            if time.monotonic() - last_requeue > HEARTBEAT_INTERVAL:
+                broker.requeue_stale()
+                last_requeue = time.monotonic()
+            job = broker.claim(worker_id)
+            if job is None:
+                stop.wait(idle)
+                idle = min(idle * 2, IDLE_POLL_MAX)
+                continue
+            idle = IDLE_POLL_MIN
+
+            try:
+                result = render_job(raytracer, job["payload"])
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            result["worker"] = worker_id
+            broker.complete(worker_id, job["id"], result)
+    finally:
+        stop.set()
+        broker.unregister(worker_id)
+        broker.close()
+        raytracer.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render jobs from the ImageGen render broker")
+    parser.add_argument(
+        "--broker",
+        default=os.environ.get(BROKER_ENV, "data/render_broker.db"),
+        help=f"Broker database (default: ${BROKER_ENV} or data/render_broker.db)"
+    )
+    parser.add_argument(
+        "-n", "--processes",
+        type=int,
+        default=1,
+        help="Worker processes to start (default: 1)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Shared image directory (default: output_images/)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show raytracer progress output"
+    )
+    args = parser.parse_args(argv)
+
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+
+    if args.processes == 1:
+        run_worker(args.broker, args.output_dir, not args.verbose)
+        return 0
+
+    processes = [
+        multiprocessing.Process(target=run_worker,
+                                args=(args.broker, args.output_dir, not args.verbose))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+"""
+Scene Binary - Compact binary scene format (.vtsc) with zero-copy loading
+
+Layout (little-endian, every section 4-byte aligned):
+
+    header        magic "VTSC", version, section offsets, camera, background
+    string table  u32 length + UTF-8 bytes (JSON for geometries/materials/metadata)
+    mesh table    one fixed-size record per batch (shape, color, counts, offsets)
+    float data    packed float32 positions / rotations / scales
+
+The reader maps the file with mmap and hands out memoryview slices of the
+float data, so loading a scene does not copy or parse any transform.
+The same layout is read by the C raytracer (raytracer_c/src/io/scene_file.h).
+"""
+
+import base64
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+from backend.scene_encoding import SCENE_FORMAT_V2, batch_objects
+
+
+MAGIC = b"VTSC"
+VERSION = 1
+
+# Marks a missing string / float array reference
+NONE = 0xFFFFFFFF
+
+# magic, version, header size, string table offset, string table size,
+# mesh table offset, mesh count, float data offset, float count,
+# metadata string, camera position (3f), camera look-at (3f), fov, background (3f)
+HEADER = struct.Struct("<4sHHIIIIIII3f3ff3f")
+
+# name, geometry, material, animation (string offsets), shape, flags, count,
+# positions, rotations, scales (float indices), bounding radius, color (3f),
+# metalness, roughness, rotation (3f), scale (3f)
+MESH = struct.Struct("<10I12f")
+
+FLAG_CAST_SHADOW = 1
+FLAG_RECEIVE_SHADOW = 2
+
+# Shape codes shared with the C loader
+SHAPE_CODES = {
+    "BoxGeometry": 0,
+    "SphereGeometry": 1,
+    "CylinderGeometry": 2,
+    "ConeGeometry": 3,
+    "TorusGeometry": 4,
+    "PlaneGeometry": 5,
+}
+SHAPE_UNKNOWN = 255
+
+
+class SceneFormatError(ValueError):
+    """Raised when a buffer is not a valid binary scene"""
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+def encode_scene_binary(scene_data: Dict[str, Any]) -> bytes:
+    """
+    Encode a version 1 scene into the binary format.
+
+    Args:
+        scene_data: Scene dictionary from SceneGenerator
+
+    Returns:
+        Binary scene bytes
+    """
+    scene = scene_data.get("scene", {})
+    geometries, materials, batches = batch_objects(scene.get("objects", []))
+
+    strings = _StringTable()
+    floats = array('f')
+    records = []
+
+    for batch in batches:
+        geometry = geometries[batch["geometry"]]
+        material = materials[batch["material"]]
+
+        positions = _append_floats(floats, batch["positions"])
+        rotations = NONE if "rotation" in batch else _append_floats(floats, batch["rotations"])
+        scales = NONE if "scale" in batch else _append_floats(floats, batch["scales"])
+
+        flags = 0
+        if batch.get("castShadow", True):
+            flags |= FLAG_CAST_SHADOW
+        if batch.get("receiveShadow", True):
+            flags |= FLAG_RECEIVE_SHADOW
+
+        records.append(MESH.pack(
+            strings.add(batch.get("name") or ""),
+            strings.add(json.dumps(geometry)),
+            strings.add(json.dumps(material)),
+            strings.add(json.dumps(batch["animation"])) if batch.get("animation") else NONE,
+            SHAPE_CODES.get(geometry.get("type"), SHAPE_UNKNOWN),
+            flags,
+            batch["count"],
+            positions,
+            rotations,
+            scales,
+            bounding_radius(geometry),
+            *hex_to_float(material.get("color", "#ffffff")),
+            float(material.get("metalness", 0.0)),
+            float(material.get("roughness", 0.8)),
+            *batch.get("rotation", (0, 0, 0)),
+            *batch.get("scale", (1, 1, 1))
+        ))
+
+    # Everything except objects round-trips through the metadata string
+    metadata = {k: v for k, v in scene_data.items() if k not in ("scene", "format")}
+    metadata["scene"] = {k: v for k, v in scene.items() if k != "objects"}
+    metadata_offset = strings.add(json.dumps(metadata))
+
+    if sys.byteorder == 'big':
+        floats.byteswap()
+
+    string_bytes = strings.to_bytes()
+    string_offset = HEADER.size
+    mesh_offset = string_offset + len(string_bytes)
+    data_offset = mesh_offset + MESH.size * len(records)
+
+    camera = scene.get("camera", {})
+    header = HEADER.pack(
+        MAGIC, VERSION, HEADER.size,
+        string_offset, len(string_bytes),
+        mesh_offset, len(records),
+        data_offset, len(floats),
+        metadata_offset,
+        *camera.get("position", (0, 5, 15)),
+        *camera.get("lookAt", (0, 0, 0)),
+        camera.get("fov", 60),
+        *scene.get("background", (0, 0, 0))
+    )
+
+    return b"".join([header, string_bytes, *records, floats.tobytes()])
+
+
+def write_scene_binary(scene_data: Dict[str, Any], path: str) -> int:
+    """
+    Write a scene to a binary file.
+
+    Args:
+        scene_data: Scene dictionary from SceneGenerator
+        path: Output file path
+
+    Returns:
+        Number of bytes written
+    """
+    data = encode_scene_binary(scene_data)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+class BinaryMesh:
+    """One mesh record; float arrays are memoryview slices into the scene buffer"""
+
+    def __init__(self, scene: "BinaryScene", record: tuple):
+        (self._name, self._geometry, self._material, self._animation,
+         self.shape, self.flags, self.count,
+         self._positions, self._rotations, self._scales) = record[:10]
+        self.radius = record[10]
+        self.color = record[11:14]
+        self.metalness = record[14]
+        self.roughness = record[15]
+        self.rotation = record[16:19]
+        self.scale = record[19:22]
+        self._scene = scene
+
+    @property
+    def name(self) -> str:
+        return self._scene.string(self._name)
+
+    @property
+    def geometry(self) -> Dict[str, Any]:
+        return json.loads(self._scene.string(self._geometry))
+
+    @property
+    def material(self) -> Dict[str, Any]:
+        return json.loads(self._scene.string(self._material))
+
+    @property
+    def animation(self) -> Optional[Dict[str, Any]]:
+        if self._animation == NONE:
+            return None
+        return json.loads(self._scene.string(self._animation))
+
+    @property
+    def positions(self) -> memoryview:
+        """Flat float32 positions (stride 3)"""
+        return self._scene.floats(self._positions, self.count * 3)
+
+    @property
+    def rotations(self) -> Optional[memoryview]:
+        """Flat float32 rotations, or None when the shared rotation applies"""
+        if self._rotations == NONE:
+            return None
+        return self._scene.floats(self._rotations, self.count * 3)
+
+    @property
+    def scales(self) -> Optional[memoryview]:
+        """Flat float32 scales, or None when the shared scale applies"""
+        if self._scales == NONE:
+            return None
+        return self._scene.floats(self._scales, self.count * 3)
+
+
+class BinaryScene:
+    """
+    Read-only view over a binary scene buffer.
+
+    Use load_scene_binary() to map a file; close() (or a with-block) unmaps it.
+    Float views handed out by meshes must be released before closing.
+    """
+
+    def __init__(self, buffer, _mmap: mmap.mmap = None, _file=None):
+        self._view = memoryview(buffer)
+        self._mmap = _mmap
+        self._file = _file
+
+        if len(self._view) < HEADER.size:
+            raise SceneFormatError("Buffer too small for scene header")
+
+        header = HEADER.unpack_from(self._view, 0)
+        if header[0] != MAGIC:
+            raise SceneFormatError("Not a binary scene (bad magic)")
+        if header[1] != VERSION:
+            raise SceneFormatError(f"Unsupported binary scene version: {header[1]}")
+
+        (_, self.version, _, self._string_offset, self._string_size,
+         self._mesh_offset, self.mesh_count, self._data_offset,
+         self._float_count, self._metadata) = header[:10]
+        self.camera_position = header[10:13]
+        self.camera_look_at = header[13:16]
+        self.fov = header[16]
+        self.background = header[17:20]
+
+        end = self._data_offset + 4 * self._float_count
+        if end > len(self._view):
+            raise SceneFormatError("Truncated binary scene")
+
+        self._data = self._view[self._data_offset:end]
+        self.meshes: List[BinaryMesh] = [
+            BinaryMesh(self, MESH.unpack_from(self._view, self._mesh_offset + i * MESH.size))
+            for i in range(self.mesh_count)
+        ]
+
+    def string(self, offset: int) -> str:
+        """Get a string from the string table by byte offset"""
+        start = self._string_offset + offset
+        (length,) = struct.unpack_from("<I", self._view, start)
+        return str(self._view[start + 4:start + 4 + length], 'utf-8')
+
+    def floats(self, index: int, count: int):
+        """Get count float32 values starting at a float index (no copy)"""
+        raw = self._data[index * 4:(index + count) * 4]
+        if sys.byteorder == 'little':
+            return raw.cast('f')
+
+        # Big-endian hosts have to swap, which needs a copy
+        data = array('f')
+        data.frombytes(raw)
+        data.byteswap()
+        return memoryview(data)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Scene fields other than objects (id, name, options, lights, ...)"""
+        return json.loads(self.string(self._metadata))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a version 2 scene dictionary.
+
+        Float arrays are base64-encoded straight from the mapped bytes.
+        """
+        meshes = []
+        for mesh in self.meshes:
+            entry = {
+                "name": mesh.name,
+                "geometry": mesh.geometry,
+                "material": mesh.material,
+                "count": mesh.count,
+                "positions": self._pack(mesh._positions, mesh.count),
+                "castShadow": bool(mesh.flags & FLAG_CAST_SHADOW),
+                "receiveShadow": bool(mesh.flags & FLAG_RECEIVE_SHADOW)
+            }
+            for shared, packed, index in (("rotation", "rotations", mesh._rotations),
+                                          ("scale", "scales", mesh._scales)):
+                if index == NONE:
+                    entry[shared] = list(getattr(mesh, shared))
+                else:
+                    entry[packed] = self._pack(index, mesh.count)
+            if mesh.animation:
+                entry["animation"] = mesh.animation
+            meshes.append(entry)
+
+        # Shared tables are rebuilt from the per-mesh JSON strings
+        geometries, materials = [], []
+        for entry in meshes:
+            for key, table in (("geometry", geometries), ("material", materials)):
+                if entry[key] not in table:
+                    table.append(entry[key])
+                entry[key] = table.index(entry[key])
+
+        scene_data = self.metadata
+        scene_data["format"] = SCENE_FORMAT_V2
+        scene_data["scene"]["geometries"] = geometries
+        scene_data["scene"]["materials"] = materials
+        scene_data["scene"]["meshes"] = meshes
+        return scene_data
+
+    def _pack(self, index: int, count: int) -> str:
+        """Base64 of count * 3 floats, taken directly from the buffer"""
+        return base64.b64encode(self._data[index * 4:(index + count * 3) * 4]).decode('ascii')
+
+    def close(self):
+        """Release the buffer and unmap the file"""
+        self.meshes = []
+        self._data.release()
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Mesh views still alive; unmapped once they are freed
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_scene_binary(path: str) -> BinaryScene:
+    """
+    Memory-map a binary scene file.
+
+    Args:
+        path: Path to a .vtsc file
+
+    Returns:
+        BinaryScene backed by the mapped file
+    """
+    f = open(path, 'rb')
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise SceneFormatError(f"Empty scene file: {path}")
+    return BinaryScene(mapped, _mmap=mapped, _file=f)
+
+
+def is_scene_binary(path: str) -> bool:
+    """Check whether a file starts with the binary scene magic"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+class _StringTable:
+    """Length-prefixed UTF-8 strings referenced by byte offset"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._size = 0
+
+    def add(self, value: str) -> int:
+        """Append a string and return its offset"""
+        data = value.encode('utf-8')
+        chunk = struct.pack("<I", len(data)) + data
+        chunk += b"\0" * (-len(chunk) % 4)
+        offset = self._size
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        return offset
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def _append_floats(floats: array, values: List[float]) -> int:
+    """Append values to the float data and return their start index"""
+    index = len(floats)
+    floats.extend(values)
+    return index
+
+
+def hex_to_float(color: str) -> tuple:
+    """Convert #rrggbb to float RGB [0-1]"""
+    value = color.lstrip("#")
+    if len(value) != 6:
+        return (1.0, 1.0, 1.0)
+    return tuple(int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def bounding_radius(geometry: Dict[str, Any]) -> float:
+    """Radius of a sphere around the origin enclosing the geometry"""
+    kind = geometry.get("type")
+    if kind == "SphereGeometry":
+        return geometry.get("radius", 1)
+    if kind == "BoxGeometry":
+        return math.sqrt(geometry.get("width", 1) ** 2 + geometry.get("height", 1) ** 2
+                         + geometry.get("depth", 1) ** 2) / 2
+    if kind == "CylinderGeometry":
+        radius = max(geometry.get("radiusTop", 1), geometry.get("radiusBottom", 1))
+        return math.hypot(radius, geometry.get("height", 1) / 2)
+    if kind == "ConeGeometry":
+        return math.hypot(geometry.get("radius", 1), geometry.get("height", 1) / 2)
+    if kind == "TorusGeometry":
+        return geometry.get("radius", 1) + geometry.get("tube", 0.4)
+    if kind == "PlaneGeometry":
+        return math.hypot(geometry.get("width", 1), geometry.get("height", 1)) / 2
+    return 1.0
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from backend.nlp_engine import NLPEngine
+    from backend.scene_generator import SceneGenerator
+
+    nlp = NLPEngine()
+    gen = SceneGenerator()
+
+    description = "A thousand red cubes at random and a blue sphere"
+    scene = gen.generate_scene(nlp.parse_description(description))
+
+    path = os.path.join(tempfile.gettempdir(), "example.vtsc")
+    size = write_scene_binary(scene, path)
+
+    print(f"📝 Description: {description}")
+    print(f"📦 JSON: {len(json.dumps(scene))} bytes, binary: {size} bytes")
+
+    with load_scene_binary(path) as loaded:
+        for mesh in loaded.meshes:
+            positions = mesh.positions
+            print(f"   - {mesh.name}: {mesh.count} instances, "
+                  f"first at {positions[0:3].tolist()}")
+            positions.release()
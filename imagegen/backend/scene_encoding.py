@@ -0,0 +1,303 @@
+"""
+Scene Encoding - Compact, deduplicated scene format for the Three.js viewer
+
+Format version 1 is what SceneGenerator produces: every object carries its
+own geometry and material dicts. Format version 2 stores each distinct
+geometry and material once in shared tables, groups objects that share
+geometry, material and animation into one batch, and packs the per-instance
+positions as base64 little-endian float32 (ready for a Float32Array).
+Rotations and scales are packed the same way only when they differ within
+a batch; otherwise the batch carries a single shared value.
+"""
+
+import base64
+import json
+import sys
+from array import array
+from typing import Any, Dict, List
+
+
+SCENE_FORMAT_V1 = 1
+SCENE_FORMAT_V2 = 2
+
+# Floats per instance in packed positions/rotations/scales (x, y, z)
+TRANSFORM_STRIDE = 3
+
+
+def pack_floats(values: List[float]) -> str:
+    """
+    Pack floats as base64 little-endian float32.
+
+    Args:
+        values: Flat list of floats
+
+    Returns:
+        Base64 string
+    """
+    data = array('f', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode('ascii')
+
+
+def unpack_floats(encoded: str) -> List[float]:
+    """
+    Unpack a base64 little-endian float32 string.
+
+    Args:
+        encoded: Base64 string produced by pack_floats
+
+    Returns:
+        Flat list of floats
+    """
+    data = array('f')
+    data.frombytes(base64.b64decode(encoded))
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tolist()
+
+
+def scene_format(scene_data: Dict[str, Any]) -> int:
+    """Get the format version of a scene dict (missing means version 1)"""
+    return scene_data.get("format", SCENE_FORMAT_V1)
+
+
+def encode_scene(scene_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a version 1 scene into the deduplicated version 2 format.
+
+    Args:
+        scene_data: Scene dictionary from SceneGenerator
+
+    Returns:
+        Version 2 scene dictionary (scenes already in v2 are returned as-is)
+    """
+    if scene_format(scene_data) == SCENE_FORMAT_V2:
+        return scene_data
+
+    scene = scene_data.get("scene", {})
+    geometries, materials, batches = batch_objects(scene.get("objects", []))
+
+    meshes = []
+    for batch in batches:
+        batch["positions"] = pack_floats(batch["positions"])
+        for shared, packed in (("rotation", "rotations"), ("scale", "scales")):
+            values = batch.pop(packed)
+            if shared not in batch:
+                batch[packed] = pack_floats(values)
+        meshes.append(batch)
+
+    encoded_scene = {k: v for k, v in scene.items() if k != "objects"}
+    encoded_scene["geometries"] = geometries
+    encoded_scene["materials"] = materials
+    encoded_scene["meshes"] = meshes
+
+    encoded = {k: v for k, v in scene_data.items() if k != "scene"}
+    encoded["format"] = SCENE_FORMAT_V2
+    encoded["scene"] = encoded_scene
+    return encoded
+
+
+def batch_objects(objects: List[Dict[str, Any]]) -> tuple:
+    """
+    Group version 1 objects into batches sharing geometry, material and animation.
+
+    Batches hold plain float lists in "positions", "rotations" and "scales"
+    (stride 3). When every instance of a batch has the same rotation or
+    scale, the batch also gets a shared "rotation"/"scale" entry.
+
+    Args:
+        objects: Version 1 scene objects
+
+    Returns:
+        Tuple (geometries, materials, batches)
+    """
+    geometries = _Table()
+    materials = _Table()
+    batches: Dict[tuple, Dict[str, Any]] = {}
+
+    for obj in objects:
+        geometry_index = geometries.index(obj.get("geometry", {}))
+        material_index = materials.index(obj.get("material", {}))
+        animation = obj.get("animation")
+
+        key = (geometry_index, material_index, _dict_key(animation),
+               obj.get("castShadow", True), obj.get("receiveShadow", True))
+
+        batch = batches.get(key)
+        if batch is None:
+            batch = {
+                "name": obj.get("name"),
+                "geometry": geometry_index,
+                "material": material_index,
+                "count": 0,
+                "positions": [],
+                "rotations": [],
+                "scales": [],
+                "castShadow": obj.get("castShadow", True),
+                "receiveShadow": obj.get("receiveShadow", True)
+            }
+            if animation:
+                batch["animation"] = animation
+            batches[key] = batch
+
+        _append_transforms(batch, obj)
+
+    for batch in batches.values():
+        for shared, packed in (("rotation", "rotations"), ("scale", "scales")):
+            values = batch[packed]
+            first = values[:TRANSFORM_STRIDE]
+            if values == first * batch["count"]:
+                batch[shared] = first
+
+    return geometries.items, materials.items, list(batches.values())
+
+
+def decode_scene(scene_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a version 2 scene back into the version 1 format.
+
+    Each batch becomes one instanced_mesh object, or a plain mesh when it
+    holds a single instance. Version 1 instances only vary by position, so
+    a batch whose instances differ in rotation or scale becomes one plain
+    mesh per instance instead.
+
+    Args:
+        scene_data: Version 2 scene dictionary
+
+    Returns:
+        Version 1 scene dictionary (scenes already in v1 are returned as-is)
+    """
+    if scene_format(scene_data) != SCENE_FORMAT_V2:
+        return scene_data
+
+    scene = scene_data.get("scene", {})
+    geometries = scene.get("geometries", [])
+    materials = scene.get("materials", [])
+
+    objects = []
+    for i, mesh in enumerate(scene.get("meshes", [])):
+        count = mesh["count"]
+        positions = unpack_floats(mesh["positions"])
+        rotations = _unpack_shared(mesh, "rotation", "rotations", count)
+        scales = _unpack_shared(mesh, "scale", "scales", count)
+
+        base = {
+            "name": mesh.get("name"),
+            "type": "mesh",
+            "geometry": geometries[mesh["geometry"]],
+            "material": materials[mesh["material"]],
+            "castShadow": mesh.get("castShadow", True),
+            "receiveShadow": mesh.get("receiveShadow", True)
+        }
+        if mesh.get("animation"):
+            base["animation"] = mesh["animation"]
+
+        uniform = (rotations == rotations[0:3] * count and scales == scales[0:3] * count)
+        if count > 1 and uniform:
+            objects.append({
+                "id": f"obj_{scene_data.get('id', 'scene')}_{i}",
+                **base,
+                "type": "instanced_mesh",
+                "position": [0, 0, 0],
+                "rotation": rotations[0:3],
+                "scale": scales[0:3],
+                "instances": {"count": count, "positions": positions}
+            })
+            continue
+
+        for j in range(count):
+            k = j * TRANSFORM_STRIDE
+            objects.append({
+                "id": f"obj_{scene_data.get('id', 'scene')}_{i}" + (f"_{j}" if count > 1 else ""),
+                **base,
+                "position": positions[k:k + TRANSFORM_STRIDE],
+                "rotation": rotations[k:k + TRANSFORM_STRIDE],
+                "scale": scales[k:k + TRANSFORM_STRIDE]
+            })
+
+    decoded_scene = {
+        k: v for k, v in scene.items()
+        if k not in ("geometries", "materials", "meshes")
+    }
+    decoded_scene["objects"] = objects
+
+    decoded = {k: v for k, v in scene_data.items() if k not in ("scene", "format")}
+    decoded["scene"] = decoded_scene
+    return decoded
+
+
+def _append_transforms(batch: Dict[str, Any], obj: Dict[str, Any]):
+    """Append the position, rotation and scale of every instance of obj"""
+    rotation = list(obj.get("rotation", [0, 0, 0]))
+    scale = list(obj.get("scale", [1, 1, 1]))
+    origin = obj.get("position", [0, 0, 0])
+
+    if obj.get("type") == "instanced_mesh":
+        count = obj["instances"]["count"]
+        positions = obj["instances"]["positions"]
+        for i in range(0, len(positions), 3):
+            batch["positions"].extend((
+                origin[0] + positions[i],
+                origin[1] + positions[i + 1],
+                origin[2] + positions[i + 2],
+            ))
+    else:
+        count = 1
+        batch["positions"].extend(origin)
+
+    batch["rotations"].extend(rotation * count)
+    batch["scales"].extend(scale * count)
+    batch["count"] += count
+
+
+def _unpack_shared(mesh: Dict[str, Any], shared: str, packed: str,
+                   count: int) -> List[float]:
+    """Get per-instance values from either a packed list or a shared value"""
+    if packed in mesh:
+        return unpack_floats(mesh[packed])
+    return list(mesh[shared]) * count
+
+
+def _dict_key(value: Any) -> str:
+    """Get a hashable key for a JSON-compatible value"""
+    return json.dumps(value, sort_keys=True)
+
+
+class _Table:
+    """Ordered table of distinct dicts, referenced by index"""
+
+    def __init__(self):
+        self.items: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+
+    def index(self, item: Dict[str, Any]) -> int:
+        """Get the index of item, adding it if it is new"""
+        key = _dict_key(item)
+        if key not in self._index:
+            self._index[key] = len(self.items)
+            self.items.append(item)
+        return self._index[key]
+
+
+# Example usage
+if __name__ == "__main__":
+    from backend.nlp_engine import NLPEngine
+    from backend.scene_generator import SceneGenerator
+
+    nlp = NLPEngine()
+    gen = SceneGenerator()
+
+    description = ("A thousand red cubes at random, a blue sphere, a blue sphere, "
+                   "a blue sphere, a blue sphere")
+    scene = gen.generate_scene(nlp.parse_description(description))
+    encoded = encode_scene(scene)
+
+    v1_size = len(json.dumps(scene))
+    v2_size = len(json.dumps(encoded))
+
+    print(f"📝 Description: {description}")
+    print(f"📦 v1: {len(scene['scene']['objects'])} objects, {v1_size} bytes")
+    print(f"📦 v2: {len(encoded['scene']['meshes'])} meshes, "
+          f"{len(encoded['scene']['geometries'])} geometries, "
+          f"{len(encoded['scene']['materials'])} materials, {v2_size} bytes")
@@ -6,6 +6,7 @@ from typing import List, Dict, Any
 from datetime import datetime
 import uuid
 from backend.nlp_engine import Entity, ShapeType
+from backend.layout import layout_positions
 
 
 class SceneGenerator:
@@ -55,18 +56,33 @@ class SceneGenerator:
             }
         }
         
-        # Add objects
+        # Add objects (groups become a single instanced object)
         for i, entity in enumerate(entities):
-            obj = self._entity_to_threejs(entity)
+            if entity.count > 1:
+                obj = self._entity_to_instanced(entity)
+            else:
+                obj = self._entity_to_threejs(entity)
             scene_data["scene"]["objects"].append(obj)
         
         # Add lighting
         scene_data["scene"]["lights"] = self._generate_lighting()
         
         # Adjust camera if many objects
-        if len(entities) > 5:
+        total_objects = sum(entity.count for entity in entities)
+        if total_objects > 5:
             scene_data["scene"]["camera"]["position"] = [0, 10, 25]
         
+        # Pull camera back for large groups so every instance is in view
+        center_x, center_z, radius = self._get_scene_bounds(
+            scene_data["scene"]["objects"]
+        )
+        if radius > 10:
+            camera = scene_data["scene"]["camera"]
+            camera["position"] = [
+                round(center_x, 2), round(radius, 2), round(center_z + radius * 2.5, 2)
+            ]
+            camera["lookAt"] = [round(center_x, 2), 0, round(center_z, 2)]
+        
         return scene_data
     
     def _entity_to_threejs(self, entity: Entity) -> Dict[str, Any]:
@@ -95,6 +111,65 @@ class SceneGenerator:
         
         return obj
     
+    def _entity_to_instanced(self, entity: Entity) -> Dict[str, Any]:
+        """
+        Convert a group entity to one instanced Three.js object.
+        
+        Geometry and material are stored once; each instance only adds
+        three floats to the flat "positions" list (x0, y0, z0, x1, ...).
+        """
+        positions = layout_positions(entity.layout, entity.count,
+                                     origin=entity.position)
+        
+        obj = {
+            "id": f"obj_{uuid.uuid4()}",
+            "name": entity.name,
+            "type": "instanced_mesh",
+            "geometry": self._get_geometry(entity.type),
+            "material": self._get_material(entity.color, entity.material),
+            "position": [0, 0, 0],
+            "rotation": list(entity.rotation),
+            "scale": [entity.scale] * 3,
+            "instances": {
+                "count": entity.count,
+                "layout": entity.layout,
+                "positions": positions
+            },
+            "castShadow": True,
+            "receiveShadow": True
+        }
+        
+        if entity.animation:
+            obj["animation"] = self._get_animation(entity.animation)
+        
+        return obj
+    
+    def _get_scene_bounds(self, objects: List[Dict[str, Any]]) -> tuple:
+        """
+        Get the X/Z footprint of all objects.
+        
+        Returns:
+            Tuple (center_x, center_z, radius)
+        """
+        xs = []
+        zs = []
+        for obj in objects:
+            if obj["type"] == "instanced_mesh":
+                positions = obj["instances"]["positions"]
+                xs.extend((min(positions[0::3]), max(positions[0::3])))
+                zs.extend((min(positions[2::3]), max(positions[2::3])))
+            else:
+                xs.append(obj["position"][0])
+                zs.append(obj["position"][2])
+        
+        if not xs:
+            return (0.0, 0.0, 0.0)
+        
+        center_x = (min(xs) + max(xs)) / 2
+        center_z = (min(zs) + max(zs)) / 2
+        radius = max(max(xs) - min(xs), max(zs) - min(zs)) / 2
+        return (center_x, center_z, radius)
+    
     def _get_geometry(self, shape_type: ShapeType) -> Dict[str, Any]:
         """Get geometry parameters for shape"""
         
@@ -270,7 +345,7 @@ class SceneGenerator:
 
 # Example usage
 if __name__ == "__main__":
-    from nlp_engine import NLPEngine
+    from backend.nlp_engine import NLPEngine
     
     nlp = NLPEngine()
     gen = SceneGenerator()
@@ -299,3 +374,12 @@ if __name__ == "__main__":
         print(f"   Position: {obj['position']}")
         if 'animation' in obj:
             print(f"   Animation: {obj['animation']['type']}")
+    
+    # Test instanced group
+    entities = nlp.parse_description("Two thousand golden spheres at random")
+    scene = gen.generate_scene(entities)
+    obj = scene['scene']['objects'][0]
+    print(f"\n📦 Instanced object:")
+    print(f"   Name: {obj['name']}")
+    print(f"   Instances: {obj['instances']['count']} ({obj['instances']['layout']})")
+    print(f"   Camera: {scene['scene']['camera']['position']} -> {scene['scene']['camera']['lookAt']}")
@@ -0,0 +1,193 @@
+"""
+Scene Session - Scene edited over a chat connection, with partial re-renders
+
+A session keeps the entities, scene and last rendered frame of one chat
+connection, so "make the cube red" edits the scene instead of starting
+a new one (NLPEngine.parse_edit / apply_edit).
+
+The raytracer draws every instance as its bounding sphere with flat
+shading (no shadows, no reflections), so a pixel only depends on the
+spheres its rays hit. dirty_tiles compares the spheres of two scenes,
+projects the ones that appeared or disappeared with the C camera model
+(raytracer_c/src/core/camera.c) and returns the tiles they can touch;
+the other tiles are reused from the previous frame (render_tiled's
+base), which keeps the composite identical to a full render.
+"""
+
+import asyncio
+import math
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.nlp_engine import Entity
+from backend.render_options import RenderOptions, denoise_radius
+from backend.scene_binary import hex_to_float, bounding_radius
+from backend.scene_encoding import batch_objects
+from backend.tile_render import TILE_SIZE, Tile, split_tiles
+
+
+# Objects the raytracer loads (MAX_OBJECTS in raytracer_c/src/config.h);
+# past it the instances it drops depend on their order, so edits re-render
+MAX_OBJECTS = 1000
+
+# Pixels added around a projected sphere (sub-pixel jitter, float32 rounding)
+PIXEL_MARGIN = 1
+
+# Spheres closer to the camera plane than this cover an unbounded area
+NEAR_EPSILON = 1e-4
+
+Sphere = Tuple[Tuple[float, float, float], float, Tuple[float, float, float], float, float]
+
+
+@dataclass
+class SceneSession:
+    """
+    Scene being edited over one chat connection.
+
+    Hold lock from reading the scene until update(): each message builds
+    on the scene left by the one before, so two quick edits both apply.
+    """
+    entities: List[Entity] = field(default_factory=list)
+    scene: Optional[dict] = None
+    filename: Optional[str] = None           # Last frame, in output_images/
+    options: Optional[RenderOptions] = None  # Options the frame was rendered with
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+
+    def update(self, entities: List[Entity], scene: dict, filename: str,
+               options: RenderOptions):
+        """Record a rendered scene as the one further edits apply to"""
+        self.entities = entities
+        self.scene = scene
+        self.filename = filename
+        self.options = options
+
+
+def rendered_spheres(scene_data: Dict[str, Any]) -> Counter:
+    """
+    Spheres the raytracer draws for a scene, as a multiset.
+
+    Mirrors encode_scene_binary + scene_file_to_spheres: one sphere per
+    instance, centered on its position, radius = bounding radius x the
+    largest scale component.
+
+    Returns:
+        Counter of (center, radius, color, metalness, roughness)
+    """
+    geometries, materials, batches = batch_objects(scene_data.get("scene", {}).get("objects", []))
+    spheres = Counter()
+    for batch in batches:
+        radius = bounding_radius(geometries[batch["geometry"]])
+        material = materials[batch["material"]]
+        shading = (hex_to_float(material.get("color", "#ffffff")),
+                   float(material.get("metalness", 0.0)),
+                   float(material.get("roughness", 0.8)))
+        positions = batch["positions"]
+        scales = batch["scales"]
+        for i in range(0, len(positions), 3):
+            spheres[(tuple(positions[i:i + 3]), radius * max(scales[i:i + 3]), *shading)] += 1
+    return spheres
+
+
+def project_sphere(camera: Dict[str, Any], sphere: Sphere,
+                   width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Pixel bounding box (x0, y0, x1, y1, inclusive) a sphere can cover.
+
+    Returns:
+        The box clamped to the frame, an empty box (x0 > x1) when the
+        sphere is behind the camera or off screen, or None when it
+        reaches the camera plane (it may cover any pixel)
+    """
+    position = camera.get("position", (0, 5, 15))
+    forward = _normalize(_sub(camera.get("lookAt", (0, 0, 0)), position))
+    right = _normalize(_cross(forward, (0.0, 1.0, 0.0)))
+    up = _cross(right, forward)
+    plane_dist = 1.0 / math.tan(math.radians(camera.get("fov", 60)) / 2)
+    aspect = width / height
+
+    center, radius = sphere[0], sphere[1]
+    offset = _sub(center, position)
+    cx, cy, cz = _dot(offset, right), _dot(offset, up), _dot(offset, forward)
+    if cz + radius <= 0:
+        return (0, 0, -1, -1)
+    if cz - radius <= NEAR_EPSILON:
+        return None
+
+    # The sphere lies inside its camera-space box, so its image lies
+    # inside the hull of the projected box corners
+    xs, ys = [], []
+    for px in (cx - radius, cx + radius):
+        for py in (cy - radius, cy + radius):
+            for pz in (cz - radius, cz + radius):
+                xs.append((px * plane_dist / pz / aspect + 1) * width / 2)
+                ys.append((1 - py * plane_dist / pz) * height / 2)
+
+    x0 = max(0, math.floor(min(xs)) - PIXEL_MARGIN)
+    y0 = max(0, math.floor(min(ys)) - PIXEL_MARGIN)
+    x1 = min(width - 1, math.ceil(max(xs)) + PIXEL_MARGIN)
+    y1 = min(height - 1, math.ceil(max(ys)) + PIXEL_MARGIN)
+    return (x0, y0, x1, y1)
+
+
+def dirty_tiles(old_scene: Dict[str, Any], new_scene: Dict[str, Any],
+                options: RenderOptions, tile_size: int = TILE_SIZE) -> Optional[List[Tile]]:
+    """
+    Tiles of a frame of new_scene that may differ from old_scene's frame.
+
+    Both frames are assumed rendered with the same options.
+
+    Returns:
+        The tiles to re-render (possibly none), or None when the whole
+        frame has to be (camera or background changed, a sphere reaches
+        the camera plane, too many objects)
+    """
+    old, new = old_scene.get("scene", {}), new_scene.get("scene", {})
+    if old.get("camera") != new.get("camera") or old.get("background") != new.get("background"):
+        return None
+
+    old_spheres, new_spheres = rendered_spheres(old_scene), rendered_spheres(new_scene)
+    if max(sum(old_spheres.values()), sum(new_spheres.values())) > MAX_OBJECTS:
+        return None
+
+    # The denoiser spreads a change over its footprint
+    spread = denoise_radius(options.denoise or 0)
+    boxes = []
+    for sphere in (old_spheres - new_spheres) + (new_spheres - old_spheres):
+        box = project_sphere(new.get("camera", {}), sphere, options.width, options.height)
+        if box is None:
+            return None
+        if box[0] <= box[2] and box[1] <= box[3]:
+            boxes.append((box[0] - spread, box[1] - spread, box[2] + spread, box[3] + spread))
+
+    return [
+        tile for tile in split_tiles(options.width, options.height, tile_size)
+        if any(_overlaps(tile, box) for box in boxes)
+    ]
+
+
+def same_frame(a: RenderOptions, b: RenderOptions) -> bool:
+    """Whether two option sets render identical pixels (threads do not matter)"""
+    return replace(a, threads=None) == replace(b, threads=None)
+
+
+def _overlaps(tile: Tile, box: Tuple[int, int, int, int]) -> bool:
+    x, y, w, h = tile
+    return x <= box[2] and box[0] < x + w and y <= box[3] and box[1] < y + h
+
+
+def _sub(a, b) -> tuple:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b) -> tuple:
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _normalize(v) -> tuple:
+    length = math.sqrt(_dot(v, v))
+    return (v[0] / length, v[1] / length, v[2] / length) if length > 0 else v
@@ -0,0 +1,77 @@
+"""
+Single Flight - Coalesce identical in-flight work
+
+When several requests need the same result at the same time, only the
+first one does the work; the others await the same task and share its
+result (or exception). Once the task finishes the key is forgotten, so
+later requests start fresh work. Used by /api/generate with a key built
+from the normalized scene and render options.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+# Scene fields that differ between otherwise identical scenes
+VOLATILE_KEYS = ("id", "name", "timestamp", "created_at")
+
+
+class SingleFlight:
+    """Share one running coroutine between concurrent callers with the same key"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run work() unless a call with the same key is already running.
+
+        Args:
+            key: Identity of the work
+            work: Coroutine function; called only by the first caller
+
+        Returns:
+            Tuple (result, shared) - shared is True when the result came
+            from another caller's task
+
+        The task is shielded: a caller that is cancelled (client went
+        away) does not cancel the work the others are waiting for.
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(work())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def in_flight(self) -> int:
+        """Keys currently being worked on"""
+        return len(self._tasks)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved even if every caller was cancelled
+
+
+def scene_key(scene_data: Dict[str, Any], *extra: Any) -> str:
+    """
+    Key equal for scenes that render the same image.
+
+    Ignores IDs, names and timestamps (at the top level and on objects);
+    extra values (e.g. render options as a dict) are part of the key.
+    """
+    scene = dict(scene_data.get("scene", {}))
+    scene["objects"] = [
+        {key: value for key, value in obj.items() if key != "id"}
+        for obj in scene.get("objects", [])
+    ]
+    normalized = {key: value for key, value in scene_data.items()
+                  if key not in VOLATILE_KEYS and key != "scene"}
+    normalized["scene"] = scene
+    payload = json.dumps([normalized, list(extra)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,203 @@
+"""
+Static Assets - Frontend files served from memory with precompressed variants
+
+Files of the frontend directory are read once, on first use, and
+compressed ahead of time (gzip, plus brotli when the optional `brotli`
+package is installed). A request gets the smallest variant its
+Accept-Encoding allows, with an ETag per variant so revalidation costs a
+304 and no body.
+
+HTML pages are entry points and always revalidate. Their src/href
+references to other assets (under the mount prefix, or relative to the
+page) are rewritten to carry the asset's version (?v=<version>), and
+versioned URLs are cached by browsers for a year; a changed script or
+stylesheet changes the page, and with it the URL the page asks for.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+
+# Cache-Control for versioned URLs and for everything else (HTML pages included)
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Files below this size are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+# Served file types
+EXTENSIONS = (".html", ".js", ".css", ".svg", ".json", ".png", ".ico")
+
+# Asset references rewritten in HTML pages (no query or fragment yet)
+ASSET_REFERENCE = re.compile(r'\b(src|href)="([^"?#:]+)"')
+
+
+@dataclass
+class Asset:
+    """One file with its encoded variants ({"br": bytes, "gzip": bytes, ...})"""
+    media_type: str
+    version: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.version}-{encoding}"'
+
+
+class StaticAssets:
+    """
+    ASGI app serving a directory of frontend files mounted at url_prefix,
+    also usable from routes through response().
+    """
+
+    def __init__(self, directory: Path, url_prefix: str = "/static"):
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix.rstrip("/")
+        self._assets: Optional[Dict[str, Asset]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def assets(self) -> Dict[str, Asset]:
+        """Loaded assets by relative path (loaded on first access)"""
+        if self._assets is None:
+            with self._lock:
+                if self._assets is None:
+                    self._assets = self._load()
+        return self._assets
+
+    def version(self, path: str) -> Optional[str]:
+        """Version of an asset, for ?v= URLs"""
+        asset = self.assets.get(path)
+        return asset.version if asset else None
+
+    def response(self, path: str, request: Request, cache_control: str = None) -> Response:
+        """
+        Response for one asset, negotiated against the request headers.
+
+        Args:
+            path: Path relative to the directory
+            request: Incoming request (Accept-Encoding, If-None-Match, ?v=)
+            cache_control: Override the Cache-Control header
+
+        Returns:
+            200 with the best variant, 304 if the client's copy is current,
+            or 404
+        """
+        asset = self.assets.get(path)
+        if asset is None:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        encoding = _choose_encoding(request.headers.get("accept-encoding", ""), asset.variants)
+        if cache_control is None:
+            versioned = (request.query_params.get("v") == asset.version
+                         and asset.media_type != "text/html")
+            cache_control = IMMUTABLE_CACHE if versioned else REVALIDATE_CACHE
+
+        headers = {
+            "ETag": asset.etag(encoding),
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding"
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if _etag_matches(request.headers.get("if-none-match"), asset.etag(encoding)):
+            return Response(status_code=304, headers=headers)
+
+        body = asset.variants[encoding]
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(status_code=200, headers=headers, media_type=asset.media_type)
+        return Response(body, headers=headers, media_type=asset.media_type)
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        if request.method not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+        else:
+            response = self.response(scope["path"].lstrip("/"), request)
+        await response(scope, receive, send)
+
+    def _load(self) -> Dict[str, Asset]:
+        assets = {}
+        if not self.directory.is_dir():
+            return assets
+
+        files = [path for path in sorted(self.directory.rglob("*"))
+                 if path.is_file() and path.suffix in EXTENSIONS]
+        # Pages last: their references need the versions of the other assets
+        for path in sorted(files, key=lambda path: path.suffix == ".html"):
+            name = path.relative_to(self.directory).as_posix()
+            data = path.read_bytes()
+            if path.suffix == ".html":
+                data = self._version_references(name, data, assets)
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+            asset = Asset(media_type, hashlib.sha256(data).hexdigest()[:16], {"identity": data})
+            if len(data) >= MIN_COMPRESS_SIZE and path.suffix != ".png":
+                asset.variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+                if brotli is not None:
+                    asset.variants["br"] = brotli.compress(data, quality=11)
+            assets[name] = asset
+        return assets
+
+    def _version_references(self, page: str, html: bytes, assets: Dict[str, Asset]) -> bytes:
+        """Add ?v=<version> to the src/href attributes of page naming known assets"""
+        def versioned(match: "re.Match") -> str:
+            url = match.group(2)
+            if url.startswith(self.url_prefix + "/"):
+                name = url[len(self.url_prefix) + 1:]
+            elif url.startswith("/"):
+                return match.group(0)
+            else:
+                name = posixpath.normpath(posixpath.join(posixpath.dirname(page), url))
+            asset = assets.get(name)
+            if asset is None or asset.media_type == "text/html":
+                return match.group(0)
+            return f'{match.group(1)}="{url}?v={asset.version}"'
+
+        return ASSET_REFERENCE.sub(versioned, html.decode("utf-8")).encode("utf-8")
+
+
+def _choose_encoding(accept_encoding: str, variants: Dict[str, bytes]) -> str:
+    """Smallest variant the client accepts (identity is always acceptable)"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+
+    best = "identity"
+    for encoding, data in variants.items():
+        if (encoding in accepted or "*" in accepted) and len(data) < len(variants[best]):
+            best = encoding
+    return best
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in tags)
@@ -0,0 +1,292 @@
+"""
+Tile Render - Split one large render across raytracer workers
+
+The frame is cut into tiles; each tile is rendered on its own by a
+raytracer process (`raytracer --tile X,Y,W,H`, local worker pool or
+remote render workers through the broker) and pasted into the final
+image as soon as it arrives. Tiles use frame coordinates for their rays
+and sampling seeds, so the stitched image is identical to a full-frame
+render, while poster-size renders scale with the number of workers.
+
+The final PPM is allocated once at full size and memory-mapped; tile
+rows are read from the tile files straight into their place in the
+mapping (readinto on a memoryview slice), so no full-frame buffer is
+ever built in Python.
+
+Re-renders of an edited scene pass the previous frame as base and only
+the tiles that changed (see scene_session.py); the canvas starts as a
+copy of the base and the other tiles are kept as they are.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from backend.image_file import create_ppm, open_ppm, ppm_header, read_ppm_header
+from backend.render_options import RenderOptions
+
+
+# Environment variable with the pixel count from which renders are tiled
+TILE_MIN_PIXELS_ENV = "IMAGEGEN_TILE_MIN_PIXELS"
+
+# Renders of at least this many pixels are tiled (full HD and up)
+TILE_MIN_PIXELS = 1920 * 1080
+
+# Edge of a square tile (pixels)
+TILE_SIZE = 256
+
+Tile = Tuple[int, int, int, int]
+
+
+def tile_min_pixels(environ: Dict[str, str] = None) -> int:
+    """Tiling threshold from IMAGEGEN_TILE_MIN_PIXELS (0 disables tiling)"""
+    environ = os.environ if environ is None else environ
+    raw = environ.get(TILE_MIN_PIXELS_ENV)
+    if raw is None:
+        return TILE_MIN_PIXELS
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{TILE_MIN_PIXELS_ENV} must be an integer")
+    if value < 0:
+        raise ValueError(f"{TILE_MIN_PIXELS_ENV} must be at least 0")
+    return value
+
+
+def should_tile(options: RenderOptions, min_pixels: int = None) -> bool:
+    """Whether a render is large enough to be split into tiles"""
+    min_pixels = tile_min_pixels() if min_pixels is None else min_pixels
+    return min_pixels > 0 and options.width * options.height >= min_pixels
+
+
+def split_tiles(width: int, height: int, tile_size: int = TILE_SIZE) -> List[Tile]:
+    """
+    Cover a width x height frame with tiles, row by row.
+
+    Returns:
+        (x, y, w, h) per tile; tiles on the right and bottom edges are smaller
+    """
+    return [
+        (x, y, min(tile_size, width - x), min(tile_size, height - y))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+class TileCanvas:
+    """
+    Full-size PPM file, memory-mapped, that tiles are pasted into.
+
+    Pastes of different tiles touch disjoint bytes, so they may run on
+    several threads at once. With a base image (a PPM of the same size)
+    the canvas starts as a copy of it instead of black.
+    """
+
+    def __init__(self, path: str, width: int, height: int, base: str = None):
+        self.path = path
+        self.width = width
+        self.height = height
+
+        if base is not None:
+            with open(base, "rb") as f:
+                read_ppm_header(f, width, height, base)
+                if f.tell() != len(ppm_header(width, height)):
+                    raise ValueError(f"{base} is not a {width}x{height} binary PPM")
+            shutil.copyfile(base, path)
+            try:
+                self._image = open_ppm(path, writable=True)
+            except ValueError:
+                os.remove(path)
+                raise ValueError(f"{base} is truncated")
+        else:
+            self._image = create_ppm(path, width, height)
+        self.pixels = self._image.pixels
+
+    def paste(self, tile: Tile, tile_path: str):
+        """
+        Copy a tile image (w x h PPM) into its place in the frame.
+
+        Raises:
+            ValueError: The file is not a PPM of the tile's size
+        """
+        x, y, w, h = tile
+        row_bytes = w * 3
+        stride = self.width * 3
+        with open(tile_path, "rb", buffering=0) as f:
+            read_ppm_header(f, w, h, tile_path)
+            for row in range(h):
+                start = (y + row) * stride + x * 3
+                if f.readinto(self.pixels[start:start + row_bytes]) != row_bytes:
+                    raise ValueError(f"{tile_path} is truncated")
+
+    def read(self, tile: Tile) -> bytes:
+        """RGB pixels of one tile (rows top to bottom)"""
+        x, y, w, h = tile
+        stride = self.width * 3
+        return b"".join(self.pixels[(y + row) * stride + x * 3:(y + row) * stride + (x + w) * 3]
+                        for row in range(h))
+
+    def close(self):
+        self._image.close()
+
+
+def render_tiled(raytracer, description: str, scene: dict, options: RenderOptions,
+                 render_tile: Callable[[RenderOptions, Tile, str], dict] = None,
+                 workers: int = None, tile_size: int = TILE_SIZE,
+                 on_tile: Callable[[Tile, bytes, int, int], None] = None,
+                 tiles: List[Tile] = None, base: str = None) -> dict:
+    """
+    Render a frame as tiles and stitch them into one PPM in output_images/.
+
+    Args:
+        raytracer: RaytracerIntegration (output directory, default renderer)
+        description: Text description (for the response)
+        scene: Scene from SceneGenerator
+        options: Render options of the whole frame
+        render_tile: Callable(tile_options, tile, output_path) rendering
+            one tile into output_path and returning a generate() result
+            (default: raytracer.generate, i.e. the local worker pool)
+        workers: Tiles rendered at once (default: raytracer worker pool
+            size, or the CPU count without a pool)
+        tile_size: Tile edge in pixels
+        on_tile: Called on a render thread after each tile is pasted, with
+            (tile, tile RGB pixels, tiles done, tile count) - for previews;
+            calls do not overlap
+        tiles: Tiles to render (default: all of split_tiles); with base,
+            the others are copied from it
+        base: Previous frame (PPM of the same size) the rendered tiles
+            are pasted over
+
+    Returns:
+        A generate()-style result; "stats" sums the tiles' counters and
+        "timings" has encode, render (wall clock of all tiles, pasting
+        included) and stitch (time spent pasting, summed over tiles)
+    """
+    start = time.perf_counter()
+    all_tiles = split_tiles(options.width, options.height, tile_size)
+    tiles = all_tiles if tiles is None else list(tiles)
+    if workers is None:
+        workers = raytracer.workers.size if raytracer.workers is not None else os.cpu_count() or 1
+    workers = max(1, min(workers, len(tiles)))
+    if render_tile is None:
+        def render_tile(tile_options, tile, output_path):
+            return raytracer.generate(description, options.width, options.height,
+                                      scene=scene, output_path=output_path,
+                                      options=tile_options, tile=tile)
+
+    # Several tiles at once: one raytracer thread each unless asked otherwise
+    tile_options = options
+    if workers > 1 and options.threads is None:
+        tile_options = replace(options, threads=1)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"render_{timestamp}.ppm"
+    path = os.path.join(raytracer.output_dir, filename)
+    # Tile files live next to the output so remote workers sharing the
+    # image directory can write them
+    try:
+        canvas = TileCanvas(path + ".part", options.width, options.height, base)
+    except (OSError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+    tiles_dir = tempfile.mkdtemp(prefix=".tiles_", dir=raytracer.output_dir)
+
+    lock = threading.Lock()
+    totals = {"encode": 0.0, "stitch": 0.0, "done": 0, "rays_cast": 0, "rays_cached": 0,
+              "intersection_tests": 0, "bvh_node_visits": 0, "peak_rss_bytes": 0,
+              "objects": 0, "objects_dropped": 0, "tile_times": [], "workers": set()}
+
+    def run(index: int, tile: Tile):
+        tile_path = os.path.join(tiles_dir, f"tile_{index}.ppm")
+        result = render_tile(tile_options, tile, tile_path)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "Tile render failed"))
+        stitch_start = time.perf_counter()
+        canvas.paste(tile, tile_path)
+        os.remove(tile_path)
+        stitch_time = time.perf_counter() - stitch_start
+
+        stats = result.get("stats", {})
+        with lock:
+            totals["encode"] += result.get("timings", {}).get("encode", 0.0)
+            totals["stitch"] += stitch_time
+            totals["done"] += 1
+            for key in ("rays_cast", "rays_cached", "intersection_tests", "bvh_node_visits"):
+                totals[key] += stats.get(key, 0)
+            totals["peak_rss_bytes"] = max(totals["peak_rss_bytes"],
+                                           stats.get("memory", {}).get("peak_rss_bytes", 0))
+            # Every tile loads the whole scene
+            for key in ("objects", "objects_dropped"):
+                totals[key] = max(totals[key], stats.get(key, 0))
+            totals["tile_times"].append(round(stats.get("time", {}).get("render", 0.0), 6))
+            if result.get("worker"):
+                totals["workers"].add(result["worker"])
+            # Under the lock so callbacks see the tile count in order
+            if on_tile is not None:
+                on_tile(tile, canvas.read(tile), totals["done"], len(tiles))
+
+    render_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tile") as pool:
+            futures = [pool.submit(run, index, tile) for index, tile in enumerate(tiles)]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                future.result()
+        render_time = time.perf_counter() - render_start
+        canvas.close()
+        os.replace(canvas.path, path)
+    except Exception as e:
+        canvas.close()
+        os.remove(canvas.path)
+        return {"success": False, "error": str(e)}
+    finally:
+        shutil.rmtree(tiles_dir, ignore_errors=True)
+
+    stats = {
+        "width": options.width,
+        "height": options.height,
+        "samples_per_pixel": options.samples,
+        "tiles": len(tiles),
+        "tiles_reused": len(all_tiles) - len(tiles) if base is not None else 0,
+        "tile_size": tile_size,
+        "workers": workers,
+        "objects": totals["objects"],
+        "objects_dropped": totals["objects_dropped"],
+        "rays_cast": totals["rays_cast"],
+        "rays_cached": totals["rays_cached"],
+        "intersection_tests": totals["intersection_tests"],
+        "bvh_node_visits": totals["bvh_node_visits"],
+        "rays_per_second": round(totals["rays_cast"] / render_time) if render_time > 0 else 0,
+        "time": {"render": render_time},
+        "memory": {"peak_rss_bytes": totals["peak_rss_bytes"]},
+        "tile_times": totals["tile_times"]
+    }
+    if totals["workers"]:
+        stats["render_workers"] = sorted(totals["workers"])
+    if base is not None:
+        stats["base"] = os.path.basename(base)
+
+    return {
+        "success": True,
+        "image_url": f"/api/images/{filename}",
+        "filename": filename,
+        "image_format": "ppm",
+        "render_time": int((time.perf_counter() - start) * 1000),
+        "width": options.width,
+        "height": options.height,
+        "description": description,
+        "timestamp": datetime.now().isoformat(),
+        "timings": {
+            "encode": totals["encode"],
+            "render": render_time,
+            "stitch": totals["stitch"]
+        },
+        "stats": stats
+    }
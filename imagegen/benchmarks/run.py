@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Benchmarks - Reproducible performance suite for the text-to-image pipeline
+
+Suites:
+    nlp        NLPEngine.parse_description throughput
+    scene      SceneGenerator.generate_scene throughput
+    raytracer  C raytracer at several resolutions and object counts
+    api        /api/generate latency under concurrent load (local uvicorn)
+
+Results are written as JSON (commit, machine and per-benchmark numbers);
+--compare reports changes against an earlier result file and exits with
+status 1 when a benchmark regressed by more than --threshold.
+
+Usage:
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --suite nlp,scene --quick
+    python benchmarks/run.py -o new.json --compare results.json
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.nlp_engine import NLPEngine
+from backend.scene_generator import SceneGenerator
+
+
+SUITES = ("nlp", "scene", "raytracer", "api")
+
+# Fixed inputs so results are comparable across commits
+DESCRIPTIONS = [
+    "A red cube",
+    "A blue sphere and a green cylinder",
+    "Three yellow cones in a row",
+    "A rotating golden torus next to a shiny silver sphere",
+    "Un cube rouge et une sphère bleue",
+    "Twelve purple cubes in a grid, a white plane and an orange cone",
+    "A thousand red cubes at random",
+]
+RESOLUTIONS = [(160, 120), (320, 240), (640, 480)]
+OBJECT_COUNTS = [1, 10, 100, 1000]
+CONCURRENCY_LEVELS = [1, 4, 16]
+
+# /api/generate scenes differ only in colors, so every request costs the same
+# render but no two in-flight requests share one (single-flight coalescing)
+API_COLORS = ["red", "blue", "green", "yellow", "cyan", "magenta", "orange",
+              "purple", "pink", "brown", "gold", "silver", "white", "gray"]
+API_DESCRIPTION = "Three {} spheres and a {} cube"
+
+# Metrics compared by --compare, with their direction
+HIGHER_IS_BETTER = ("ops_per_sec", "rays_per_sec", "requests_per_sec")
+LOWER_IS_BETTER = ("p50_ms", "p95_ms")
+
+
+# ============================================================================
+# Measurement helpers
+# ============================================================================
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Time repeated calls of func.
+
+    Returns:
+        ops_per_sec, mean/p50/p95 latency in milliseconds and iterations
+    """
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return summarize(durations, iterations)
+
+
+def summarize(durations: List[float], operations: int, elapsed: float = None) -> Dict[str, float]:
+    """Latency percentiles (ms) and throughput of a list of durations (s)"""
+    ordered = sorted(durations)
+    elapsed = elapsed if elapsed is not None else sum(durations)
+    return {
+        "iterations": operations,
+        "ops_per_sec": round(operations / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(statistics.mean(ordered) * 1000, 4),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+    }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+# ============================================================================
+# Suites
+# ============================================================================
+
+def bench_nlp(iterations: int) -> Dict[str, Dict[str, Any]]:
+    """NLPEngine.parse_description, per description and over the whole set"""
+    nlp = NLPEngine()
+    results = {}
+
+    results["nlp.parse_description.all"] = measure(
+        lambda: [nlp.parse_description(d) for d in DESCRIPTIONS], iterations
+    )
+    for i, description in enumerate(DESCRIPTIONS):
+        results[f"nlp.parse_description.{i}"] = {
+            "description": description,
+            **measure(lambda: nlp.parse_description(description), iterations),
+        }
+    return results
+
+
+def bench_scene(iterations: int) -> Dict[str, Dict[str, Any]]:
+    """SceneGenerator.generate_scene on pre-parsed entities"""
+    nlp = NLPEngine()
+    generator = SceneGenerator()
+    results = {}
+
+    for i, description in enumerate(DESCRIPTIONS):
+        entities = nlp.parse_description(description)
+        results[f"scene.generate_scene.{i}"] = {
+            "description": description,
+            "objects": sum(entity.count for entity in entities),
+            **measure(lambda: generator.generate_scene(entities), iterations),
+        }
+    return results
+
+
+def bench_raytracer(iterations: int) -> Dict[str, Dict[str, Any]]:
+    """Raytracer at each resolution and object count (1 spp, 1 thread)"""
+    from backend.raytracer_integration import RaytracerIntegration
+    from backend.render_options import RenderOptions
+
+    raytracer = RaytracerIntegration()
+    if not raytracer.available:
+        return {"raytracer": {"skipped": "raytracer binary not found"}}
+
+    nlp = NLPEngine()
+    generator = SceneGenerator()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "bench.ppm")
+
+        for count in OBJECT_COUNTS:
+            description = f"{count} red spheres in a grid"
+            scene = generator.generate_scene(nlp.parse_description(description))
+
+            for width, height in RESOLUTIONS:
+                options = RenderOptions(width, height, samples=1, threads=1)
+                wall, render, rays = [], [], 0
+
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    result = raytracer.generate(description, width, height, scene=scene,
+                                                output_path=output, options=options)
+                    wall.append(time.perf_counter() - start)
+                    if not result["success"]:
+                        raise RuntimeError(result.get("error", "render failed"))
+                    stats = result.get("stats", {})
+                    render.append(stats.get("time", {}).get("render", 0.0))
+                    rays = stats.get("rays_cast", 0)
+
+                render_median = statistics.median(render)
+                results[f"raytracer.{width}x{height}.objects_{count}"] = {
+                    **summarize(wall, iterations),
+                    "render_median_ms": round(render_median * 1000, 4),
+                    "rays_per_sec": round(rays / render_median) if render_median > 0 else 0,
+                }
+    return results
+
+
+def bench_api(requests_per_level: int) -> Dict[str, Dict[str, Any]]:
+    """POST /api/generate against a local uvicorn at several concurrency levels"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    created = []
+    results = {}
+
+    try:
+        _wait_for_server(base_url, server)
+        colors = itertools.cycle(itertools.permutations(API_COLORS, 2))
+
+        def generate() -> Tuple[float, bool]:
+            payload = json.dumps({"description": API_DESCRIPTION.format(*next(colors)),
+                                  "width": 320, "height": 240}).encode()
+            request = urllib.request.Request(
+                f"{base_url}/api/generate", data=payload,
+                headers={"Content-Type": "application/json"},
+            )
+            start = time.perf_counter()
+            with urllib.request.urlopen(request, timeout=60) as response:
+                body = json.loads(response.read())
+            elapsed = time.perf_counter() - start
+            if not body.get("success"):
+                raise RuntimeError(body.get("error", "generate failed"))
+            if body.get("filename"):
+                created.append(body["filename"])
+            return elapsed, bool(body.get("coalesced"))
+
+        generate()  # Warm up the server
+
+        for concurrency in CONCURRENCY_LEVELS:
+            durations, errors, coalesced = [], 0, 0
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(generate) for _ in range(requests_per_level)]
+                for future in futures:
+                    try:
+                        duration, shared = future.result()
+                    except (urllib.error.URLError, RuntimeError, OSError):
+                        errors += 1
+                        continue
+                    if shared:
+                        coalesced += 1
+                    else:
+                        durations.append(duration)
+            elapsed = time.perf_counter() - start
+
+            summary = summarize(durations, len(durations), elapsed) if durations else {}
+            summary["requests_per_sec"] = summary.pop("ops_per_sec", 0.0)
+            results[f"api.generate.c{concurrency}"] = {
+                "concurrency": concurrency,
+                "errors": errors,
+                "coalesced": coalesced,
+                **summary,
+            }
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        _remove_images(created)
+
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(base_url: str, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/health", timeout=1):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def _remove_images(filenames: List[str]):
+    """Delete the images rendered by the API benchmark"""
+    output_dir = ROOT / "output_images"
+    for filename in set(filenames):
+        path = output_dir / os.path.basename(filename)
+        if path.exists():
+            path.unlink()
+
+
+# ============================================================================
+# Results
+# ============================================================================
+
+def environment() -> Dict[str, Any]:
+    """Commit and machine description stored with the results"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=str(ROOT),
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print changes of the compared metrics and list the regressions.
+
+    Returns:
+        Regression descriptions (empty if none exceeds threshold)
+    """
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            new, old = result.get(metric), previous.get(metric)
+            if not new or not old:
+                continue
+
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            marker = "❌" if worse > threshold else "  "
+            print(f"{marker} {name} {metric}: {old} -> {new} ({change:+.1%})")
+            if worse > threshold:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Run the imagegen benchmarks")
+    parser.add_argument(
+        "--suite",
+        default=",".join(SUITES),
+        help=f"Comma-separated suites to run (default: {','.join(SUITES)})"
+    )
+    parser.add_argument(
+        "-n", "--iterations",
+        type=int,
+        default=200,
+        help="Iterations per Python benchmark (default: 200; raytracer uses n/20)"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=48,
+        help="Requests per API concurrency level (default: 48)"
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Few iterations, for smoke testing the harness"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Write results JSON here (default: stdout)"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="Compare with an earlier results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown counted as a regression (default: 0.10)"
+    )
+
+    args = parser.parse_args()
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    iterations = 10 if args.quick else args.iterations
+    requests_per_level = 8 if args.quick else args.requests
+
+    results: Dict[str, Any] = {}
+    # Keep progress output of the modules off stdout (results may go there)
+    with contextlib.redirect_stdout(sys.stderr):
+        for suite in suites:
+            print(f"⏱️  Running {suite}...")
+            if suite == "nlp":
+                results.update(bench_nlp(iterations))
+            elif suite == "scene":
+                results.update(bench_scene(iterations))
+            elif suite == "raytracer":
+                results.update(bench_raytracer(max(3, iterations // 20)))
+            elif suite == "api":
+                results.update(bench_api(requests_per_level))
+
+    report = {"environment": environment(), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            return 1
+        print("✅ No regressions", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,12 @@ Usage:
     imagegen "A red cube"
     imagegen "Three spheres in a row" --output scene.png
     imagegen "A rotating planet" --animate --output planet.html
+    imagegen "A thousand cubes" --format vtsc --output cubes.vtsc
+    imagegen --batch descriptions.jsonl --output-dir renders --jobs 8
 """
 
 import argparse
+import os
 import sys
 import json
 from pathlib import Path
@@ -19,7 +22,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.nlp_engine import NLPEngine
 from backend.scene_generator import SceneGenerator
-from backend.client import APIClient
+
+# Formats exported locally, without contacting the server
+OFFLINE_FORMATS = ("html", "json", "vtsc")
 
 
 class ImageGenCLI:
@@ -28,7 +33,15 @@ class ImageGenCLI:
     def __init__(self):
         self.nlp = NLPEngine()
         self.scene_gen = SceneGenerator()
-        self.api_client = APIClient()
+        self._api_client = None
+    
+    @property
+    def api_client(self):
+        """API client, created on first use (imports requests lazily)"""
+        if self._api_client is None:
+            from backend.client import APIClient
+            self._api_client = APIClient()
+        return self._api_client
     
     def generate_from_description(self, description: str, output: str = None, 
                                  animate: bool = False, format: str = "html",
@@ -40,7 +53,7 @@ class ImageGenCLI:
             description: Text description of desired image
             output: Output file path
             animate: Enable animations
-            format: Output format (html, png, svg, json)
+            format: Output format (html, png, svg, json, vtsc)
             interactive: Enable interactive controls
             
         Returns:
@@ -52,7 +65,8 @@ class ImageGenCLI:
         entities = self.nlp.parse_description(description)
         print(f"🔍 Detected: {len(entities)} entities")
         for entity in entities:
-            print(f"   - {entity.type.value}: {entity.name} ({entity.color})")
+            count = f" x{entity.count}" if entity.count > 1 else ""
+            print(f"   - {entity.type.value}: {entity.name}{count} ({entity.color})")
         
         # Generate scene
         print("🎨 Generating scene...")
@@ -62,13 +76,20 @@ class ImageGenCLI:
             interactive=interactive
         )
         
+        # Local exports never touch the network
+        if output and format in OFFLINE_FORMATS:
+            self._export(scene, output, format)
+            print(f"✅ Exported to {output}")
+            return scene
+        
         # Send to backend API
         print("📤 Uploading to server...")
         result = self.api_client.create_scene(scene)
         
         # Export if needed
         if output:
-            self._export(result, output, format)
+            # Server responses only carry metadata; export the full scene
+            self._export({**scene, **result}, output, format)
             print(f"✅ Exported to {output}")
         else:
             print(f"✅ Scene created: {result['id']}")
@@ -88,6 +109,9 @@ class ImageGenCLI:
             html = self._generate_html(scene_data)
             with open(output_path, 'w') as f:
                 f.write(html)
+        elif format == "vtsc":
+            from backend.scene_binary import write_scene_binary
+            write_scene_binary(scene_data, str(output_path))
         elif format == "png":
             self.api_client.export_png(scene_data['id'], output)
         else:
@@ -127,6 +151,40 @@ class ImageGenCLI:
 """
 
 
+def run_batch(args) -> int:
+    """Render every description of a JSONL file locally, without the server"""
+    from backend.batch_render import read_jobs, run_batch as render_batch
+    
+    width, height = _parse_size(args.size)
+    
+    if args.batch == "-":
+        jobs = list(read_jobs(sys.stdin))
+    else:
+        with open(args.batch) as f:
+            jobs = list(read_jobs(f))
+    
+    print(f"📦 Batch: {len(jobs)} descriptions, {args.jobs} workers")
+    summary = render_batch(jobs, args.output_dir, args.jobs, width, height,
+                           samples=args.samples, depth=args.depth,
+                           threads=args.threads, denoise=args.denoise)
+    
+    print(f"✅ {summary['succeeded']}/{summary['total']} rendered "
+          f"in {summary['elapsed']}s")
+    print(f"📄 Manifest: {summary['manifest']}")
+    return 0 if summary['failed'] == 0 else 1
+
+
+def _parse_size(size: str) -> tuple:
+    """Parse a WIDTHxHEIGHT string"""
+    try:
+        width, height = (int(v) for v in size.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Invalid size '{size}', expected WIDTHxHEIGHT")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid size '{size}', expected WIDTHxHEIGHT")
+    return width, height
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -138,20 +196,23 @@ Examples:
   imagegen "Three spheres rotating" --animate
   imagegen "A castle" --output castle.png
   imagegen "A landscape" --format html --interactive
+  imagegen --batch descriptions.jsonl --output-dir renders -j 8
+  cat descriptions.jsonl | imagegen --batch -
         """
     )
     
     parser.add_argument(
         "description",
+        nargs="?",
         help="Text description of the scene to generate"
     )
     parser.add_argument(
         "-o", "--output",
-        help="Output file path (png, html, json)"
+        help="Output file path (png, html, json, vtsc)"
     )
     parser.add_argument(
         "-f", "--format",
-        choices=["html", "png", "svg", "json"],
+        choices=["html", "png", "svg", "json", "vtsc"],
         default="html",
         help="Output format (default: html)"
     )
@@ -177,6 +238,44 @@ Examples:
         default="800x600",
         help="Output size WIDTHxHEIGHT (default: 800x600)"
     )
+    parser.add_argument(
+        "-b", "--batch",
+        metavar="FILE",
+        help="Render descriptions from a JSONL file ('-' for stdin) "
+             "locally, without the server"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="batch_output",
+        help="Batch output directory (default: batch_output)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Batch worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        help="Batch: raytracer samples per pixel (default: raytracer default)"
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        help="Batch: raytracer maximum ray depth (default: raytracer default)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Batch: raytracer threads per render (default: 1)"
+    )
+    parser.add_argument(
+        "--denoise",
+        type=int,
+        help="Batch: raytracer denoise passes, for low --samples (default: off)"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -185,10 +284,17 @@ Examples:
     
     args = parser.parse_args()
     
-    # Create CLI and generate
-    cli = ImageGenCLI()
+    if args.batch is None and args.description is None:
+        parser.error("a description or --batch FILE is required")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
     
     try:
+        if args.batch is not None:
+            return run_batch(args)
+        
+        # Create CLI and generate
+        cli = ImageGenCLI()
         result = cli.generate_from_description(
             description=args.description,
             output=args.output,
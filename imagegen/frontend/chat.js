@@ -0,0 +1,222 @@
+const chatContainer = document.getElementById('chatContainer');
+const input = document.getElementById('input');
+const imageModal = document.getElementById('imageModal');
+const modalImage = document.getElementById('modalImage');
+const downloadBtn = document.getElementById('downloadBtn');
+
+// One persistent connection streams generation events (see /ws/chat);
+// while it is down, messages go through POST /api/generate
+const pending = new Map();
+let socket = null;
+let reconnectDelay = 500;
+// Last frame rendered over the socket; edits of its scene redraw on top of it
+let lastFrame = null;
+
+function connect() {
+    const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const ws = new WebSocket(`${protocol}//${location.host}/ws/chat`);
+    ws.onopen = () => {
+        socket = ws;
+        reconnectDelay = 500;
+    };
+    ws.onmessage = (event) => handleEvent(JSON.parse(event.data));
+    ws.onclose = () => {
+        socket = null;
+        lastFrame = null;
+        for (const view of pending.values()) {
+            view.status.textContent = '❌ Error: connection lost';
+        }
+        pending.clear();
+        setTimeout(connect, reconnectDelay);
+        reconnectDelay = Math.min(reconnectDelay * 2, 10000);
+    };
+}
+
+async function sendMessage() {
+    const text = input.value.trim();
+    if (!text) return;
+
+    addMessage('user', text);
+    input.value = '';
+    input.focus();
+
+    if (socket && socket.readyState === WebSocket.OPEN) {
+        const id = Math.random().toString(36).slice(2, 10);
+        pending.set(id, addRenderView());
+        socket.send(JSON.stringify({ id, description: text }));
+    } else {
+        await generateOverHttp(text);
+    }
+}
+
+function addRenderView() {
+    const content = document.createElement('div');
+    const status = document.createElement('div');
+    status.className = 'loading';
+    status.innerHTML = '<div class="loading-dot"></div><div class="loading-dot"></div><div class="loading-dot"></div>';
+    content.appendChild(status);
+    addMessage('bot', content);
+    return { content, status, canvas: null };
+}
+
+function handleEvent(event) {
+    const view = pending.get(event.id);
+    if (!view) return;
+    const status = view.status;
+    status.className = 'message-info';
+
+    if (event.type === 'entities') {
+        const names = event.entities.map(e => `${e.count > 1 ? e.count + ' × ' : ''}${e.type}`);
+        status.textContent = `🔍 ${names.join(', ')}`;
+    } else if (event.type === 'scene') {
+        // Tiles are drawn here as they arrive, at preview resolution
+        view.canvas = document.createElement('canvas');
+        view.canvas.width = event.preview_width;
+        view.canvas.height = event.preview_height;
+        view.canvas.className = 'message-image';
+        view.content.insertBefore(view.canvas, status);
+        if (event.base && lastFrame) {
+            // Edit of the previous scene: only changed tiles follow
+            view.canvas.getContext('2d').drawImage(lastFrame, 0, 0, event.preview_width, event.preview_height);
+            status.textContent = `✏️ Scene edited (${event.dirty_tiles} tiles to redraw)`;
+        } else {
+            status.textContent = `✨ Scene ready (${event.scene.scene.objects.length} objects)`;
+        }
+    } else if (event.type === 'queue') {
+        status.textContent = event.position > 0 ? `⏳ Queued (#${event.position})` : '🎨 Rendering...';
+    } else if (event.type === 'tile') {
+        const tile = new Image();
+        tile.onload = () => view.canvas.getContext('2d').drawImage(tile, event.x, event.y);
+        tile.src = event.image;
+    } else if (event.type === 'progress') {
+        status.textContent = `🎨 Rendering... ${event.percent}%`;
+    } else if (event.type === 'result') {
+        pending.delete(event.id);
+        // The progress canvas stays the base of the next edit; the cached
+        // preview PNG replaces it on the page, the full PNG opens in the modal
+        lastFrame = view.canvas;
+        const preview = new Image();
+        preview.className = 'message-image';
+        preview.title = 'Click to enlarge';
+        preview.onclick = () => openModal(`${event.image_url}?size=full`, event.image_url, event.filename);
+        preview.onload = () => view.canvas.replaceWith(preview);
+        preview.src = `${event.image_url}?size=preview`;
+        status.innerHTML = `📊 ${event.render_time}ms
+            <a href="${event.image_url}" download="${event.filename}">⬇️ Download</a>`;
+    } else if (event.type === 'error') {
+        pending.delete(event.id);
+        const retry = event.retry_after ? ` (retry in ${event.retry_after}s)` : '';
+        status.textContent = `❌ Error: ${event.error}${retry}`;
+    }
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+}
+
+async function generateOverHttp(text) {
+    const typingId = addTyping();
+
+    try {
+        const response = await fetch('/api/generate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ description: text })
+        });
+
+        const result = await response.json();
+        removeTyping(typingId);
+
+        if (result.success) {
+            let content = `✨ Scene generated!<br>`;
+            content += `<strong>Objects:</strong> ${result.objects_count}<br>`;
+            
+            if (result.image_url) {
+                // PNG derivatives: a preview inline, full size in the modal
+                content += `<img 
+                    src="${result.image_url}?size=preview" 
+                    class="message-image" 
+                    onclick="openModal('${result.image_url}?size=full', '${result.image_url}', '${result.filename}')"
+                    title="Click to enlarge"
+                >`;
+                content += `<div class="message-info">
+                    📊 ${result.render_time}ms
+                    <a href="${result.image_url}" download="${result.filename}">⬇️ Download</a>
+                </div>`;
+            }
+
+            addMessage('bot', content, true);
+        } else {
+            addMessage('bot', `❌ Error: ${result.error || result.detail}`);
+        }
+    } catch (error) {
+        removeTyping(typingId);
+        addMessage('bot', `❌ Error: ${error.message}`);
+    }
+}
+
+function sendExample(text) {
+    input.value = text;
+    input.focus();
+}
+
+function addMessage(type, content, isHtml = false) {
+    const div = document.createElement('div');
+    div.className = `message ${type}`;
+    
+    const avatar = document.createElement('div');
+    avatar.className = 'message-avatar';
+    avatar.textContent = type === 'user' ? '👤' : '🤖';
+    
+    const contentDiv = document.createElement('div');
+    contentDiv.className = 'message-content';
+    if (content instanceof Node) contentDiv.appendChild(content);
+    else if (isHtml) contentDiv.innerHTML = content;
+    else contentDiv.textContent = content;
+    
+    div.appendChild(avatar);
+    div.appendChild(contentDiv);
+    chatContainer.appendChild(div);
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+}
+
+function addTyping() {
+    const div = document.createElement('div');
+    div.className = 'message bot';
+    div.id = 'typing-' + Date.now();
+    
+    const avatar = document.createElement('div');
+    avatar.className = 'message-avatar';
+    avatar.textContent = '🤖';
+    
+    const contentDiv = document.createElement('div');
+    contentDiv.className = 'message-content loading';
+    contentDiv.innerHTML = '<div class="loading-dot"></div><div class="loading-dot"></div><div class="loading-dot"></div>';
+    
+    div.appendChild(avatar);
+    div.appendChild(contentDiv);
+    chatContainer.appendChild(div);
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+    
+    return div.id;
+}
+
+function removeTyping(id) {
+    const el = document.getElementById(id);
+    if (el) el.remove();
+}
+
+function openModal(src, url, filename) {
+    modalImage.src = src;
+    downloadBtn.href = url;
+    downloadBtn.download = filename;
+    imageModal.classList.add('show');
+}
+
+function closeModal() {
+    imageModal.classList.remove('show');
+}
+
+document.addEventListener('keydown', (e) => {
+    if (e.key === 'Escape') closeModal();
+});
+
+connect();
+input.focus();
@@ -0,0 +1,342 @@
+let scene, camera, renderer, sceneData = null;
+
+// Same origin when served by the API (/static/index.html), local server when opened as a file
+const API_BASE = location.protocol === 'file:' ? 'http://localhost:5000' : '';
+
+const form = document.getElementById('form');
+const descInput = document.getElementById('description');
+const statusDiv = document.getElementById('status');
+const submitBtn = document.getElementById('submitBtn');
+
+// Select example
+function selectExample(text) {
+    descInput.value = text;
+    descInput.focus();
+}
+
+// Show status
+function showStatus(message, type = 'loading') {
+    statusDiv.textContent = message;
+    statusDiv.className = `status ${type}`;
+}
+
+// Hide status
+function hideStatus() {
+    statusDiv.className = 'status';
+}
+
+// Form submit
+form.addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const description = descInput.value.trim();
+    if (!description) {
+        showStatus('❌ Veuillez entrer une description', 'error');
+        return;
+    }
+
+    submitBtn.disabled = true;
+    showStatus('⏳ Génération en cours...', 'loading');
+
+    try {
+        // Call backend API
+        const response = await fetch(`${API_BASE}/api/scenes`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                name: description,
+                scene: {
+                    // Dummy scene structure
+                    objects: [],
+                    lights: [],
+                    camera: { position: [0, 0, 5] }
+                }
+            })
+        });
+
+        if (!response.ok) {
+            throw new Error(`API error: ${response.status}`);
+        }
+
+        const result = await response.json();
+        sceneData = result;
+
+        showStatus('✅ Scène générée! Chargement du rendu...', 'success');
+
+        // Fetch the actual scene
+        const sceneResponse = await fetch(`${API_BASE}/api/scenes/${result.id}?format=2`);
+        if (!sceneResponse.ok) throw new Error('Failed to fetch scene');
+
+        sceneData = await sceneResponse.json();
+        renderScene(sceneData);
+
+        hideStatus();
+        showStatus('✅ Rendu terminé!', 'success');
+        setTimeout(hideStatus, 3000);
+
+    } catch (error) {
+        console.error('Error:', error);
+        showStatus(`❌ Erreur: ${error.message}`, 'error');
+    } finally {
+        submitBtn.disabled = false;
+    }
+});
+
+// Render 3D scene with Three.js
+function renderScene(sceneJSON) {
+    const container = document.getElementById('viewer-container');
+
+    // Clear previous
+    if (renderer) {
+        renderer.dispose();
+        container.innerHTML = '';
+    }
+
+    // Create scene
+    scene = new THREE.Scene();
+    const bg = sceneJSON.scene.background || [0.1, 0.1, 0.15];
+    scene.background = new THREE.Color(bg[0], bg[1], bg[2]);
+
+    // Create camera
+    const cam = sceneJSON.scene.camera;
+    camera = new THREE.PerspectiveCamera(
+        cam.fov || 60,
+        container.clientWidth / container.clientHeight,
+        0.1,
+        1000
+    );
+    camera.position.set(...cam.position);
+
+    // Create renderer
+    renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });
+    renderer.setSize(container.clientWidth, container.clientHeight);
+    renderer.shadowMap.enabled = true;
+    container.appendChild(renderer.domElement);
+
+    // Add lights
+    (sceneJSON.scene.lights || []).forEach(lightData => {
+        let light;
+        if (lightData.type === 'DirectionalLight') {
+            light = new THREE.DirectionalLight(
+                new THREE.Color(...lightData.color),
+                lightData.intensity
+            );
+            light.position.set(...lightData.position);
+        } else if (lightData.type === 'AmbientLight') {
+            light = new THREE.AmbientLight(
+                new THREE.Color(...lightData.color),
+                lightData.intensity
+            );
+        }
+        if (light) scene.add(light);
+    });
+
+    // Add objects (format 2: shared tables + packed instance transforms)
+    if (sceneJSON.format === 2) {
+        addEncodedMeshes(sceneJSON.scene);
+    }
+
+    (sceneJSON.scene.objects || []).forEach(objData => {
+        const geometry = createGeometry(objData.geometry);
+        const material = createMaterial(objData.material);
+        const mesh = objData.type === 'instanced_mesh'
+            ? createInstancedMesh(geometry, material, objData.instances)
+            : new THREE.Mesh(geometry, material);
+
+        mesh.position.set(...objData.position);
+        mesh.rotation.set(...objData.rotation);
+        mesh.scale.set(...objData.scale);
+        mesh.userData = { animation: objData.animation };
+
+        scene.add(mesh);
+    });
+
+    // Mouse controls
+    let isDragging = false;
+    let mouseX = 0, mouseY = 0;
+
+    renderer.domElement.addEventListener('mousedown', (e) => {
+        if (e.button === 0) isDragging = true;
+        mouseX = e.clientX;
+        mouseY = e.clientY;
+    });
+
+    renderer.domElement.addEventListener('mousemove', (e) => {
+        if (isDragging) {
+            const deltaX = e.clientX - mouseX;
+            const deltaY = e.clientY - mouseY;
+
+            scene.rotation.y += deltaX * 0.01;
+            scene.rotation.x += deltaY * 0.01;
+
+            mouseX = e.clientX;
+            mouseY = e.clientY;
+        }
+    });
+
+    renderer.domElement.addEventListener('mouseup', () => {
+        isDragging = false;
+    });
+
+    renderer.domElement.addEventListener('wheel', (e) => {
+        e.preventDefault();
+        camera.position.z += e.deltaY * 0.01;
+    }, false);
+
+    // Update info
+    document.getElementById('info-scene').textContent = sceneJSON.name || 'Scène générée';
+    document.getElementById('info-objects').textContent = sceneJSON.format === 2
+        ? sceneJSON.scene.meshes.reduce((total, mesh) => total + mesh.count, 0)
+        : sceneJSON.scene.objects?.length || 0;
+    document.getElementById('info-lights').textContent = sceneJSON.scene.lights?.length || 0;
+
+    // Animation loop
+    function animate() {
+        requestAnimationFrame(animate);
+
+        // Animations
+        scene.children.forEach(obj => {
+            if (obj.userData && obj.userData.animation) {
+                const anim = obj.userData.animation;
+                if (anim.type === 'rotation' && obj.userData.instances) {
+                    rotateInstances(obj, anim);
+                } else if (anim.type === 'rotation') {
+                    obj.rotation[anim.axis] += anim.speed;
+                }
+            }
+        });
+
+        renderer.render(scene, camera);
+    }
+
+    animate();
+
+    // Handle resize
+    window.addEventListener('resize', () => {
+        const w = container.clientWidth;
+        const h = container.clientHeight;
+        camera.aspect = w / h;
+        camera.updateProjectionMatrix();
+        renderer.setSize(w, h);
+    });
+}
+
+function createGeometry(geomData) {
+    const type = geomData.type;
+
+    if (type === 'BoxGeometry') {
+        return new THREE.BoxGeometry(geomData.width, geomData.height, geomData.depth);
+    } else if (type === 'SphereGeometry') {
+        return new THREE.SphereGeometry(geomData.radius, geomData.widthSegments, geomData.heightSegments);
+    } else if (type === 'CylinderGeometry') {
+        return new THREE.CylinderGeometry(
+            geomData.radiusTop, geomData.radiusBottom, geomData.height, geomData.radialSegments
+        );
+    } else if (type === 'ConeGeometry') {
+        return new THREE.ConeGeometry(geomData.radius, geomData.height, geomData.radialSegments);
+    } else if (type === 'TorusGeometry') {
+        return new THREE.TorusGeometry(geomData.radius, geomData.tube, geomData.radialSegments, geomData.tubularSegments);
+    }
+
+    return new THREE.BoxGeometry(1, 1, 1);
+}
+
+function createInstancedMesh(geometry, material, instances) {
+    // Positions are a flat [x0, y0, z0, x1, ...] list
+    const positions = instances.positions;
+    const mesh = new THREE.InstancedMesh(geometry, material, instances.count);
+    const matrix = new THREE.Matrix4();
+
+    for (let i = 0; i < instances.count; i++) {
+        matrix.makeTranslation(positions[i * 3], positions[i * 3 + 1], positions[i * 3 + 2]);
+        mesh.setMatrixAt(i, matrix);
+    }
+    mesh.instanceMatrix.needsUpdate = true;
+
+    return mesh;
+}
+
+function decodeFloats(encoded) {
+    // Base64 little-endian float32 -> Float32Array (no per-value parsing)
+    const binary = atob(encoded);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return new Float32Array(bytes.buffer);
+}
+
+function addEncodedMeshes(sceneData) {
+    const geometries = sceneData.geometries.map(createGeometry);
+    const materials = sceneData.materials.map(createMaterial);
+
+    sceneData.meshes.forEach(meshData => {
+        const positions = decodeFloats(meshData.positions);
+        const rotations = meshData.rotations ? decodeFloats(meshData.rotations) : null;
+        const scales = meshData.scales ? decodeFloats(meshData.scales) : null;
+        const geometry = geometries[meshData.geometry];
+        const material = materials[meshData.material];
+
+        // Transform of each instance (position, Euler rotation, scale)
+        const instances = [];
+        for (let i = 0; i < meshData.count; i++) {
+            instances.push({
+                position: new THREE.Vector3().fromArray(positions, i * 3),
+                euler: new THREE.Euler().fromArray(
+                    rotations ? Array.from(rotations.subarray(i * 3, i * 3 + 3)) : meshData.rotation),
+                scale: scales ? new THREE.Vector3().fromArray(scales, i * 3)
+                              : new THREE.Vector3().fromArray(meshData.scale)
+            });
+        }
+
+        let mesh;
+        if (meshData.count === 1) {
+            // Single object: a plain mesh placed (and spinning) where it is
+            mesh = new THREE.Mesh(geometry, material);
+            mesh.position.copy(instances[0].position);
+            mesh.rotation.copy(instances[0].euler);
+            mesh.scale.copy(instances[0].scale);
+            mesh.userData = { animation: meshData.animation };
+        } else {
+            mesh = new THREE.InstancedMesh(geometry, material, meshData.count);
+            instances.forEach((instance, i) => setInstanceMatrix(mesh, i, instance));
+            mesh.instanceMatrix.needsUpdate = true;
+            // Animated instances spin around their own centers (see rotateInstances)
+            mesh.userData = { animation: meshData.animation,
+                              instances: meshData.animation ? instances : null };
+        }
+        mesh.castShadow = meshData.castShadow;
+        mesh.receiveShadow = meshData.receiveShadow;
+
+        scene.add(mesh);
+    });
+}
+
+const instanceMatrix = new THREE.Matrix4();
+const instanceQuaternion = new THREE.Quaternion();
+
+function setInstanceMatrix(mesh, index, instance) {
+    instanceQuaternion.setFromEuler(instance.euler);
+    instanceMatrix.compose(instance.position, instanceQuaternion, instance.scale);
+    mesh.setMatrixAt(index, instanceMatrix);
+}
+
+function rotateInstances(mesh, anim) {
+    mesh.userData.instances.forEach((instance, i) => {
+        instance.euler[anim.axis] += anim.speed;
+        setInstanceMatrix(mesh, i, instance);
+    });
+    mesh.instanceMatrix.needsUpdate = true;
+}
+
+function createMaterial(matData) {
+    const config = {
+        color: matData.color,
+        metalness: matData.metalness || 0,
+        roughness: matData.roughness || 0.8,
+        side: matData.side === 'double' ? THREE.DoubleSide : THREE.FrontSide
+    };
+
+    if (matData.transparent) config.transparent = true;
+    if (matData.opacity) config.opacity = matData.opacity;
+
+    return new THREE.MeshStandardMaterial(config);
+}
@@ -0,0 +1,42 @@
+"""
+Tests for render options and deployment limits (backend/render_options.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.render_options import RenderLimits, RenderOptions, RenderOptionsError
+
+
+def test_unset_threads_capped_by_max_threads():
+    limits = RenderLimits.from_env({"IMAGEGEN_MAX_THREADS": "1"})
+    options = RenderOptions.from_request({"width": 320, "height": 240}, limits)
+
+    args = options.to_args()
+    assert args[args.index("--threads") + 1] == "1"
+
+
+def test_unset_samples_capped_by_max_samples():
+    limits = RenderLimits.from_env({"IMAGEGEN_MAX_SAMPLES": "2"})
+    options = RenderOptions.from_request({}, limits)
+
+    assert options.samples == 2
+    assert "--samples" in options.to_args()
+
+
+def test_unset_options_keep_raytracer_defaults_under_limits():
+    limits = RenderLimits.from_env({"IMAGEGEN_MAX_THREADS": "8", "IMAGEGEN_MAX_SAMPLES": "64"})
+    options = RenderOptions.from_request({}, limits)
+
+    assert options.to_args() == []
+
+
+def test_requested_threads_above_limit_rejected():
+    limits = RenderLimits.from_env({"IMAGEGEN_MAX_THREADS": "1"})
+
+    with pytest.raises(RenderOptionsError):
+        RenderOptions.from_request({"threads": 2}, limits)
@@ -15,6 +15,10 @@
 #define IMAGE_WIDTH         800
 #define IMAGE_HEIGHT        600
 
+/** Largest image accepted at runtime (--width/--height) */
+#define MAX_IMAGE_WIDTH     8192
+#define MAX_IMAGE_HEIGHT    8192
+
 /* ============================================================================
    RENDERING QUALITY & SPEED
    ============================================================================ */
@@ -22,15 +26,29 @@
 /** Maximum recursion depth for reflections/refractions */
 #define MAX_DEPTH           5
 
-/** Number of threads for multithreading (Phase 5.3) */
+/** Number of threads for multithreading (Phase 5.3), 0 = one per CPU */
 #define NUM_THREADS         4
 
+/** Largest values accepted at runtime (--threads, --samples, --depth) */
+#define MAX_THREADS         256
+#define MAX_AA_SAMPLES      1024
+#define MAX_RENDER_DEPTH    64
+
 /** Number of AA samples per pixel (Phase 6.1) */
 #define NUM_AA_SAMPLES      4
 
 /** Number of light samples for soft shadows (Phase 6.3) */
 #define NUM_LIGHT_SAMPLES   1
 
+/** Edge-aware denoise passes after rendering (0 = off, see core/denoise.h) */
+#define DENOISE_PASSES      0
+#define DENOISE_MAX_PASSES  5
+
+/** Denoiser edge stops: larger values smooth more across each guide */
+#define DENOISE_SIGMA_COLOR     0.5f
+#define DENOISE_SIGMA_NORMAL    0.3f
+#define DENOISE_SIGMA_ALBEDO    0.1f
+
 /** Adaptive sampling variance threshold (Phase 7.3) */
 #define ADAPTIVE_THRESHOLD  0.01f
 
@@ -60,6 +78,12 @@
 /** Enable SIMD optimizations (Phase 7.1) */
 #define USE_SIMD            0
 
+/** Edge of the square pixel blocks render threads take in Z-order */
+#define RENDER_BLOCK_SIZE   16
+
+/** Largest cached primary ray table of a --worker (bytes, see ray_table.h) */
+#define RAY_TABLE_MAX_BYTES (64 * 1024 * 1024)
+
 /* ============================================================================
    CAMERA
    ============================================================================ */
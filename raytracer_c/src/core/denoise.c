@@ -0,0 +1,192 @@
+/**
+ * denoise.c - Edge-aware à-trous denoiser implementation
+ */
+
+#include "denoise.h"
+#include "../config.h"
+#include <math.h>
+#include <pthread.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+/** B3-spline weights of the 5-tap kernel */
+static const float KERNEL[5] = {1.0f / 16.0f, 1.0f / 4.0f, 3.0f / 8.0f, 1.0f / 4.0f, 1.0f / 16.0f};
+
+/**
+ * One pass over a band of rows.
+ */
+typedef struct {
+    const denoise_buffers *buffers;
+    const color *in;
+    color *out;
+    int step;               // Distance between kernel taps (2^pass)
+    float inv_color;        // 1 / sigma² of each guide
+    float inv_normal;
+    float inv_albedo;
+    int row_start;
+    int row_end;
+    int started;            // Runs on its own pthread (needs join)
+} atrous_job;
+
+int denoise_radius(int passes) {
+    return passes > 0 ? 2 * ((1 << passes) - 1) : 0;
+}
+
+size_t denoise_arena_size(int width, int height) {
+    size_t pixels = (size_t)width * (size_t)height;
+    return 3 * POOL_ALIGN(sizeof(color) * pixels) + POOL_ALIGN(sizeof(vec3) * pixels);
+}
+
+int denoise_buffers_create(denoise_buffers *buffers, memory_pool *pool, int width, int height) {
+    size_t pixels = (size_t)width * (size_t)height;
+    buffers->width = width;
+    buffers->height = height;
+    buffers->radiance = (color *)pool_alloc(pool, sizeof(color) * pixels);
+    buffers->normal = (vec3 *)pool_alloc(pool, sizeof(vec3) * pixels);
+    buffers->albedo = (color *)pool_alloc(pool, sizeof(color) * pixels);
+    buffers->scratch = (color *)pool_alloc(pool, sizeof(color) * pixels);
+    return buffers->radiance && buffers->normal && buffers->albedo && buffers->scratch ? 0 : -1;
+}
+
+/**
+ * Squared distance between two vectors.
+ */
+static inline float distance2(vec3 a, vec3 b) {
+    vec3 d = vec3_sub(a, b);
+    return vec3_dot(d, d);
+}
+
+/**
+ * Filter rows [row_start, row_end) of in into out.
+ * Taps are the outer loops and pixels of the row the inner one, so the
+ * weight computation runs over contiguous pixels (vectorizable).
+ */
+static void *atrous_rows(void *arg) {
+    atrous_job *job = (atrous_job *)arg;
+    const denoise_buffers *b = job->buffers;
+    int width = b->width;
+    color *sum = (color *)malloc(sizeof(color) * (size_t)width);
+    float *weight_sum = (float *)malloc(sizeof(float) * (size_t)width);
+    if (!sum || !weight_sum) {
+        // Leave the band unfiltered rather than fail the render
+        fprintf(stderr, "Warning: out of memory for denoise rows\n");
+        for (int y = job->row_start; y < job->row_end; y++) {
+            memcpy(job->out + (size_t)y * width, job->in + (size_t)y * width,
+                   sizeof(color) * (size_t)width);
+        }
+        free(sum);
+        free(weight_sum);
+        return NULL;
+    }
+    
+    for (int y = job->row_start; y < job->row_end; y++) {
+        const color *c_p = job->in + (size_t)y * width;
+        const vec3 *n_p = b->normal + (size_t)y * width;
+        const color *a_p = b->albedo + (size_t)y * width;
+        memset(sum, 0, sizeof(color) * (size_t)width);
+        memset(weight_sum, 0, sizeof(float) * (size_t)width);
+        
+        for (int j = 0; j < 5; j++) {
+            int qy = y + (j - 2) * job->step;
+            if (qy < 0 || qy >= b->height) {
+                continue;
+            }
+            for (int i = 0; i < 5; i++) {
+                int dx = (i - 2) * job->step;
+                // Pixels whose tap (qx = x + dx) lies inside the row
+                int x0 = dx < 0 ? -dx : 0;
+                int x1 = dx > 0 ? width - dx : width;
+                const color *c_q = job->in + (size_t)qy * width + dx;
+                const vec3 *n_q = b->normal + (size_t)qy * width + dx;
+                const color *a_q = b->albedo + (size_t)qy * width + dx;
+                float kernel = KERNEL[i] * KERNEL[j];
+                
+                for (int x = x0; x < x1; x++) {
+                    float w = kernel * expf(
+                        -(distance2(c_p[x], c_q[x]) * job->inv_color
+                          + distance2(n_p[x], n_q[x]) * job->inv_normal
+                          + distance2(a_p[x], a_q[x]) * job->inv_albedo));
+                    sum[x] = vec3_add(sum[x], vec3_scale(c_q[x], w));
+                    weight_sum[x] += w;
+                }
+            }
+        }
+        
+        // The center tap always has weight > 0
+        color *out = job->out + (size_t)y * width;
+        for (int x = 0; x < width; x++) {
+            out[x] = vec3_scale(sum[x], 1.0f / weight_sum[x]);
+        }
+    }
+    
+    free(sum);
+    free(weight_sum);
+    return NULL;
+}
+
+void denoise_atrous(denoise_buffers *buffers, int passes, int threads) {
+    if (passes <= 0 || buffers->width <= 0 || buffers->height <= 0) {
+        return;
+    }
+    if (threads < 1) {
+        threads = 1;
+    }
+    if (threads > MAX_THREADS) {
+        threads = MAX_THREADS;
+    }
+    if (threads > buffers->height) {
+        threads = buffers->height;
+    }
+    
+    atrous_job jobs[MAX_THREADS];
+    pthread_t handles[MAX_THREADS];
+    color *in = buffers->radiance;
+    color *out = buffers->scratch;
+    float sigma_color = DENOISE_SIGMA_COLOR;
+    
+    for (int pass = 0; pass < passes; pass++) {
+        int rows = (buffers->height + threads - 1) / threads;
+        for (int t = 0; t < threads; t++) {
+            int start = t * rows;
+            jobs[t] = (atrous_job){
+                .buffers = buffers,
+                .in = in,
+                .out = out,
+                .step = 1 << pass,
+                .inv_color = 1.0f / (sigma_color * sigma_color),
+                .inv_normal = 1.0f / (DENOISE_SIGMA_NORMAL * DENOISE_SIGMA_NORMAL),
+                .inv_albedo = 1.0f / (DENOISE_SIGMA_ALBEDO * DENOISE_SIGMA_ALBEDO),
+                .row_start = start < buffers->height ? start : buffers->height,
+                .row_end = start + rows < buffers->height ? start + rows : buffers->height,
+                .started = 0
+            };
+        }
+        
+        // Thread 0 is the calling thread; bands of threads that fail to
+        // start are filtered inline
+        for (int t = 1; t < threads; t++) {
+            if (pthread_create(&handles[t], NULL, atrous_rows, &jobs[t]) != 0) {
+                fprintf(stderr, "Warning: could not start denoise thread %d\n", t);
+                atrous_rows(&jobs[t]);
+            } else {
+                jobs[t].started = 1;
+            }
+        }
+        atrous_rows(&jobs[0]);
+        for (int t = 1; t < threads; t++) {
+            if (jobs[t].started) {
+                pthread_join(handles[t], NULL);
+            }
+        }
+        
+        color *swap = in;
+        in = out;
+        out = swap;
+        sigma_color *= 0.5f;
+    }
+    
+    if (in != buffers->radiance) {
+        memcpy(buffers->radiance, in, sizeof(color) * (size_t)buffers->width * buffers->height);
+    }
+}
@@ -0,0 +1,71 @@
+/**
+ * denoise.h - Edge-aware à-trous denoiser
+ *
+ * Post-process for low-sample renders: an à-trous wavelet filter
+ * (5 × 5 B3-spline kernel, dilated 2^i on pass i) whose weights drop
+ * across color, normal and albedo discontinuities, so noise is smoothed
+ * inside surfaces while object edges and texture stay sharp.
+ *
+ * The renderer fills the guide buffers (first-hit normal and albedo,
+ * averaged over the pixel's samples) next to the linear radiance; the
+ * filter runs on several threads, each on a band of rows.
+ */
+
+#ifndef DENOISE_H
+#define DENOISE_H
+
+#include <stddef.h>
+#include "color.h"
+#include "../math/vec3.h"
+#include "../utils/allocator.h"
+
+/* ============================================================================
+   DENOISE BUFFERS
+   ============================================================================ */
+
+/**
+ * Radiance and guide buffers of the rendered region (row-major).
+ */
+typedef struct {
+    int width;
+    int height;
+    color *radiance;    // Linear pixel color (filtered in place)
+    vec3 *normal;       // Average first-hit normal (zero where rays missed)
+    color *albedo;      // Average first-hit albedo (background where rays missed)
+    color *scratch;     // Ping-pong buffer of the passes
+} denoise_buffers;
+
+/* ============================================================================
+   FUNCTIONS
+   ============================================================================ */
+
+/**
+ * Pixels around a pixel that passes filter passes read (the footprint
+ * radius): a tile needs this much margin to match a full-frame result.
+ */
+int denoise_radius(int passes);
+
+/**
+ * Arena bytes needed by denoise_buffers_create for a width × height region.
+ */
+size_t denoise_arena_size(int width, int height);
+
+/**
+ * Allocate the buffers of a width × height region from a memory pool.
+ * @return          0 on success, -1 if the pool is full
+ */
+int denoise_buffers_create(denoise_buffers *buffers, memory_pool *pool, int width, int height);
+
+/**
+ * Filter the radiance buffer in place.
+ * @param buffers   Filled radiance and guide buffers
+ * @param passes    À-trous passes (kernel dilations 1, 2, 4, ...)
+ * @param threads   Threads to split the rows across
+ *
+ * The color weight tightens on every pass (DENOISE_SIGMA_COLOR / 2^i).
+ * Samples outside the buffers are skipped, and each pixel only depends
+ * on the pixels within denoise_radius(passes).
+ */
+void denoise_atrous(denoise_buffers *buffers, int passes, int threads);
+
+#endif // DENOISE_H
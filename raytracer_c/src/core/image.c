@@ -2,10 +2,15 @@
  * image.c - Image implementation
  */
 
+#define _POSIX_C_SOURCE 200809L
+
 #include "image.h"
 #include <stdlib.h>
 #include <stdio.h>
 #include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
 
 /**
  * Create image with given dimensions.
@@ -19,6 +24,22 @@ image image_create(int width, int height) {
     return img;
 }
 
+/**
+ * Create image backed by pool memory.
+ */
+image image_create_from_pool(memory_pool *pool, int width, int height) {
+    size_t size = (size_t)width * height * 3;
+    image img = {
+        .width = width,
+        .height = height,
+        .pixels = (uint8_t *)pool_alloc(pool, size)
+    };
+    if (img.pixels) {
+        memset(img.pixels, 0, size);
+    }
+    return img;
+}
+
 /**
  * Destroy image and free memory.
  */
@@ -107,6 +128,62 @@ int image_write_ppm(const image *img, const char *filename) {
     return 0;
 }
 
+/**
+ * Create a PPM file at full size and map it for writing.
+ */
+int image_file_create(image_file *file, const char *filename, int width, int height) {
+    memset(file, 0, sizeof(*file));
+    if (!filename || width <= 0 || height <= 0) {
+        return -1;
+    }
+    
+    char header[64];
+    int header_size = snprintf(header, sizeof(header), "P6\n%d %d\n255\n", width, height);
+    size_t size = (size_t)header_size + (size_t)width * height * 3;
+    
+    int fd = open(filename, O_RDWR | O_CREAT | O_TRUNC, 0644);
+    if (fd < 0) {
+        fprintf(stderr, "Error: cannot open '%s' for writing\n", filename);
+        return -1;
+    }
+    // Reserve the blocks up front: a full disk fails here instead of
+    // raising SIGBUS while the pixels are written
+    if (posix_fallocate(fd, 0, (off_t)size) != 0 && ftruncate(fd, (off_t)size) != 0) {
+        fprintf(stderr, "Error: cannot allocate %zu bytes for '%s'\n", size, filename);
+        close(fd);
+        return -1;
+    }
+    
+    void *data = mmap(NULL, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);  // Mapping stays valid after close
+    if (data == MAP_FAILED) {
+        fprintf(stderr, "Error: cannot map '%s'\n", filename);
+        return -1;
+    }
+    
+    memcpy(data, header, (size_t)header_size);
+    file->data = data;
+    file->size = size;
+    file->img.pixels = (uint8_t *)data + header_size;
+    file->img.width = width;
+    file->img.height = height;
+    return 0;
+}
+
+/**
+ * Unmap a PPM file created by image_file_create.
+ */
+int image_file_close(image_file *file) {
+    int status = 0;
+    if (file && file->data) {
+        status = munmap(file->data, file->size) == 0 ? 0 : -1;
+    }
+    if (file) {
+        memset(file, 0, sizeof(*file));
+    }
+    return status;
+}
+
 /**
  * Read image from PPM file (P6 format only).
  */
@@ -10,6 +10,7 @@
 
 #include <stdint.h>
 #include "../core/color.h"
+#include "../utils/allocator.h"
 
 /* ============================================================================
    IMAGE STRUCTURE
@@ -25,6 +26,18 @@ typedef struct {
     int height;
 } image;
 
+/**
+ * PPM file mapped in memory (MAP_SHARED), whose pixels are rendered in place.
+ * img.pixels points just past the header: pixels written there land in the
+ * page cache, so the file needs no separate write and other processes
+ * mapping it see the pixels without a copy.
+ */
+typedef struct {
+    image img;          // Pixels of the mapped file
+    void *data;         // Mapped file (header + pixels)
+    size_t size;        // Mapped size
+} image_file;
+
 /* ============================================================================
    CREATION & DESTRUCTION
    ============================================================================ */
@@ -39,6 +52,17 @@ typedef struct {
  */
 image image_create(int width, int height);
 
+/**
+ * Create image with pixels allocated from a memory pool (zeroed).
+ * @param pool      Pool to allocate from (e.g. the per-frame arena)
+ * @param width     Image width (pixels)
+ * @param height    Image height (pixels)
+ * @return          Image (pixels is NULL if the pool is full)
+ * 
+ * Do not call image_destroy: the pixels are released with the pool.
+ */
+image image_create_from_pool(memory_pool *pool, int width, int height);
+
 /**
  * Destroy image and free memory.
  * @param img       Image to destroy
@@ -96,6 +120,26 @@ color image_get_pixel(const image *img, int x, int y);
  */
 int image_write_ppm(const image *img, const char *filename);
 
+/**
+ * Create a P6 PPM file of the given size and map it for writing.
+ * @param file          Mapped file to fill in
+ * @param filename      Output filename (truncated if it exists)
+ * @param width         Image width (pixels)
+ * @param height        Image height (pixels)
+ * @return              0 on success, -1 on error
+ * 
+ * The file is allocated at full size with a valid header and black pixels;
+ * write into file->img, then call image_file_close.
+ */
+int image_file_create(image_file *file, const char *filename, int width, int height);
+
+/**
+ * Unmap a PPM file created by image_file_create.
+ * @param file          Mapped file
+ * @return              0 on success, -1 if unmapping failed
+ */
+int image_file_close(image_file *file);
+
 /**
  * Read image from PPM file (P6 format only).
  * @param filename      Input filename
@@ -0,0 +1,70 @@
+/**
+ * ray_table.c - Cached primary ray directions implementation
+ */
+
+#include "ray_table.h"
+#include <stdlib.h>
+#include <string.h>
+
+/**
+ * Create an empty table.
+ */
+ray_table ray_table_create(void) {
+    ray_table table;
+    memset(&table, 0, sizeof(table));
+    return table;
+}
+
+/**
+ * Same view: position, orientation, field of view and frame size.
+ */
+static int same_view(const camera *a, const camera *b) {
+    return a->width == b->width && a->height == b->height
+        && a->fov == b->fov && a->plane_dist == b->plane_dist
+        && a->position.x == b->position.x && a->position.y == b->position.y
+        && a->position.z == b->position.z
+        && a->forward.x == b->forward.x && a->forward.y == b->forward.y
+        && a->forward.z == b->forward.z
+        && a->right.x == b->right.x && a->right.y == b->right.y
+        && a->right.z == b->right.z
+        && a->up.x == b->up.x && a->up.y == b->up.y && a->up.z == b->up.z;
+}
+
+/**
+ * Bind to a frame; rebuilds (empty) only when the view changed.
+ */
+int ray_table_bind(ray_table *table, const camera *cam, int samples, size_t max_bytes) {
+    size_t entries = (size_t)cam->width * (size_t)cam->height * (size_t)samples;
+    if (entries == 0 || entries > max_bytes / sizeof(vec3)) {
+        return 0;
+    }
+    
+    if (table->bound && table->samples == samples && same_view(&table->cam, cam)) {
+        return 1;
+    }
+    
+    if (entries > table->capacity) {
+        vec3 *directions = (vec3 *)realloc(table->directions, entries * sizeof(vec3));
+        if (!directions) {
+            table->bound = 0;
+            return 0;
+        }
+        table->directions = directions;
+        table->capacity = entries;
+    }
+    
+    // Clears the filled marks
+    memset(table->directions, 0, entries * sizeof(vec3));
+    table->cam = *cam;
+    table->samples = samples;
+    table->bound = 1;
+    return 1;
+}
+
+/**
+ * Free the directions.
+ */
+void ray_table_destroy(ray_table *table) {
+    free(table->directions);
+    *table = ray_table_create();
+}
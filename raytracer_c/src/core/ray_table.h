@@ -0,0 +1,85 @@
+/**
+ * ray_table.h - Cached primary ray directions
+ *
+ * Primary rays only depend on the camera, the frame size and the samples
+ * per pixel: sub-pixel jitter comes from per-row seeded generators (see
+ * render_rows in main.c), so the same frame always casts the same rays.
+ * A persistent worker rendering the same view again (previews, tiles of
+ * one frame, scene edits) reads them back instead of recomputing them.
+ *
+ * Entries are filled lazily, one pixel at a time, by the thread that
+ * renders the pixel; a filled pixel has its first direction's _pad set.
+ */
+
+#ifndef RAY_TABLE_H
+#define RAY_TABLE_H
+
+#include <stddef.h>
+#include "camera.h"
+
+/* ============================================================================
+   RAY TABLE STRUCTURE
+   ============================================================================ */
+
+/**
+ * Directions of every primary ray of one frame (samples per pixel,
+ * pixels row-major in frame coordinates).
+ */
+typedef struct {
+    camera cam;             // Camera (and frame size) of the cached rays
+    int samples;            // Rays per pixel
+    vec3 *directions;       // width * height * samples entries
+    size_t capacity;        // Entries allocated
+    int bound;              // directions matches cam and samples
+} ray_table;
+
+/* ============================================================================
+   FUNCTIONS
+   ============================================================================ */
+
+/**
+ * Empty table (allocates nothing until bound).
+ */
+ray_table ray_table_create(void);
+
+/**
+ * Point the table at a frame, keeping its rays if the view is unchanged.
+ * @param table     Table
+ * @param cam       Camera of the whole frame
+ * @param samples   Rays per pixel
+ * @param max_bytes Largest table allowed
+ * @return          1 if the table can be used for this frame, 0 if the
+ *                  frame is too large (or allocation failed)
+ *
+ * A different camera, frame size or sample count clears every entry.
+ */
+int ray_table_bind(ray_table *table, const camera *cam, int samples, size_t max_bytes);
+
+/**
+ * Release the table's memory.
+ */
+void ray_table_destroy(ray_table *table);
+
+/**
+ * First direction of pixel (x, y) of the bound frame.
+ */
+static inline vec3 *ray_table_pixel(const ray_table *table, int x, int y) {
+    return table->directions
+        + ((size_t)y * (size_t)table->cam.width + (size_t)x) * (size_t)table->samples;
+}
+
+/**
+ * Whether a pixel's directions have been stored.
+ */
+static inline int ray_table_filled(const vec3 *pixel) {
+    return pixel->_pad != 0.0f;
+}
+
+/**
+ * Mark a pixel's directions as stored (after writing all of them).
+ */
+static inline void ray_table_mark(vec3 *pixel) {
+    pixel->_pad = 1.0f;
+}
+
+#endif // RAY_TABLE_H
@@ -0,0 +1,194 @@
+/**
+ * render_options.c - Runtime render configuration implementation
+ */
+
+#define _POSIX_C_SOURCE 200809L
+
+#include "render_options.h"
+#include "denoise.h"
+#include "../config.h"
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+
+/**
+ * Defaults from config.h.
+ */
+render_options render_options_default(void) {
+    render_options opts = {
+        .width = IMAGE_WIDTH,
+        .height = IMAGE_HEIGHT,
+        .samples = NUM_AA_SAMPLES,
+        .max_depth = MAX_DEPTH,
+        .threads = NUM_THREADS,
+        .fov = 0.0f,
+        .denoise = DENOISE_PASSES,
+        .tile_x = 0,
+        .tile_y = 0,
+        .tile_width = 0,
+        .tile_height = 0
+    };
+    return opts;
+}
+
+/**
+ * Parse an integer, rejecting trailing garbage.
+ */
+static int parse_int(const char *value, int *out) {
+    char *end;
+    long v = strtol(value, &end, 10);
+    if (end == value || *end != '\0') {
+        return -1;
+    }
+    *out = (int)v;
+    return 0;
+}
+
+/**
+ * Parse "X,Y,W,H" into a tile.
+ */
+static int parse_tile(const char *value, render_options *opts) {
+    int v[4];
+    const char *p = value;
+    
+    for (int i = 0; i < 4; i++) {
+        char *end;
+        long n = strtol(p, &end, 10);
+        if (end == p || *end != (i < 3 ? ',' : '\0')) {
+            return -1;
+        }
+        v[i] = (int)n;
+        p = end + 1;
+    }
+    opts->tile_x = v[0];
+    opts->tile_y = v[1];
+    opts->tile_width = v[2];
+    opts->tile_height = v[3];
+    return 0;
+}
+
+/**
+ * Parse one "--name value" option.
+ */
+int render_options_parse_arg(render_options *opts, const char *name, const char *value) {
+    int *target = NULL;
+
+    if (strcmp(name, "--width") == 0) {
+        target = &opts->width;
+    } else if (strcmp(name, "--height") == 0) {
+        target = &opts->height;
+    } else if (strcmp(name, "--samples") == 0) {
+        target = &opts->samples;
+    } else if (strcmp(name, "--depth") == 0) {
+        target = &opts->max_depth;
+    } else if (strcmp(name, "--threads") == 0) {
+        target = &opts->threads;
+    } else if (strcmp(name, "--denoise") == 0) {
+        target = &opts->denoise;
+    } else if (strcmp(name, "--fov") == 0) {
+        char *end;
+        float fov = strtof(value, &end);
+        if (end == value || *end != '\0') {
+            return -1;
+        }
+        opts->fov = fov;
+        return 1;
+    } else if (strcmp(name, "--tile") == 0) {
+        return parse_tile(value, opts) == 0 ? 1 : -1;
+    } else {
+        return 0;
+    }
+
+    return parse_int(value, target) == 0 ? 1 : -1;
+}
+
+/**
+ * Check options against config.h limits.
+ */
+const char *render_options_validate(const render_options *opts) {
+    if (opts->width < 1 || opts->width > MAX_IMAGE_WIDTH) {
+        return "width out of range";
+    }
+    if (opts->height < 1 || opts->height > MAX_IMAGE_HEIGHT) {
+        return "height out of range";
+    }
+    if (opts->samples < 1 || opts->samples > MAX_AA_SAMPLES) {
+        return "samples out of range";
+    }
+    if (opts->max_depth < 1 || opts->max_depth > MAX_RENDER_DEPTH) {
+        return "depth out of range";
+    }
+    if (opts->threads < 0 || opts->threads > MAX_THREADS) {
+        return "threads out of range";
+    }
+    if (opts->fov < 0.0f || opts->fov >= 180.0f) {
+        return "fov out of range";
+    }
+    if (opts->denoise < 0 || opts->denoise > DENOISE_MAX_PASSES) {
+        return "denoise out of range";
+    }
+    if (opts->tile_width != 0 || opts->tile_height != 0) {
+        if (opts->tile_width < 1 || opts->tile_height < 1
+            || opts->tile_x < 0 || opts->tile_y < 0
+            || opts->tile_x > opts->width - opts->tile_width
+            || opts->tile_y > opts->height - opts->tile_height) {
+            return "tile outside the frame";
+        }
+    }
+    return NULL;
+}
+
+/**
+ * Tile rectangle, defaulting to the whole frame.
+ */
+void render_options_tile(const render_options *opts, int *x, int *y, int *w, int *h) {
+    if (opts->tile_width > 0) {
+        *x = opts->tile_x;
+        *y = opts->tile_y;
+        *w = opts->tile_width;
+        *h = opts->tile_height;
+    } else {
+        *x = 0;
+        *y = 0;
+        *w = opts->width;
+        *h = opts->height;
+    }
+}
+
+/**
+ * Tile grown by the denoiser footprint, clamped to the frame.
+ */
+void render_options_region(const render_options *opts, int *x, int *y, int *w, int *h) {
+    render_options_tile(opts, x, y, w, h);
+    
+    int margin = denoise_radius(opts->denoise);
+    if (margin > 0) {
+        int x1 = *x + *w + margin < opts->width ? *x + *w + margin : opts->width;
+        int y1 = *y + *h + margin < opts->height ? *y + *h + margin : opts->height;
+        *x = *x > margin ? *x - margin : 0;
+        *y = *y > margin ? *y - margin : 0;
+        *w = x1 - *x;
+        *h = y1 - *y;
+    }
+}
+
+/**
+ * Resolve the thread count (0 = one per online CPU).
+ */
+int render_options_thread_count(const render_options *opts) {
+    int threads = opts->threads;
+
+    if (threads == 0) {
+        long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+        threads = cpus > 0 ? (int)cpus : 1;
+    }
+    if (threads > MAX_THREADS) {
+        threads = MAX_THREADS;
+    }
+    // More threads than rows would leave some idle
+    int rows = opts->tile_width > 0 ? opts->tile_height : opts->height;
+    if (threads > rows) {
+        threads = rows;
+    }
+    return threads > 0 ? threads : 1;
+}
@@ -0,0 +1,90 @@
+/**
+ * render_options.h - Runtime render configuration
+ *
+ * Resolution, sampling and threading chosen per run (command line)
+ * instead of at compile time. Defaults come from config.h, and the
+ * MAX_* limits in config.h bound what a caller may request.
+ */
+
+#ifndef RENDER_OPTIONS_H
+#define RENDER_OPTIONS_H
+
+/* ============================================================================
+   RENDER OPTIONS STRUCTURE
+   ============================================================================ */
+
+/**
+ * Settings for one render.
+ */
+typedef struct {
+    int width;          // Image width (pixels)
+    int height;         // Image height (pixels)
+    int samples;        // Samples per pixel (1 = no antialiasing)
+    int max_depth;      // Maximum ray recursion depth
+    int threads;        // Worker threads (0 = one per CPU)
+    float fov;          // Vertical FOV in degrees (0 = scene/default FOV)
+    int denoise;        // Edge-aware denoise passes (0 = off)
+    
+    // Tile: sub-rectangle of the width × height frame to render
+    // (tile_width = 0 renders the whole frame)
+    int tile_x;
+    int tile_y;
+    int tile_width;
+    int tile_height;
+} render_options;
+
+/* ============================================================================
+   FUNCTIONS
+   ============================================================================ */
+
+/**
+ * Get the compile-time defaults from config.h.
+ * @return          Default options
+ */
+render_options render_options_default(void);
+
+/**
+ * Parse one command-line option.
+ * @param opts      Options to update
+ * @param name      Option name (e.g. "--samples")
+ * @param value     Option value
+ * @return          1 if name is a render option, 0 otherwise, -1 if value is not a number
+ *
+ * Recognized: --width, --height, --samples, --depth, --threads, --fov,
+ * --denoise, --tile X,Y,W,H
+ */
+int render_options_parse_arg(render_options *opts, const char *name, const char *value);
+
+/**
+ * Check options against the limits in config.h.
+ * @param opts      Options to check
+ * @return          NULL if valid, otherwise a message describing the problem
+ */
+const char *render_options_validate(const render_options *opts);
+
+/**
+ * Rectangle actually rendered: the tile, or the whole frame.
+ * @param opts      Validated options
+ * @param x, y      Top-left corner in the frame (output)
+ * @param w, h      Size in pixels (output)
+ */
+void render_options_tile(const render_options *opts, int *x, int *y, int *w, int *h);
+
+/**
+ * Rectangle to render for the tile: the tile plus the pixels the
+ * denoiser reads around it (clamped to the frame), so a denoised tile
+ * matches the same pixels of a denoised full frame.
+ * @param opts      Validated options
+ * @param x, y      Top-left corner in the frame (output)
+ * @param w, h      Size in pixels (output)
+ */
+void render_options_region(const render_options *opts, int *x, int *y, int *w, int *h);
+
+/**
+ * Number of threads to actually use (resolves 0 to the CPU count).
+ * @param opts      Options
+ * @return          Thread count in [1, min(MAX_THREADS, rendered rows)]
+ */
+int render_options_thread_count(const render_options *opts);
+
+#endif // RENDER_OPTIONS_H
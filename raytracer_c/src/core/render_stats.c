@@ -0,0 +1,80 @@
+/**
+ * render_stats.c - Machine-readable render statistics implementation
+ */
+
+#define _POSIX_C_SOURCE 200809L
+
+#include "render_stats.h"
+#include <sys/resource.h>
+
+/**
+ * Peak RSS. Linux: VmHWM from /proc (getrusage would also count the
+ * parent's memory before exec). Elsewhere: getrusage.
+ */
+size_t render_stats_peak_rss(void) {
+    FILE *status = fopen("/proc/self/status", "r");
+    if (status) {
+        char line[256];
+        unsigned long kb = 0;
+        while (fgets(line, sizeof(line), status)) {
+            if (sscanf(line, "VmHWM: %lu kB", &kb) == 1) {
+                break;
+            }
+        }
+        fclose(status);
+        if (kb > 0) {
+            return (size_t)kb * 1024;
+        }
+    }
+    
+    struct rusage usage;
+    if (getrusage(RUSAGE_SELF, &usage) != 0) {
+        return 0;
+    }
+#ifdef __APPLE__
+    return (size_t)usage.ru_maxrss;
+#else
+    return (size_t)usage.ru_maxrss * 1024;
+#endif
+}
+
+/**
+ * Print stats as a single JSON line.
+ */
+void render_stats_print_json(const render_stats *stats, FILE *out) {
+    double rays_per_second = stats->render_time > 0.0
+        ? (double)stats->rays_cast / stats->render_time
+        : 0.0;
+
+    fprintf(out, RENDER_STATS_PREFIX "{");
+    fprintf(out, "\"width\":%d,\"height\":%d,\"samples_per_pixel\":%d,\"denoise_passes\":%d,"
+                 "\"threads\":%d,\"objects\":%d,\"objects_dropped\":%d,",
+        stats->width, stats->height, stats->samples, stats->denoise_passes,
+        stats->threads, stats->objects, stats->objects_dropped);
+    fprintf(out, "\"tile\":{\"x\":%d,\"y\":%d,\"width\":%d,\"height\":%d},",
+        stats->tile_x, stats->tile_y, stats->tile_width, stats->tile_height);
+    fprintf(out, "\"rays_cast\":%llu,\"rays_cached\":%llu,"
+                 "\"intersection_tests\":%llu,\"bvh_node_visits\":%llu,",
+        (unsigned long long)stats->rays_cast,
+        (unsigned long long)stats->rays_cached,
+        (unsigned long long)stats->intersection_tests,
+        (unsigned long long)stats->bvh_node_visits);
+    fprintf(out, "\"rays_per_second\":%.0f,", rays_per_second);
+    fprintf(out, "\"time\":{\"load\":%.6f,\"render\":%.6f,\"denoise\":%.6f,"
+                 "\"write\":%.6f,\"total\":%.6f},",
+        stats->load_time, stats->render_time, stats->denoise_time,
+        stats->write_time, stats->total_time);
+
+    fprintf(out, "\"thread_times\":[");
+    for (int i = 0; i < stats->threads && stats->thread_times; i++) {
+        fprintf(out, i > 0 ? ",%.6f" : "%.6f", stats->thread_times[i]);
+    }
+    fprintf(out, "],");
+
+    fprintf(out, "\"memory\":{\"peak_rss_bytes\":%zu,\"image_bytes\":%zu,\"scene_bytes\":%zu,"
+                 "\"ray_table_bytes\":%zu,\"pool_used\":%zu,\"pool_peak\":%zu,\"pool_total\":%zu}",
+        render_stats_peak_rss(), stats->image_bytes, stats->scene_bytes, stats->ray_table_bytes,
+        stats->pool_used, stats->pool_peak, stats->pool_total);
+
+    fprintf(out, "}\n");
+}
@@ -0,0 +1,79 @@
+/**
+ * render_stats.h - Machine-readable render statistics
+ *
+ * Counters and timings collected during one render, printed as a single
+ * JSON line prefixed with RENDER_STATS_PREFIX so callers (the Python
+ * backend) can find it in stdout among the human-readable output.
+ */
+
+#ifndef RENDER_STATS_H
+#define RENDER_STATS_H
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stddef.h>
+
+/** Prefix of the stats line on stdout */
+#define RENDER_STATS_PREFIX "RENDER_STATS "
+
+/* ============================================================================
+   RENDER STATS STRUCTURE
+   ============================================================================ */
+
+/**
+ * Statistics of one render.
+ */
+typedef struct {
+    int width;                      // Frame size
+    int height;
+    int tile_x;                     // Rendered rectangle (the whole frame without --tile)
+    int tile_y;
+    int tile_width;
+    int tile_height;
+    int samples;                    // Samples per pixel
+    int denoise_passes;             // À-trous denoise passes (0 = off)
+    int threads;                    // Render threads used
+    int objects;                    // Objects in the scene
+    int objects_dropped;            // Scene instances past MAX_OBJECTS, not rendered
+
+    uint64_t rays_cast;             // Primary rays traced
+    uint64_t rays_cached;           // Primary ray directions read from the ray table
+    uint64_t intersection_tests;    // Ray-object tests
+    uint64_t bvh_node_visits;       // BVH nodes visited (0 until a BVH exists)
+
+    double load_time;               // Setup and scene load (seconds, wall clock)
+    double render_time;             // Render loop
+    double denoise_time;            // Denoise pass(es) and tile crop
+    double write_time;              // Image output
+    double total_time;              // Whole run
+
+    double *thread_times;           // Render time of each thread (threads entries)
+
+    size_t image_bytes;             // Image buffer size
+    size_t scene_bytes;             // Scene object storage
+    size_t ray_table_bytes;         // Cached primary rays (see ray_table.h)
+    size_t pool_used;               // Frame arena (see allocator.h)
+    size_t pool_peak;
+    size_t pool_total;
+} render_stats;
+
+/* ============================================================================
+   FUNCTIONS
+   ============================================================================ */
+
+/**
+ * Peak resident set size of this process.
+ * @return          Bytes (0 if unavailable)
+ */
+size_t render_stats_peak_rss(void);
+
+/**
+ * Write stats as one JSON line prefixed with RENDER_STATS_PREFIX.
+ * @param stats     Stats to write
+ * @param out       Output stream
+ *
+ * Memory also includes the peak RSS of the process.
+ */
+void render_stats_print_json(const render_stats *stats, FILE *out);
+
+#endif // RENDER_STATS_H
@@ -0,0 +1,163 @@
+/**
+ * scene_file.c - Binary scene loader implementation
+ */
+
+#define _POSIX_C_SOURCE 200809L
+
+#include "scene_file.h"
+#include <stdio.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+/**
+ * Map and validate a binary scene file.
+ */
+int scene_file_open(scene_file *sf, const char *path) {
+    memset(sf, 0, sizeof(*sf));
+
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) {
+        fprintf(stderr, "Error: cannot open scene '%s'\n", path);
+        return -1;
+    }
+
+    struct stat st;
+    if (fstat(fd, &st) != 0 || (size_t)st.st_size < sizeof(scene_file_header)) {
+        fprintf(stderr, "Error: scene '%s' is too small\n", path);
+        close(fd);
+        return -1;
+    }
+
+    void *data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);  // Mapping stays valid after close
+    if (data == MAP_FAILED) {
+        fprintf(stderr, "Error: cannot map scene '%s'\n", path);
+        return -1;
+    }
+
+    sf->data = data;
+    sf->size = (size_t)st.st_size;
+    sf->header = (const scene_file_header *)data;
+
+    const scene_file_header *h = sf->header;
+    if (memcmp(h->magic, SCENE_FILE_MAGIC, 4) != 0) {
+        fprintf(stderr, "Error: '%s' is not a binary scene\n", path);
+        scene_file_close(sf);
+        return -1;
+    }
+    if (h->version != SCENE_FILE_VERSION || h->header_size != sizeof(scene_file_header)) {
+        fprintf(stderr, "Error: unsupported scene version %u\n", h->version);
+        scene_file_close(sf);
+        return -1;
+    }
+
+    // Bounds check every section before handing out pointers
+    size_t mesh_end = (size_t)h->mesh_offset + (size_t)h->mesh_count * sizeof(scene_file_mesh);
+    size_t data_end = (size_t)h->data_offset + (size_t)h->float_count * sizeof(float);
+    if (mesh_end > sf->size || data_end > sf->size ||
+        h->mesh_offset % 4 != 0 || h->data_offset % 4 != 0) {
+        fprintf(stderr, "Error: scene '%s' is truncated or misaligned\n", path);
+        scene_file_close(sf);
+        return -1;
+    }
+
+    sf->meshes = (const scene_file_mesh *)((const char *)data + h->mesh_offset);
+    sf->floats = (const float *)((const char *)data + h->data_offset);
+
+    for (uint32_t i = 0; i < h->mesh_count; i++) {
+        const scene_file_mesh *m = &sf->meshes[i];
+        size_t needed = (size_t)m->count * 3;
+        if ((size_t)m->positions + needed > h->float_count ||
+            (m->scales != SCENE_FILE_NONE && (size_t)m->scales + needed > h->float_count)) {
+            fprintf(stderr, "Error: mesh %u references data out of range\n", i);
+            scene_file_close(sf);
+            return -1;
+        }
+    }
+
+    return 0;
+}
+
+/**
+ * Unmap a scene file.
+ */
+void scene_file_close(scene_file *sf) {
+    if (sf && sf->data) {
+        munmap(sf->data, sf->size);
+    }
+    if (sf) {
+        memset(sf, 0, sizeof(*sf));
+    }
+}
+
+/**
+ * Total number of instances over all meshes.
+ */
+int scene_file_instance_count(const scene_file *sf) {
+    int total = 0;
+    for (uint32_t i = 0; i < sf->header->mesh_count; i++) {
+        total += (int)sf->meshes[i].count;
+    }
+    return total;
+}
+
+/**
+ * Convert instances to (bounding) spheres.
+ */
+int scene_file_to_spheres(const scene_file *sf, sphere *out, int max) {
+    int n = 0;
+
+    for (uint32_t i = 0; i < sf->header->mesh_count && n < max; i++) {
+        const scene_file_mesh *m = &sf->meshes[i];
+        const float *positions = sf->floats + m->positions;
+        const float *scales = m->scales != SCENE_FILE_NONE ? sf->floats + m->scales : NULL;
+
+        material mat = {
+            .albedo = color_create(m->color[0], m->color[1], m->color[2]),
+            .roughness = m->roughness,
+            .metallic = m->metalness,
+            .ior = 1.0f,
+            .emission = color_black()
+        };
+
+        for (uint32_t j = 0; j < m->count && n < max; j++) {
+            const float *s = scales ? scales + j * 3 : m->scale;
+            float max_scale = s[0];
+            if (s[1] > max_scale) max_scale = s[1];
+            if (s[2] > max_scale) max_scale = s[2];
+
+            const float *p = positions + j * 3;
+            out[n++] = sphere_create(
+                vec3_create(p[0], p[1], p[2]),
+                m->radius * max_scale,
+                mat
+            );
+        }
+    }
+
+    return n;
+}
+
+/**
+ * Create the scene camera.
+ */
+camera scene_file_camera(const scene_file *sf, int width, int height) {
+    const scene_file_header *h = sf->header;
+    return camera_create_look_at(
+        vec3_create(h->camera_position[0], h->camera_position[1], h->camera_position[2]),
+        vec3_create(h->camera_look_at[0], h->camera_look_at[1], h->camera_look_at[2]),
+        vec3_create(0.0f, 1.0f, 0.0f),
+        h->fov, width, height
+    );
+}
+
+/**
+ * Scene background color.
+ */
+color scene_file_background(const scene_file *sf) {
+    const float *bg = sf->header->background;
+    return color_create(bg[0], bg[1], bg[2]);
+}
@@ -0,0 +1,149 @@
+/**
+ * scene_file.h - Binary scene (.vtsc) loader
+ *
+ * Reads the binary scene format written by the Python backend
+ * (imagegen/backend/scene_binary.py). The file is memory-mapped and its
+ * tables are read in place, without copying or parsing transforms.
+ *
+ * Layout (little-endian, 4-byte aligned):
+ *   header | string table | mesh table | float32 data
+ */
+
+#ifndef SCENE_FILE_H
+#define SCENE_FILE_H
+
+#include <stddef.h>
+#include <stdint.h>
+#include "../core/camera.h"
+#include "../primitives/sphere.h"
+
+/* ============================================================================
+   FILE LAYOUT
+   ============================================================================ */
+
+#define SCENE_FILE_MAGIC    "VTSC"
+#define SCENE_FILE_VERSION  1
+#define SCENE_FILE_NONE     0xFFFFFFFFu
+
+/** Mesh flags */
+#define SCENE_FLAG_CAST_SHADOW      1u
+#define SCENE_FLAG_RECEIVE_SHADOW   2u
+
+/** Shape codes (match SHAPE_CODES in scene_binary.py) */
+typedef enum {
+    SCENE_SHAPE_BOX = 0,
+    SCENE_SHAPE_SPHERE = 1,
+    SCENE_SHAPE_CYLINDER = 2,
+    SCENE_SHAPE_CONE = 3,
+    SCENE_SHAPE_TORUS = 4,
+    SCENE_SHAPE_PLANE = 5,
+    SCENE_SHAPE_UNKNOWN = 255
+} scene_shape;
+
+/**
+ * File header (76 bytes).
+ * Offsets are in bytes from the start of the file.
+ */
+typedef struct {
+    char magic[4];              // "VTSC"
+    uint16_t version;           // SCENE_FILE_VERSION
+    uint16_t header_size;       // sizeof(scene_file_header)
+    uint32_t string_offset;     // String table
+    uint32_t string_size;
+    uint32_t mesh_offset;       // Mesh table
+    uint32_t mesh_count;
+    uint32_t data_offset;       // float32 data
+    uint32_t float_count;
+    uint32_t metadata;          // String offset of metadata JSON
+    float camera_position[3];
+    float camera_look_at[3];
+    float fov;                  // Vertical FOV (degrees)
+    float background[3];
+} scene_file_header;
+
+/**
+ * Mesh record (88 bytes): one batch of identical instances.
+ * positions/rotations/scales are float indices into the data section,
+ * each holding count * 3 floats (SCENE_FILE_NONE = use shared value).
+ */
+typedef struct {
+    uint32_t name;              // String offsets
+    uint32_t geometry;
+    uint32_t material;
+    uint32_t animation;
+    uint32_t shape;             // scene_shape
+    uint32_t flags;
+    uint32_t count;             // Number of instances
+    uint32_t positions;
+    uint32_t rotations;
+    uint32_t scales;
+    float radius;               // Bounding radius of the geometry
+    float color[3];             // Albedo [0, 1]
+    float metalness;
+    float roughness;
+    float rotation[3];          // Shared rotation
+    float scale[3];             // Shared scale
+} scene_file_mesh;
+
+/* ============================================================================
+   LOADED SCENE
+   ============================================================================ */
+
+/**
+ * Memory-mapped binary scene.
+ * Pointers reference the mapping directly and are valid until close.
+ */
+typedef struct {
+    void *data;                         // Mapped file
+    size_t size;                        // Mapped size
+    const scene_file_header *header;
+    const scene_file_mesh *meshes;
+    const float *floats;
+} scene_file;
+
+/**
+ * Map and validate a binary scene file.
+ * @param sf        Scene to fill
+ * @param path      File path
+ * @return          0 on success, -1 on error (message on stderr)
+ */
+int scene_file_open(scene_file *sf, const char *path);
+
+/**
+ * Unmap a scene file.
+ * @param sf        Scene
+ */
+void scene_file_close(scene_file *sf);
+
+/**
+ * Total number of instances over all meshes.
+ */
+int scene_file_instance_count(const scene_file *sf);
+
+/**
+ * Convert instances to spheres.
+ * @param sf        Scene
+ * @param out       Output array
+ * @param max       Capacity of out
+ * @return          Number of spheres written
+ *
+ * Non-sphere shapes are approximated by their bounding sphere
+ * until the matching primitives exist.
+ */
+int scene_file_to_spheres(const scene_file *sf, sphere *out, int max);
+
+/**
+ * Create the scene camera.
+ * @param sf        Scene
+ * @param width     Image width
+ * @param height    Image height
+ * @return          Camera looking from camera_position to camera_look_at
+ */
+camera scene_file_camera(const scene_file *sf, int width, int height);
+
+/**
+ * Scene background color.
+ */
+color scene_file_background(const scene_file *sf);
+
+#endif // SCENE_FILE_H
@@ -5,6 +5,8 @@
  * Renders a single sphere with simple diffuse lighting based on normal.
  */
 
+#define _POSIX_C_SOURCE 200809L
+
 #include "config.h"
 #include "math/vec3.h"
 #include "core/ray.h"
@@ -12,10 +14,40 @@
 #include "core/image.h"
 #include "core/color.h"
 #include "core/material.h"
+#include "core/render_options.h"
+#include "core/render_stats.h"
+#include "core/ray_table.h"
+#include "core/denoise.h"
+#include "io/scene_file.h"
 #include "primitives/sphere.h"
+#include "utils/allocator.h"
+#include "utils/morton.h"
+#include "utils/random.h"
 
+#include <pthread.h>
 #include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
 #include <time.h>
+#include <unistd.h>
+
+/** Longest request line and most arguments accepted in --worker mode */
+#define WORKER_LINE_MAX     8192
+#define WORKER_MAX_ARGS     64
+
+/* ============================================================================
+   TIMING
+   ============================================================================ */
+
+/**
+ * Wall-clock time in seconds (monotonic).
+ * clock() would add up CPU time of all render threads.
+ */
+static double wall_seconds(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+}
 
 /* ============================================================================
    MAIN RAYTRACING FUNCTION
@@ -40,128 +72,684 @@ color shade_flat(hit_record hit, ray r) {
 }
 
 /**
- * Main rendering loop: cast ray for each pixel.
+ * Trace one primary ray against all spheres.
+ * normal and albedo, if not NULL, receive the first hit's normal and
+ * albedo (zero and the background on a miss) for the denoiser.
  */
-void render(image *img, camera *cam, sphere *spheres, int num_spheres) {
-    printf("Rendering %d × %d pixels...\n", img->width, img->height);
+static color trace(ray r, const sphere *spheres, int num_spheres, color background,
+                   vec3 *normal, color *albedo) {
+    // Find closest intersection
+    hit_record closest_hit = {0};
+    int hit_something = 0;
+    float closest_t = 1e6f;
     
-    int total_pixels = img->width * img->height;
-    int pixels_done = 0;
+    for (int i = 0; i < num_spheres; i++) {
+        hit_record hit;
+        if (sphere_intersect(r, spheres[i], &hit)) {
+            if (hit.t < closest_t) {
+                closest_t = hit.t;
+                closest_hit = hit;
+                hit_something = 1;
+            }
+        }
+    }
+    
+    if (normal) {
+        *normal = hit_something ? closest_hit.normal : vec3_zero();
+        *albedo = hit_something ? closest_hit.mat.albedo : background;
+    }
+    return hit_something ? shade_flat(closest_hit, r) : background;
+}
+
+/**
+ * Blocks of the tile, handed out to render threads in Z-order.
+ */
+typedef struct {
+    const uint32_t *order;  // Block coordinates, (y << 16) | x (see morton.h)
+    int count;
+    int next;               // Next block to hand out
+    pthread_mutex_t lock;
+} block_queue;
+
+/**
+ * Work shared by all render threads.
+ */
+typedef struct {
+    image *img;         // Tile being rendered
+    int origin_x;       // Frame position of the tile's top-left pixel
+    int origin_y;
+    const camera *cam;  // Camera of the whole frame
+    ray_table *rays;    // Cached primary rays of the frame (NULL: compute)
+    denoise_buffers *guides;    // Radiance and guides to fill (NULL: no denoising)
+    block_queue *blocks;
+    const sphere *spheres;
+    int num_spheres;
+    color background;
+    int samples;
+    int thread_index;
+    int started;        // Runs on its own pthread (needs join)
     
-    for (int y = 0; y < img->height; y++) {
-        for (int x = 0; x < img->width; x++) {
-            // Cast ray for this pixel
-            ray r = camera_ray(cam, x, y);
+    // Results (written by the owning thread only)
+    uint64_t rays_cast;
+    uint64_t rays_cached;   // Primary rays read from the ray table
+    uint64_t intersection_tests;
+    double time;        // Wall-clock seconds spent in render_blocks
+} render_job;
+
+/**
+ * Take the next block (-1 when none are left), printing progress
+ * roughly every 10% of the blocks.
+ */
+static int next_block(block_queue *queue) {
+    pthread_mutex_lock(&queue->lock);
+    int index = queue->next < queue->count ? queue->next++ : -1;
+    if (index >= 0 && (index + 1) * 10 / queue->count != index * 10 / queue->count) {
+        printf("  ~%d%% done\n", (index + 1) * 100 / queue->count);
+    }
+    pthread_mutex_unlock(&queue->lock);
+    return index;
+}
+
+/**
+ * Primary ray directions of frame pixel (x, y): samples entries, from
+ * the ray table when the pixel is cached, otherwise computed (and
+ * stored in the table if there is one, else in scratch).
+ * rng is the generator of row y and drawn the numbers it has produced;
+ * jitter of pixel x starts at number x * samples * 2.
+ */
+static const vec3 *pixel_rays(render_job *job, int x, int y, vec3 *scratch,
+                              rng_state *rng, uint64_t *drawn) {
+    vec3 *dirs = scratch;
+    if (job->rays) {
+        dirs = ray_table_pixel(job->rays, x, y);
+        if (ray_table_filled(dirs)) {
+            job->rays_cached += (uint64_t)job->samples;
+            return dirs;
+        }
+    }
+    
+    if (job->samples == 1) {
+        dirs[0] = camera_ray(job->cam, x, y).direction;
+    } else {
+        // Antialiasing: jittered samples inside the pixel
+        uint64_t first = (uint64_t)x * (uint64_t)job->samples * 2;
+        rng_skip(rng, first - *drawn);
+        for (int s = 0; s < job->samples; s++) {
+            // y before x: the order gcc evaluated the former
+            // camera_ray_offset(..., rng_float(), rng_float()) call in
+            float dy = rng_float(rng);
+            float dx = rng_float(rng);
+            dirs[s] = camera_ray_offset(job->cam, x, y, dx, dy).direction;
+        }
+        *drawn = first + (uint64_t)job->samples * 2;
+    }
+    
+    if (job->rays) {
+        ray_table_mark(dirs);
+    }
+    return dirs;
+}
+
+/**
+ * Render blocks until the queue is empty.
+ * Z-ordered square blocks keep consecutive rays close on screen; threads
+ * take the next block when done, which also balances clustered objects.
+ * Rays and rng seeds use frame coordinates, so a tile is identical to
+ * the same pixels of a full-frame render, whatever the thread count.
+ */
+static void *render_blocks(void *arg) {
+    render_job *job = (render_job *)arg;
+    image *img = job->img;
+    float inv_samples = 1.0f / (float)job->samples;
+    uint64_t rays = 0;
+    double start = wall_seconds();
+    vec3 scratch[MAX_AA_SAMPLES];
+    int index;
+    
+    while ((index = next_block(job->blocks)) >= 0) {
+        uint32_t cell = job->blocks->order[index];
+        int block_x = (int)(cell & 0xffffu) * RENDER_BLOCK_SIZE;
+        int block_y = (int)(cell >> 16) * RENDER_BLOCK_SIZE;
+        int block_end_x = block_x + RENDER_BLOCK_SIZE < img->width
+            ? block_x + RENDER_BLOCK_SIZE : img->width;
+        int block_end_y = block_y + RENDER_BLOCK_SIZE < img->height
+            ? block_y + RENDER_BLOCK_SIZE : img->height;
+        
+        for (int row = block_y; row < block_end_y; row++) {
+            int y = job->origin_y + row;
             
-            // Find closest intersection
-            hit_record closest_hit = {0};
-            int hit_something = 0;
-            float closest_t = 1e6f;
+            // Seed per frame row so the image does not depend on the
+            // blocks, threads or tiling; pixel_rays skips to each pixel
+            rng_state rng = rng_create((uint32_t)y + 1);
+            uint64_t drawn = 0;
             
-            for (int i = 0; i < num_spheres; i++) {
-                hit_record hit;
-                if (sphere_intersect(r, spheres[i], &hit)) {
-                    if (hit.t < closest_t) {
-                        closest_t = hit.t;
-                        closest_hit = hit;
-                        hit_something = 1;
+            for (int col = block_x; col < block_end_x; col++) {
+                int x = job->origin_x + col;
+                const vec3 *dirs = pixel_rays(job, x, y, scratch, &rng, &drawn);
+                color pixel_color;
+                vec3 normal = vec3_zero(), normal_sum = vec3_zero();
+                color albedo = color_black(), albedo_sum = color_black();
+                vec3 *normal_out = job->guides ? &normal : NULL;
+                
+                if (job->samples == 1) {
+                    vec3 dir = dirs[0];
+                    dir._pad = 0.0f;
+                    pixel_color = trace(ray_create(job->cam->position, dir),
+                        job->spheres, job->num_spheres, job->background, normal_out, &albedo);
+                    normal_sum = normal;
+                    albedo_sum = albedo;
+                } else {
+                    pixel_color = color_black();
+                    for (int s = 0; s < job->samples; s++) {
+                        vec3 dir = dirs[s];
+                        dir._pad = 0.0f;
+                        pixel_color = vec3_add(pixel_color,
+                            trace(ray_create(job->cam->position, dir),
+                                  job->spheres, job->num_spheres, job->background,
+                                  normal_out, &albedo));
+                        if (job->guides) {
+                            normal_sum = vec3_add(normal_sum, normal);
+                            albedo_sum = vec3_add(albedo_sum, albedo);
+                        }
                     }
+                    pixel_color = vec3_scale(pixel_color, inv_samples);
                 }
+                
+                if (job->guides) {
+                    size_t p = (size_t)row * img->width + col;
+                    job->guides->radiance[p] = pixel_color;
+                    job->guides->normal[p] = vec3_scale(normal_sum, inv_samples);
+                    job->guides->albedo[p] = vec3_scale(albedo_sum, inv_samples);
+                }
+                image_set_pixel(img, col, row, pixel_color);
+                rays += (uint64_t)job->samples;
             }
-            
-            // Shade pixel
-            color pixel_color;
-            if (hit_something) {
-                pixel_color = shade_flat(closest_hit, r);
-            } else {
-                // Background: black
-                pixel_color = color_black();
-            }
-            
-            // Store pixel
-            image_set_pixel(img, x, y, pixel_color);
-            
-            // Progress indicator every 100 pixels
-            pixels_done++;
-            if (pixels_done % 1000 == 0) {
-                printf("  %d / %d pixels done (%.1f%%)\n", 
-                    pixels_done, total_pixels, 
-                    100.0f * pixels_done / total_pixels);
-            }
         }
     }
     
+    // Brute force: every ray is tested against every sphere
+    job->rays_cast = rays;
+    job->intersection_tests = rays * (uint64_t)job->num_spheres;
+    job->time = wall_seconds() - start;
+    
+    return NULL;
+}
+
+/**
+ * Blocks covering a width × height tile.
+ */
+static int render_block_count(int width, int height) {
+    return ((width + RENDER_BLOCK_SIZE - 1) / RENDER_BLOCK_SIZE)
+         * ((height + RENDER_BLOCK_SIZE - 1) / RENDER_BLOCK_SIZE);
+}
+
+/**
+ * Arena bytes needed by render() for thread_count threads and block_count blocks.
+ */
+static size_t render_arena_size(int thread_count, int block_count) {
+    return POOL_ALIGN(sizeof(render_job) * thread_count)
+         + POOL_ALIGN(sizeof(pthread_t) * thread_count)
+         + POOL_ALIGN(sizeof(double) * thread_count)
+         + POOL_ALIGN(sizeof(uint32_t) * block_count);
+}
+
+/**
+ * Main rendering loop: cast rays for each pixel on opts->threads threads.
+ * img holds the region of the frame at (origin_x, origin_y) to render.
+ * rays, if not NULL, is a ray table bound to cam (see ray_table.h);
+ * guides, if not NULL, receives radiance, normals and albedo of img.
+ * Per-thread state, the block order and stats->thread_times come from
+ * the frame arena. Fills the counters, thread count and thread_times
+ * of stats.
+ */
+void render(image *img, int origin_x, int origin_y, camera *cam, sphere *spheres,
+            int num_spheres, color background, const render_options *opts,
+            ray_table *rays, denoise_buffers *guides, render_stats *stats,
+            memory_pool *arena) {
+    int thread_count = render_options_thread_count(opts);
+    
+    printf("Rendering %d × %d pixels (%d spp, %d thread(s))...\n",
+        img->width, img->height, opts->samples, thread_count);
+    
+    render_job *jobs = (render_job *)pool_alloc(arena, sizeof(render_job) * thread_count);
+    pthread_t *threads = (pthread_t *)pool_alloc(arena, sizeof(pthread_t) * thread_count);
+    stats->thread_times = (double *)pool_alloc(arena, sizeof(double) * thread_count);
+    
+    int blocks_x = (img->width + RENDER_BLOCK_SIZE - 1) / RENDER_BLOCK_SIZE;
+    int blocks_y = (img->height + RENDER_BLOCK_SIZE - 1) / RENDER_BLOCK_SIZE;
+    uint32_t *order = (uint32_t *)pool_alloc(arena, sizeof(uint32_t) * blocks_x * blocks_y);
+    block_queue queue = {
+        .order = order,
+        .count = morton_order(order, blocks_x, blocks_y),
+        .next = 0
+    };
+    pthread_mutex_init(&queue.lock, NULL);
+    
+    for (int t = 0; t < thread_count; t++) {
+        jobs[t] = (render_job){
+            .img = img,
+            .origin_x = origin_x,
+            .origin_y = origin_y,
+            .cam = cam,
+            .rays = rays,
+            .guides = guides,
+            .blocks = &queue,
+            .spheres = spheres,
+            .num_spheres = num_spheres,
+            .background = background,
+            .samples = opts->samples,
+            .thread_index = t,
+            .started = 0,
+            .rays_cast = 0,
+            .rays_cached = 0,
+            .intersection_tests = 0,
+            .time = 0.0
+        };
+    }
+    
+    // Thread 0 is the calling thread; a thread that fails to start just
+    // leaves its share of the blocks to the others
+    for (int t = 1; t < thread_count; t++) {
+        if (pthread_create(&threads[t], NULL, render_blocks, &jobs[t]) != 0) {
+            fprintf(stderr, "Warning: could not start render thread %d\n", t);
+        } else {
+            jobs[t].started = 1;
+        }
+    }
+    
+    render_blocks(&jobs[0]);
+    
+    for (int t = 1; t < thread_count; t++) {
+        if (jobs[t].started) {
+            pthread_join(threads[t], NULL);
+        }
+    }
+    pthread_mutex_destroy(&queue.lock);
+    
+    stats->threads = thread_count;
+    for (int t = 0; t < thread_count; t++) {
+        stats->rays_cast += jobs[t].rays_cast;
+        stats->rays_cached += jobs[t].rays_cached;
+        stats->intersection_tests += jobs[t].intersection_tests;
+        stats->thread_times[t] = jobs[t].time;
+    }
+    
     printf("Rendering complete!\n");
 }
 
 /* ============================================================================
-   MAIN
+   FRAME
    ============================================================================ */
 
-int main(void) {
-    printf("=== Raytracer - Phase 1 ===\n");
-    printf("Basic raytracing with flat shading\n\n");
+/**
+ * Render one request: load the scene, render, write the image, print stats.
+ * @param output_path   Output PPM path
+ * @param scene_path    Binary scene (NULL for the built-in test scene)
+ * @param opts          Validated render options
+ * @param arena         Frame arena, reset here; holds every per-frame
+ *                      allocation (image, scene objects, thread state)
+ * @param rays          Primary rays kept across requests (NULL: none)
+ * @return              Exit status (0 on success)
+ */
+static int render_request(const char *output_path, const char *scene_path,
+                          const render_options *opts, memory_pool *arena,
+                          ray_table *rays) {
+    // Timing (wall clock)
+    double start = wall_seconds();
+    
+    camera cam;
+    color background = color_black();
+    scene_file sf;
+    int capacity = 1;
+    int scene_objects = 0;
+    
+    if (scene_path) {
+        // Map the scene first: its size decides how big the frame gets
+        printf("Loading scene %s...\n", scene_path);
+        if (scene_file_open(&sf, scene_path) != 0) {
+            return 1;
+        }
+        
+        scene_objects = scene_file_instance_count(&sf);
+        capacity = scene_objects;
+        if (capacity > MAX_OBJECTS) {
+            fprintf(stderr, "Warning: scene has %d objects, rendering first %d\n",
+                capacity, MAX_OBJECTS);
+            capacity = MAX_OBJECTS;
+        }
+        if (capacity < 1) {
+            capacity = 1;
+        }
+    }
     
-    // Timing
-    clock_t start = clock();
+    // Only the tile is stored; the camera still spans the whole frame.
+    // With denoising, the region rendered also covers the pixels the
+    // filter reads around the tile, and is cropped to the tile afterwards
+    int tile_x, tile_y, tile_width, tile_height;
+    int region_x, region_y, region_width, region_height;
+    render_options_tile(opts, &tile_x, &tile_y, &tile_width, &tile_height);
+    render_options_region(opts, &region_x, &region_y, &region_width, &region_height);
+    int cropped = region_width != tile_width || region_height != tile_height;
     
-    // Create image
-    printf("Creating image (%d × %d)...\n", IMAGE_WIDTH, IMAGE_HEIGHT);
-    image img = image_create(IMAGE_WIDTH, IMAGE_HEIGHT);
+    // Size the arena for this frame, then allocate everything from it
+    size_t image_bytes = (size_t)tile_width * tile_height * 3;
+    size_t region_bytes = (size_t)region_width * region_height * 3;
+    size_t scene_bytes = sizeof(sphere) * (size_t)capacity;
+    size_t denoise_bytes = opts->denoise > 0 ? denoise_arena_size(region_width, region_height) : 0;
+    pool_reset(arena);
+    if (pool_reserve(arena, (cropped ? POOL_ALIGN(region_bytes) : 0)
+                            + POOL_ALIGN(scene_bytes) + denoise_bytes
+                            + render_arena_size(render_options_thread_count(opts),
+                                                render_block_count(region_width, region_height))) != 0) {
+        fprintf(stderr, "Error: out of memory for %d × %d frame\n", opts->width, opts->height);
+        if (scene_path) {
+            scene_file_close(&sf);
+        }
+        return 1;
+    }
     
-    // Create camera
-    printf("Setting up camera (FOV %.1f°)...\n", DEFAULT_FOV);
-    camera cam = camera_create(IMAGE_WIDTH, IMAGE_HEIGHT, DEFAULT_FOV);
+    if (tile_width != opts->width || tile_height != opts->height) {
+        printf("Creating tile (%d × %d at %d,%d of %d × %d)...\n",
+            tile_width, tile_height, tile_x, tile_y, opts->width, opts->height);
+    } else {
+        printf("Creating image (%d × %d)...\n", opts->width, opts->height);
+    }
     
-    // Create scene: simple sphere in the middle
-    printf("Setting up scene...\n");
-    sphere spheres[10];
+    // The output file is mapped and rendered into directly (no separate
+    // write); a cropped region is rendered in the arena and copied over
+    image_file output;
+    if (image_file_create(&output, output_path, tile_width, tile_height) != 0) {
+        if (scene_path) {
+            scene_file_close(&sf);
+        }
+        return 1;
+    }
+    image img = cropped ? image_create_from_pool(arena, region_width, region_height) : output.img;
+    denoise_buffers guides;
+    if (opts->denoise > 0) {
+        denoise_buffers_create(&guides, arena, region_width, region_height);
+    }
+    sphere *spheres = (sphere *)pool_alloc(arena, scene_bytes);
     int num_spheres = 0;
     
-    // Main white sphere in the center
-    spheres[num_spheres++] = sphere_create(
-        vec3_create(0.0f, 0.0f, -5.0f),  // Position
-        1.0f,                              // Radius
-        material_matte_white()             // Material
-    );
-    
-    // Optional: Add more spheres for testing
-    /*
-    spheres[num_spheres++] = sphere_create(
-        vec3_create(-2.0f, 0.0f, -6.0f),
-        0.8f,
-        material_matte_red()
-    );
-    
-    spheres[num_spheres++] = sphere_create(
-        vec3_create(2.0f, 0.0f, -6.0f),
-        0.8f,
-        material_matte_blue()
-    );
-    */
+    if (scene_path) {
+        num_spheres = scene_file_to_spheres(&sf, spheres, capacity);
+        cam = scene_file_camera(&sf, opts->width, opts->height);
+        if (opts->fov > 0.0f) {
+            cam = camera_create_look_at(cam.position,
+                vec3_add(cam.position, cam.forward), cam.up,
+                opts->fov, opts->width, opts->height);
+        }
+        background = scene_file_background(&sf);
+        
+        scene_file_close(&sf);
+    } else {
+        // Create camera
+        float fov = opts->fov > 0.0f ? opts->fov : DEFAULT_FOV;
+        printf("Setting up camera (FOV %.1f°)...\n", fov);
+        cam = camera_create(opts->width, opts->height, fov);
+        
+        // Create scene: simple sphere in the middle
+        printf("Setting up scene...\n");
+        
+        // Main white sphere in the center
+        spheres[num_spheres++] = sphere_create(
+            vec3_create(0.0f, 0.0f, -5.0f),  // Position
+            1.0f,                              // Radius
+            material_matte_white()             // Material
+        );
+    }
     
     printf("Scene has %d sphere(s)\n", num_spheres);
     
     // Render
     printf("\n");
-    render(&img, &cam, spheres, num_spheres);
+    render_stats stats = {
+        .width = opts->width,
+        .height = opts->height,
+        .tile_x = tile_x,
+        .tile_y = tile_y,
+        .tile_width = tile_width,
+        .tile_height = tile_height,
+        .samples = opts->samples,
+        .denoise_passes = opts->denoise,
+        .objects = num_spheres,
+        .objects_dropped = scene_objects > num_spheres ? scene_objects - num_spheres : 0,
+        .image_bytes = image_bytes,
+        .scene_bytes = sizeof(sphere) * (size_t)num_spheres
+    };
+    
+    // Frames too large for the table compute their rays
+    if (rays && !ray_table_bind(rays, &cam, opts->samples, RAY_TABLE_MAX_BYTES)) {
+        rays = NULL;
+    }
+    stats.ray_table_bytes = rays ? rays->capacity * sizeof(vec3) : 0;
+    
+    double render_start = wall_seconds();
+    render(&img, region_x, region_y, &cam, spheres, num_spheres, background, opts, rays,
+           opts->denoise > 0 ? &guides : NULL, &stats, arena);
+    double render_end = wall_seconds();
     
-    // Save image
-    printf("\nSaving image to output.ppm...\n");
-    if (image_write_ppm(&img, "output.ppm") == 0) {
+    if (opts->denoise > 0) {
+        printf("Denoising (%d pass(es))...\n", opts->denoise);
+        denoise_atrous(&guides, opts->denoise, stats.threads);
+        for (int y = 0; y < region_height; y++) {
+            for (int x = 0; x < region_width; x++) {
+                image_set_pixel(&img, x, y, guides.radiance[(size_t)y * region_width + x]);
+            }
+        }
+    }
+    if (cropped) {
+        for (int y = 0; y < tile_height; y++) {
+            memcpy(output.img.pixels + (size_t)y * tile_width * 3,
+                   img.pixels + ((size_t)(tile_y - region_y + y) * region_width
+                                 + (size_t)(tile_x - region_x)) * 3,
+                   (size_t)tile_width * 3);
+        }
+    }
+    double denoise_end = wall_seconds();
+    
+    // Save image: the pixels are already in the file's pages
+    printf("\nSaving image to %s...\n", output_path);
+    int saved = image_file_close(&output) == 0;
+    if (saved) {
         printf("✓ Image saved successfully\n");
     } else {
-        printf("✗ Error saving image\n");
+        fprintf(stderr, "✗ Error saving image\n");
+    }
+    double write_end = wall_seconds();
+    
+    stats.load_time = render_start - start;
+    stats.render_time = render_end - render_start;
+    stats.denoise_time = denoise_end - render_end;
+    stats.write_time = write_end - denoise_end;
+    stats.total_time = wall_seconds() - start;
+    pool_stats(arena, &stats.pool_used, &stats.pool_peak, &stats.pool_total);
+    
+    printf("\nRender time: %.3f seconds (total %.3f)\n", stats.render_time, stats.total_time);
+    if (stats.render_time > 0.0) {
+        printf("Pixels per second: %.0f\n", ((double)tile_width * tile_height) / stats.render_time);
+        printf("Rays per second: %.0f\n", (double)stats.rays_cast / stats.render_time);
+    }
+    
+    // Machine-readable stats (parsed by the Python backend)
+    render_stats_print_json(&stats, stdout);
+    
+    return saved ? 0 : 1;
+}
+
+/* ============================================================================
+   MAIN
+   ============================================================================ */
+
+/**
+ * Print command-line usage.
+ * @param out       stdout for --help, stderr after a usage error
+ */
+static void print_usage(FILE *out) {
+    fprintf(out,
+        "Usage: raytracer [output.ppm] [width height] [--scene file.vtsc]\n"
+        "                 [--width N] [--height N] [--samples N] [--depth N]\n"
+        "                 [--threads N] [--fov DEGREES] [--denoise PASSES]\n"
+        "                 [--tile X,Y,W,H]\n"
+        "       raytracer --worker\n"
+        "       raytracer --help\n");
+}
+
+/**
+ * Parse render arguments (everything after the program name).
+ * @return          0 on success, 2 on a usage error (message printed),
+ *                  -1 if --help printed the usage (nothing to render)
+ */
+static int parse_args(int argc, char **argv, const char **output_path,
+                      const char **scene_path, render_options *opts) {
+    int positional = 0;
+    
+    for (int i = 0; i < argc; i++) {
+        // The only option without a value
+        if (strcmp(argv[i], "--help") == 0 || strcmp(argv[i], "-h") == 0) {
+            print_usage(stdout);
+            return -1;
+        }
+        
+        if (strncmp(argv[i], "--", 2) == 0) {
+            if (i + 1 >= argc) {
+                fprintf(stderr, "Error: missing value for %s\n", argv[i]);
+                print_usage(stderr);
+                return 2;
+            }
+            
+            const char *name = argv[i];
+            const char *value = argv[++i];
+            if (strcmp(name, "--scene") == 0) {
+                *scene_path = value;
+                continue;
+            }
+            
+            int parsed = render_options_parse_arg(opts, name, value);
+            if (parsed <= 0) {
+                fprintf(stderr, parsed < 0 ? "Error: invalid value for %s: %s\n"
+                                           : "Error: unknown option %s\n", name, value);
+                print_usage(stderr);
+                return 2;
+            }
+        } else {
+            // Positional: output path, then width and height
+            int ok = 1;
+            if (positional == 0) {
+                *output_path = argv[i];
+            } else if (positional == 1) {
+                ok = render_options_parse_arg(opts, "--width", argv[i]) == 1;
+            } else if (positional == 2) {
+                ok = render_options_parse_arg(opts, "--height", argv[i]) == 1;
+            } else {
+                ok = 0;
+            }
+            if (!ok) {
+                fprintf(stderr, "Error: unexpected argument %s\n", argv[i]);
+                print_usage(stderr);
+                return 2;
+            }
+            positional++;
+        }
     }
     
-    // Cleanup
-    image_destroy(&img);
+    const char *error = render_options_validate(opts);
+    if (error) {
+        fprintf(stderr, "Error: %s\n", error);
+        print_usage(stderr);
+        return 2;
+    }
+    return 0;
+}
+
+/**
+ * Persistent worker: render one request per stdin line until EOF.
+ *
+ * Each line holds the usual command-line arguments separated by tabs.
+ * After each request the worker prints "RENDER_END <status>" on stdout;
+ * stderr is redirected to stdout so errors arrive before that line.
+ * The frame arena is reused across requests, so a worker serving many
+ * renders stops calling malloc once it has seen its largest frame, and
+ * so is the primary ray table: requests with the same camera, size and
+ * samples per pixel reuse the rays of the previous ones.
+ */
+static int run_worker(void) {
+    char line[WORKER_LINE_MAX];
+    char *args[WORKER_MAX_ARGS];
+    memory_pool arena = pool_create(MEMORY_POOL_SIZE);
+    ray_table rays = ray_table_create();
+    
+    dup2(STDOUT_FILENO, STDERR_FILENO);
+    setvbuf(stderr, NULL, _IONBF, 0);
+    
+    printf("RENDER_READY\n");
+    fflush(stdout);
     
-    // Timing
-    clock_t end = clock();
-    double elapsed = (double)(end - start) / CLOCKS_PER_SEC;
-    printf("\nRender time: %.2f seconds\n", elapsed);
-    printf("Pixels per second: %.0f\n", (IMAGE_WIDTH * IMAGE_HEIGHT) / elapsed);
+    while (fgets(line, sizeof(line), stdin)) {
+        line[strcspn(line, "\r\n")] = '\0';
+        if (line[0] == '\0') {
+            continue;
+        }
+        
+        int argc = 0;
+        for (char *arg = strtok(line, "\t"); arg && argc < WORKER_MAX_ARGS;
+             arg = strtok(NULL, "\t")) {
+            args[argc++] = arg;
+        }
+        
+        const char *output_path = "output.ppm";
+        const char *scene_path = NULL;
+        render_options opts = render_options_default();
+        
+        int status = parse_args(argc, args, &output_path, &scene_path, &opts);
+        if (status == 0) {
+            status = render_request(output_path, scene_path, &opts, &arena, &rays);
+        } else if (status < 0) {
+            status = 0;
+        }
+        
+        fflush(stdout);
+        printf("RENDER_END %d\n", status);
+        fflush(stdout);
+    }
     
+    ray_table_destroy(&rays);
+    pool_destroy(&arena);
     return 0;
 }
+
+/**
+ * Usage: raytracer [output.ppm] [width height] [--scene file.vtsc] [options]
+ *        raytracer --worker
+ *
+ * Without --scene, renders the built-in Phase 1 test scene.
+ * Options override the config.h defaults (see render_options.h);
+ * --threads 0 uses one thread per CPU. --tile renders only that
+ * rectangle of the width × height frame into a W × H image. --worker
+ * serves requests from stdin (see run_worker); --help prints the usage.
+ */
+int main(int argc, char **argv) {
+    if (argc == 2 && strcmp(argv[1], "--worker") == 0) {
+        return run_worker();
+    }
+    
+    printf("=== Raytracer - Phase 1 ===\n");
+    printf("Basic raytracing with flat shading\n\n");
+    
+    const char *output_path = "output.ppm";
+    const char *scene_path = NULL;
+    render_options opts = render_options_default();
+    
+    int status = parse_args(argc - 1, argv + 1, &output_path, &scene_path, &opts);
+    if (status != 0) {
+        return status < 0 ? 0 : status;
+    }
+    
+    memory_pool arena = pool_create(MEMORY_POOL_SIZE);
+    // One render per run: a ray table would never be read back
+    status = render_request(output_path, scene_path, &opts, &arena, NULL);
+    pool_destroy(&arena);
+    
+    return status;
+}
@@ -32,16 +32,20 @@ void* xrealloc(void *ptr, size_t size, const char *label) {
    ============================================================================ */
 
 memory_pool pool_create(size_t size) {
+    // aligned_alloc is C11; malloc already returns max_align_t-aligned memory,
+    // which is at least POOL_ALIGNMENT on the targets we build for
+    void *buffer = malloc(size);
     return (memory_pool){
-        .buffer = malloc(size),
-        .total_size = size,
+        .buffer = buffer,
+        .total_size = buffer ? size : 0,
         .used = 0,
         .peak = 0
     };
 }
 
 void* pool_alloc(memory_pool *pool, size_t size) {
-    if (pool->used + size > pool->total_size) {
+    size = POOL_ALIGN(size);
+    if (!pool->buffer || size > pool->total_size - pool->used) {
         return NULL;  // Pool full
     }
     
@@ -55,6 +59,30 @@ void* pool_alloc(memory_pool *pool, size_t size) {
     return ptr;
 }
 
+int pool_reserve(memory_pool *pool, size_t size) {
+    if (pool->used != 0) {
+        return -1;
+    }
+    if (pool->buffer && pool->total_size >= size) {
+        return 0;
+    }
+    
+    // Grow by at least 1.5x so slowly growing frames don't reallocate every time
+    size_t new_size = pool->total_size + pool->total_size / 2;
+    if (new_size < size) {
+        new_size = size;
+    }
+    
+    void *buffer = malloc(new_size);
+    if (!buffer) {
+        return -1;
+    }
+    free(pool->buffer);
+    pool->buffer = buffer;
+    pool->total_size = new_size;
+    return 0;
+}
+
 void pool_reset(memory_pool *pool) {
     pool->used = 0;
 }
@@ -51,6 +51,14 @@ typedef struct {
  */
 memory_pool pool_create(size_t size);
 
+/** Alignment of every pool allocation (fits vec3 and SIMD loads) */
+#define POOL_ALIGNMENT 16
+
+/**
+ * Round size up to a multiple of POOL_ALIGNMENT.
+ */
+#define POOL_ALIGN(size) (((size) + (POOL_ALIGNMENT - 1)) & ~(size_t)(POOL_ALIGNMENT - 1))
+
 /**
  * Allocate from pool.
  * @param pool      Pool
@@ -58,10 +66,21 @@ memory_pool pool_create(size_t size);
  * @return          Pointer (or NULL if pool full)
  * 
  * WARNING: Returned memory is not zero-initialized.
- * Alignment is not guaranteed (uses byte alignment).
+ * Allocations are POOL_ALIGNMENT-aligned and use POOL_ALIGN(size) bytes.
  */
 void* pool_alloc(memory_pool *pool, size_t size);
 
+/**
+ * Make sure an empty pool can hold size bytes, growing its buffer if needed.
+ * @param pool      Pool (must be empty: call pool_reset first)
+ * @param size      Bytes needed
+ * @return          0 on success, -1 if the pool is in use or allocation failed
+ * 
+ * The buffer only grows, so a long-running process settles on its
+ * largest frame and stops allocating.
+ */
+int pool_reserve(memory_pool *pool, size_t size);
+
 /**
  * Reset pool (clear all allocations).
  * @param pool      Pool
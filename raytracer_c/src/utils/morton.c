@@ -0,0 +1,64 @@
+/**
+ * morton.c - Morton (Z-order) codes implementation
+ */
+
+#include "morton.h"
+
+/**
+ * Spread the low 16 bits of v to the even bit positions.
+ */
+static uint32_t spread_bits(uint32_t v) {
+    v &= 0x0000ffffu;
+    v = (v | (v << 8)) & 0x00ff00ffu;
+    v = (v | (v << 4)) & 0x0f0f0f0fu;
+    v = (v | (v << 2)) & 0x33333333u;
+    v = (v | (v << 1)) & 0x55555555u;
+    return v;
+}
+
+/**
+ * Gather the even bits of v into the low 16 bits.
+ */
+static uint32_t compact_bits(uint32_t v) {
+    v &= 0x55555555u;
+    v = (v | (v >> 1)) & 0x33333333u;
+    v = (v | (v >> 2)) & 0x0f0f0f0fu;
+    v = (v | (v >> 4)) & 0x00ff00ffu;
+    v = (v | (v >> 8)) & 0x0000ffffu;
+    return v;
+}
+
+uint32_t morton_encode(uint32_t x, uint32_t y) {
+    return spread_bits(x) | (spread_bits(y) << 1);
+}
+
+void morton_decode(uint32_t code, uint32_t *x, uint32_t *y) {
+    *x = compact_bits(code);
+    *y = compact_bits(code >> 1);
+}
+
+/**
+ * Walk the Z curve of the enclosing power-of-two square.
+ */
+int morton_order(uint32_t *order, int width, int height) {
+    if (width <= 0 || height <= 0) {
+        return 0;
+    }
+    
+    uint32_t side = 1;
+    while (side < (uint32_t)width || side < (uint32_t)height) {
+        side <<= 1;
+    }
+    
+    int n = 0;
+    int total = width * height;
+    uint64_t codes = (uint64_t)side * side;
+    for (uint64_t code = 0; code < codes && n < total; code++) {
+        uint32_t x, y;
+        morton_decode((uint32_t)code, &x, &y);
+        if (x < (uint32_t)width && y < (uint32_t)height) {
+            order[n++] = (y << 16) | x;
+        }
+    }
+    return n;
+}
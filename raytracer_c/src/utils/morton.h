@@ -0,0 +1,43 @@
+/**
+ * morton.h - Morton (Z-order) codes for 2D traversal
+ *
+ * Interleaving the bits of x and y orders a grid along a Z curve:
+ * cells close in the order are close on screen, so consecutive work
+ * items touch neighbouring pixels, rays and objects.
+ */
+
+#ifndef MORTON_H
+#define MORTON_H
+
+#include <stdint.h>
+
+/* ============================================================================
+   FUNCTIONS
+   ============================================================================ */
+
+/**
+ * Interleave x (even bits) and y (odd bits).
+ * @param x         Column (< 65536)
+ * @param y         Row (< 65536)
+ * @return          Morton code
+ */
+uint32_t morton_encode(uint32_t x, uint32_t y);
+
+/**
+ * Split a Morton code back into x and y.
+ */
+void morton_decode(uint32_t code, uint32_t *x, uint32_t *y);
+
+/**
+ * List the cells of a width × height grid in Z-order.
+ * @param order     Output, width * height entries: (y << 16) | x
+ * @param width     Grid columns (< 65536)
+ * @param height    Grid rows (< 65536)
+ * @return          Number of cells written (width * height)
+ *
+ * Grids that are not square powers of two follow the Z curve of the
+ * enclosing one and skip the cells outside.
+ */
+int morton_order(uint32_t *order, int width, int height);
+
+#endif // MORTON_H
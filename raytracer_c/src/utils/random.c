@@ -36,6 +36,26 @@ static uint32_t rng_next(rng_state *state) {
     return state->seed;
 }
 
+/**
+ * Jump ahead n steps: compose the LCG step x -> A*x + C with itself by
+ * repeated squaring (all arithmetic mod 2^31).
+ */
+void rng_skip(rng_state *state, uint64_t n) {
+    uint32_t mul = 1u, add = 0u;                // Accumulated step
+    uint32_t step_mul = LCG_A, step_add = LCG_C;  // Step of size 2^k
+    
+    while (n > 0) {
+        if (n & 1u) {
+            mul = mul * step_mul;
+            add = add * step_mul + step_add;
+        }
+        step_add = (step_mul + 1u) * step_add;
+        step_mul = step_mul * step_mul;
+        n >>= 1;
+    }
+    state->seed = (mul * state->seed + add) & 0x7fffffffu;
+}
+
 /**
  * Generate random float in [0, 1).
  */
@@ -40,6 +40,14 @@ rng_state rng_create(uint32_t seed);
  */
 rng_state rng_create_time(void);
 
+/**
+ * Advance the generator as if n numbers had been drawn (O(log n)).
+ * Lets a tile start a row's sequence at its first column.
+ * @param state     RNG state (modified)
+ * @param n         Numbers to skip
+ */
+void rng_skip(rng_state *state, uint64_t n);
+
 /* ============================================================================
    RANDOM NUMBERS
    ============================================================================ */
@@ -12,6 +12,11 @@
 #include "src/core/color.h"
 #include "src/core/material.h"
 #include "src/primitives/sphere.h"
+#include "src/core/camera.h"
+#include "src/core/ray_table.h"
+#include "src/utils/morton.h"
+#include "src/core/denoise.h"
+#include "src/core/image.h"
 
 /* ============================================================================
    TEST UTILITIES
@@ -190,6 +195,109 @@ void test_sphere_intersection(void) {
         test_passed, test_failed);
 }
 
+/* ============================================================================
+   TESTS: TRAVERSAL ORDER & RAY TABLE
+   ============================================================================ */
+
+void test_traversal(void) {
+    printf("\n=== Testing Morton order and ray table ===\n");
+    
+    uint32_t x, y;
+    morton_decode(morton_encode(1234, 567), &x, &y);
+    TEST("morton round trip", x == 1234 && y == 567);
+    TEST("morton_encode (bit interleave)", morton_encode(3, 5) == 0x27);
+    
+    // 5 × 3 grid: every cell once, starting with the top-left Z
+    uint32_t order[15];
+    int seen[15] = {0};
+    int n = morton_order(order, 5, 3);
+    int unique = n == 15;
+    for (int i = 0; i < n; i++) {
+        int cell = (int)(order[i] >> 16) * 5 + (int)(order[i] & 0xffffu);
+        unique = unique && cell < 15 && !seen[cell];
+        if (cell < 15) seen[cell] = 1;
+    }
+    TEST("morton_order (covers grid)", unique);
+    TEST("morton_order (Z start)", order[0] == 0 && order[1] == 1
+        && order[2] == (1u << 16) && order[3] == ((1u << 16) | 1));
+    
+    camera cam = camera_create(8, 4, 60.0f);
+    ray_table table = ray_table_create();
+    TEST("ray_table_bind", ray_table_bind(&table, &cam, 2, 1 << 20));
+    TEST("ray_table_bind (too large)", !ray_table_bind(&table, &cam, 2, 16));
+    ray_table_bind(&table, &cam, 2, 1 << 20);
+    vec3 *pixel = ray_table_pixel(&table, 3, 2);
+    TEST("ray_table (starts empty)", !ray_table_filled(pixel));
+    pixel[0] = camera_ray(&cam, 3, 2).direction;
+    ray_table_mark(pixel);
+    ray_table_bind(&table, &cam, 2, 1 << 20);
+    TEST("ray_table (kept for the same view)", ray_table_filled(ray_table_pixel(&table, 3, 2)));
+    cam = camera_create(8, 4, 45.0f);
+    ray_table_bind(&table, &cam, 2, 1 << 20);
+    TEST("ray_table (cleared on a new view)", !ray_table_filled(ray_table_pixel(&table, 3, 2)));
+    ray_table_destroy(&table);
+    
+    printf("  → traversal: %d passed, %d failed\n",
+        test_passed, test_failed);
+}
+
+/* ============================================================================
+   TESTS: DENOISER
+   ============================================================================ */
+
+void test_denoise(void) {
+    printf("\n=== Testing denoiser ===\n");
+    
+    TEST("denoise_radius", denoise_radius(0) == 0 && denoise_radius(1) == 2
+        && denoise_radius(3) == 14);
+    
+    // 8 × 4 region: left half red, right half blue, noise on the red side
+    memory_pool pool = pool_create(denoise_arena_size(8, 4));
+    denoise_buffers b;
+    TEST("denoise_buffers_create", denoise_buffers_create(&b, &pool, 8, 4) == 0);
+    for (int y = 0; y < 4; y++) {
+        for (int x = 0; x < 8; x++) {
+            int i = y * 8 + x;
+            color albedo = x < 4 ? color_create(1.0f, 0.0f, 0.0f) : color_create(0.0f, 0.0f, 1.0f);
+            b.albedo[i] = albedo;
+            b.normal[i] = vec3_create(0.0f, 0.0f, 1.0f);
+            b.radiance[i] = vec3_scale(albedo, x < 4 && (x + y) % 2 ? 0.6f : 0.4f);
+        }
+    }
+    denoise_atrous(&b, 2, 2);
+    TEST("denoise (noise smoothed)", fabsf(b.radiance[1].x - b.radiance[2].x) < 0.1f);
+    TEST("denoise (edge kept)", b.radiance[3].z < 0.01f && b.radiance[4].x < 0.01f);
+    TEST_FLOAT("denoise (flat area unchanged)", b.radiance[6].z, 0.4f);
+    pool_destroy(&pool);
+    
+    printf("  → denoiser: %d passed, %d failed\n",
+        test_passed, test_failed);
+}
+
+/* ============================================================================
+   TESTS: MAPPED IMAGE FILE
+   ============================================================================ */
+
+void test_image_file(void) {
+    printf("\n=== Testing mapped image file ===\n");
+    
+    const char *path = "test_image_file.ppm";
+    image_file file;
+    TEST("image_file_create", image_file_create(&file, path, 4, 2) == 0);
+    image_set_pixel_bytes(&file.img, 3, 1, 10, 20, 30);
+    TEST("image_file_close", image_file_close(&file) == 0 && file.data == NULL);
+    
+    image img = image_read_ppm(path);
+    TEST("image_file (size)", img.width == 4 && img.height == 2);
+    TEST("image_file (pixels)", img.pixels && img.pixels[21] == 10
+        && img.pixels[22] == 20 && img.pixels[23] == 30 && img.pixels[0] == 0);
+    image_destroy(&img);
+    remove(path);
+    
+    printf("  → mapped image file: %d passed, %d failed\n",
+        test_passed, test_failed);
+}
+
 /* ============================================================================
    MAIN
    ============================================================================ */
@@ -203,6 +311,9 @@ int main(void) {
     test_ray();
     test_color();
     test_sphere_intersection();
+    test_traversal();
+    test_denoise();
+    test_image_file();
     
     printf("\n===============================================\n");
     printf("  Summary\n");